@@ -0,0 +1,209 @@
+from dataclasses import asdict, dataclass
+import math
+import os
+import random
+
+# --- Adaptive Interview Length ---
+# Computerized adaptive testing for the technical phase. Each technology
+# keeps a Rasch (1PL IRT) ability estimate: a posterior over ability theta
+# on a fixed grid, updated for every graded answer with
+# P(correct) = 1 / (1 + exp(b - theta)), where b is the question's
+# difficulty (calibrated from past candidates' verdicts in the question
+# bank; 0 for questions nobody has answered yet).
+#
+# Once a technology has had its minimum number of questions it stops as soon
+# as the verdict is settled (P(theta > PASS_ABILITY) beyond the configured
+# confidence either way) or the credible interval is narrower than the
+# target width, and it never goes past its maximum. The next question comes
+# from the technology whose estimate is least certain and is the one with
+# the most Fisher information, p(1 - p), at that technology's estimate.
+#
+# The plan is a plain JSON-serializable dict, like the scorecard, so it is
+# persisted and resumed with the rest of the session state.
+GRID = [i / 10 for i in range(-40, 41)]
+PRIOR_SD = 2.0  # weak prior: two consistent answers can settle a clear verdict
+PASS_ABILITY = 0.0  # even odds on a question of average difficulty
+
+STOP_REASONS = {
+    'verdict_settled': "verdict settled",
+    'precise': "estimate precise",
+    'max_questions': "question limit reached",
+    'pool_exhausted': "no questions left",
+}
+
+@dataclass(frozen=True)
+class AdaptiveConfig:
+    min_per_tech: int = 2
+    max_per_tech: int = 3  # the fixed list asks 3 per technology
+    confidence: float = 0.85  # P(pass) or P(fail) needed to settle a verdict
+    ci_width: float = 1.0  # stop once the credible interval is this narrow
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + math.exp(-x))
+
+def _posterior(responses):
+    # Normalized weights over GRID given [(difficulty, correct), ...]
+    log_weights = []
+    for theta in GRID:
+        log_weight = -0.5 * (theta / PRIOR_SD) ** 2
+        for difficulty, correct in responses:
+            p = _sigmoid(theta - difficulty)
+            log_weight += math.log(p if correct else 1.0 - p)
+        log_weights.append(log_weight)
+    peak = max(log_weights)
+    weights = [math.exp(w - peak) for w in log_weights]
+    total = sum(weights)
+    return [w / total for w in weights]
+
+def ability_estimate(responses, confidence=AdaptiveConfig.confidence):
+    # (posterior mean, central credible interval, P(theta > PASS_ABILITY))
+    weights = _posterior(responses)
+    mean = sum(theta * w for theta, w in zip(GRID, weights))
+    tail = (1.0 - confidence) / 2
+    low, high, cumulative = GRID[0], GRID[-1], 0.0
+    for theta, w in zip(GRID, weights):
+        if cumulative < tail <= cumulative + w:
+            low = theta
+        if cumulative < 1.0 - tail <= cumulative + w:
+            high = theta
+        cumulative += w
+    p_pass = sum(w for theta, w in zip(GRID, weights) if theta > PASS_ABILITY)
+    return mean, (low, high), p_pass
+
+def difficulty_from_counts(attempts, correct):
+    # Rasch difficulty from a smoothed pass rate; 0 with no data
+    return -math.log((correct + 1) / (attempts - correct + 1))
+
+def new_adaptive_plan(pools, config, question_bank=None, rng=None):
+    # pools: {technology: [questions]}, e.g. from get_technical_question_pools
+    rng = rng or random.Random()
+    technologies = {}
+    for tech, questions in pools.items():
+        outcomes = question_bank.outcomes(tech, questions) if question_bank is not None else {}
+        pool = [[question, difficulty_from_counts(*outcomes.get(question, (0, 0)))] for question in questions]
+        rng.shuffle(pool)  # candidates sharing a stack don't all get the same order
+        technologies[tech] = {'pool': pool, 'asked': 0, 'responses': [], 'stop_reason': None}
+    return {'config': asdict(config), 'technologies': technologies, 'asked': [], 'stop_reason': None}
+
+def _stop_reason(state, config):
+    if state['asked'] >= config['min_per_tech']:
+        _, (low, high), p_pass = ability_estimate(state['responses'], config['confidence'])
+        if p_pass >= config['confidence'] or p_pass <= 1.0 - config['confidence']:
+            return "verdict_settled"
+        if high - low <= config['ci_width']:
+            return "precise"
+    if state['asked'] >= config['max_per_tech']:
+        return "max_questions"
+    if not state['pool']:
+        return "pool_exhausted"
+    return None
+
+def next_adaptive_question(plan):
+    # Picks, records and returns the next question, or None once every
+    # technology has stopped (plan['stop_reason'] then says why)
+    config = plan['config']
+    open_techs = []
+    for position, (tech, state) in enumerate(plan['technologies'].items()):
+        if state['stop_reason'] is None:
+            state['stop_reason'] = _stop_reason(state, config)
+        if state['stop_reason'] is None:
+            mean, (low, high), _ = ability_estimate(state['responses'], config['confidence'])
+            # Minimums first, round robin; then the least certain estimate
+            below_min = state['asked'] < config['min_per_tech']
+            open_techs.append(((not below_min, state['asked'] if below_min else low - high, position), tech, mean))
+    if not open_techs:
+        plan['stop_reason'] = describe_stop(plan)
+        return None
+    _, tech, mean = min(open_techs)
+    state = plan['technologies'][tech]
+    # Most informative question: success probability closest to 1/2
+    index = min(range(len(state['pool'])), key=lambda i: abs(state['pool'][i][1] - mean))
+    question, difficulty = state['pool'].pop(index)
+    state['asked'] += 1
+    plan['asked'].append([tech, question, difficulty])
+    return question
+
+def queue_next_question(plan, questions, position):
+    # Appends the next adaptive question when the candidate has moved past the
+    # last one asked; questions is the technical_questions list shown so far
+    if plan is not None and position == len(questions):
+        question = next_adaptive_question(plan)
+        if question is not None:
+            questions.append(question)
+
+def record_adaptive_result(plan, index, correctness, question_bank=None):
+    # Feeds the verdict for technical question `index` into its technology's
+    # estimate and the question's difficulty calibration
+    if plan is None or index >= len(plan['asked']):
+        return
+    verdict = str(correctness or "").strip().lower()
+    if verdict not in ("correct", "incorrect"):
+        return
+    tech, question, difficulty = plan['asked'][index]
+    plan['technologies'][tech]['responses'].append([difficulty, verdict == "correct"])
+    if question_bank is not None:
+        question_bank.record_outcome(tech, question, verdict == "correct")
+
+def adaptive_budget(plan):
+    # Most technical questions the interview can still reach in total
+    config = plan['config']
+    return sum(
+        state['asked'] if state['stop_reason'] else min(config['max_per_tech'], state['asked'] + len(state['pool']))
+        for state in plan['technologies'].values()
+    )
+
+def describe_stop(plan):
+    max_total = sum(
+        min(plan['config']['max_per_tech'], state['asked'] + len(state['pool']))
+        for state in plan['technologies'].values()
+    )
+    groups = {}
+    for tech, state in plan['technologies'].items():
+        groups.setdefault(state['stop_reason'], []).append(tech)
+    details = "; ".join(
+        f"{STOP_REASONS.get(reason, reason or 'in progress')} for {', '.join(techs)}" for reason, techs in groups.items()
+    )
+    return f"Stopped after {len(plan['asked'])} of up to {max_total} technical questions: {details}."
+
+def adaptive_summary(plan):
+    # Per-technology estimates and stop reasons for the assessment
+    config = plan['config']
+    technologies = []
+    for tech, state in plan['technologies'].items():
+        mean, (low, high), p_pass = ability_estimate(state['responses'], config['confidence'])
+        if p_pass >= config['confidence']:
+            verdict = "pass"
+        elif p_pass <= 1.0 - config['confidence']:
+            verdict = "fail"
+        else:
+            verdict = "undecided"
+        technologies.append({
+            'technology': tech,
+            'questions_asked': state['asked'],
+            'graded_answers': len(state['responses']),
+            'correct_answers': sum(1 for _, correct in state['responses'] if correct),
+            'ability': round(mean, 2),
+            'credible_interval': [round(low, 2), round(high, 2)],
+            'pass_probability': round(p_pass, 3),
+            'verdict': verdict,
+            'stop_reason': STOP_REASONS.get(state["stop_reason"], "in progress"),
+        })
+    return {
+        'stop_reason': plan['stop_reason'] or describe_stop(plan),
+        'min_questions_per_technology': config['min_per_tech'],
+        'max_questions_per_technology': config['max_per_tech'],
+        'confidence': config['confidence'],
+        'technologies': technologies,
+    }
+
+def adaptive_config_from_env():
+    # None unless HIRELY_ADAPTIVE is on
+    if os.getenv("HIRELY_ADAPTIVE", "off").lower() not in ("on", "1", "true"):
+        return None
+    default = AdaptiveConfig()
+    return AdaptiveConfig(
+        min_per_tech=int(os.getenv("HIRELY_ADAPTIVE_MIN_QUESTIONS", str(default.min_per_tech))),
+        max_per_tech=int(os.getenv("HIRELY_ADAPTIVE_MAX_QUESTIONS", str(default.max_per_tech))),
+        confidence=float(os.getenv("HIRELY_ADAPTIVE_CONFIDENCE", str(default.confidence))),
+        ci_width=float(os.getenv("HIRELY_ADAPTIVE_CI_WIDTH", str(default.ci_width))),
+    )
@@ -0,0 +1,583 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+from dataclasses import dataclass
+import json
+import os
+import re
+import threading
+import time
+
+from grading_cache import grading_version
+from llm_client import LLMClient
+from metrics import REGISTRY as metrics
+from question_bank import QUESTIONS_PER_TECHNOLOGY, canonicalize_technology, parse_question_list
+from routing import router_from_env
+
+# Whole-word hedges that mark a bot reply as unhelpful ("uncertainty" inside
+# a real answer doesn't count)
+_UNHELPFUL_REPLY = re.compile(r"\b(?:not sure|don'?t know|uncertain|no idea)\b", re.IGNORECASE)
+
+# --- Concurrency ---
+# Every upstream call goes through _generate, so this caps in-flight Gemini
+# requests for the whole process regardless of how many sessions are active.
+MAX_CONCURRENCY = max(1, int(os.getenv("HIRELY_MAX_CONCURRENCY", "8")))
+
+_call_slots = threading.BoundedSemaphore(MAX_CONCURRENCY)
+_executor = None
+_executor_lock = threading.Lock()
+_worker_state = threading.local()
+
+def configure_concurrency(max_concurrency):
+    # Resize the process-wide cap; only affects calls started afterwards
+    global MAX_CONCURRENCY, _call_slots, _executor
+    MAX_CONCURRENCY = max(1, int(max_concurrency))
+    with _executor_lock:
+        _call_slots = threading.BoundedSemaphore(MAX_CONCURRENCY)
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=MAX_CONCURRENCY,
+                thread_name_prefix="hirely-llm",
+                initializer=_mark_worker,
+            )
+        return _executor
+
+def _call_slot():
+    # Current process-wide semaphore (configure_concurrency may swap it)
+    return _call_slots
+
+def _mark_worker():
+    _worker_state.in_pool = True
+
+def _in_pool():
+    return getattr(_worker_state, "in_pool", False)
+
+# --- SDK Loading ---
+# google.generativeai (and its gRPC/protobuf stack) is the slowest import in
+# the app, so it is loaded on the first LLM call rather than at import time;
+# serverless cold starts render the welcome screen without it.
+_genai = None
+_genai_config = {}
+_genai_lock = threading.Lock()
+
+def configure_genai(**kwargs):
+    # Same arguments as genai.configure; applied when the SDK is loaded
+    _genai_config.update(kwargs)
+    if _genai is not None:
+        _genai.configure(**kwargs) # type: ignore
+
+def load_genai():
+    global _genai
+    with _genai_lock:
+        if _genai is None:
+            import google.generativeai as genai
+            if _genai_config:
+                genai.configure(**_genai_config) # type: ignore
+            _genai = genai
+        return _genai
+
+# --- Grading Prompts ---
+# Module-level templates: their text is part of the grading cache version,
+# so editing either one invalidates cached correctness verdicts.
+CORRECTNESS_PROMPT = """Is this answer correct for the question?
+        Question: {question}
+        Answer: {answer}
+        Respond with only: 'Correct' or 'Incorrect'"""
+
+EVALUATION_PROMPT = """Evaluate a candidate's interview answer.
+
+Question: {question}
+Answer: {answer}
+
+Return a JSON object with these fields:
+- {correctness_rule}
+- sentiment: 'Positive', 'Negative' or 'Neutral'.
+- ai_detected: 'Yes' or 'No' — whether the answer appears AI-generated (overly perfect structure,
+  generic textbook language, no personal detail, robotic tone, suspiciously polished grammar).
+- confidence: 'High', 'Medium' or 'Low' — confidence in the ai_detected verdict.
+- reason: brief explanation of the ai_detected verdict.
+"""
+
+TECHNICAL_CORRECTNESS_RULE = "correctness: 'Correct' or 'Incorrect' for the question. If the answer is AI-generated, it is 'Incorrect'."
+PROJECT_CORRECTNESS_RULE = "correctness: always 'N/A' (this is a project discussion, not graded for correctness)."
+
+EVALUATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "correctness": {"type": "string"},
+        "sentiment": {"type": "string"},
+        "ai_detected": {"type": "string"},
+        "confidence": {"type": "string"},
+        "reason": {"type": "string"},
+    },
+    "required": ["correctness", "sentiment", "ai_detected", "confidence", "reason"],
+}
+
+@dataclass
+class AnswerEvaluation:
+    correctness: str
+    sentiment: str
+    ai_detected: str
+    confidence: str
+    reason: str
+
+    def to_analysis(self, mode="technical"):
+        # Shape stored under 'analysis' in technical_answers / project_answers
+        analysis = {
+            'sentiment': self.sentiment,
+            'ai_detected': self.ai_detected,
+            'ai_confidence': self.confidence,
+            'ai_reason': self.reason
+        }
+        if mode == "technical":
+            analysis = {'correctness': self.correctness, **analysis}
+        return analysis
+
+def _normalize_label(value, allowed):
+    # Case-insensitive match against the allowed labels, None if nothing fits
+    value = str(value).strip().strip("'\".").lower()
+    for label in allowed:
+        if value == label.lower():
+            return label
+    return None
+
+def parse_evaluation(raw, mode="technical"):
+    # Validate a structured evaluation response, raising ValueError on anything off-schema
+    data = json.loads(raw)
+    if not isinstance(data, dict):
+        raise ValueError("evaluation response is not an object")
+    sentiment = _normalize_label(data.get("sentiment", ""), ["Positive", "Negative", "Neutral"])
+    ai_detected = _normalize_label(data.get("ai_detected", ""), ["Yes", "No"])
+    confidence = _normalize_label(data.get("confidence", ""), ["High", "Medium", "Low"])
+    correctness = _normalize_label(data.get("correctness", ""), ["Correct", "Incorrect"])
+    if mode != "technical":
+        correctness = correctness or "N/A"
+    if None in (sentiment, ai_detected, confidence, correctness):
+        raise ValueError(f"evaluation response failed validation: {data!r}")
+    reason = str(data.get("reason") or "Analysis not available").strip()
+    return AnswerEvaluation(correctness, sentiment, ai_detected, confidence, reason)
+
+def parse_ai_detection(text):
+    # Parse the line-based output of detect_ai_generated_text
+    ai_generated = "No"
+    confidence = "Low"
+    reason = "Analysis not available"
+    for line in text.split('\n'):
+        key, sep, value = line.partition(":")
+        if not sep:
+            continue
+        key = key.strip().lower()
+        if key == "ai-generated":
+            ai_generated = _normalize_label(value, ["Yes", "No"]) or ai_generated
+        elif key == "confidence":
+            confidence = _normalize_label(value, ["High", "Medium", "Low"]) or confidence
+        elif key == "reason":
+            reason = value.strip() or reason
+    return ai_generated, confidence, reason
+
+
+class HirelyAI:
+    def __init__(self, question_bank=None, local_classifier=None, model=None, client=None, grading_cache=None,
+                 router=None):
+        # model: any object with generate_content (e.g. fake_model.FakeGenerativeModel);
+        # an explicit model or client serves every task, otherwise each task
+        # goes to the model its route names. Routed models are only built
+        # (and the SDK imported) when a task first needs them.
+        self.router = router or router_from_env()
+        self._shared = model is not None or client is not None
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+        if self._shared:
+            self._client = client or LLMClient(model, slot=_call_slot)
+        self.question_bank = question_bank
+        self.local_classifier = local_classifier
+        self.grading_cache = grading_cache
+        self.grading_version = grading_version(
+            "+".join(sorted({self._model_name("check_correctness"), self._model_name("evaluate_answer")})),
+            CORRECTNESS_PROMPT, EVALUATION_PROMPT, TECHNICAL_CORRECTNESS_RULE,
+        )
+
+    @property
+    def client(self):
+        # Client of the default route, built on first access
+        return self._client_for(self.router.default.model)
+
+    @property
+    def model(self):
+        return self.client.model
+
+    def warm_up(self):
+        # Import the SDK and build the default model ahead of the first call
+        self._client_for(self.router.default.model)
+
+    # --- Model routing ---
+    def _model_name(self, task):
+        if self._shared:
+            return getattr(self.model, "model_name", type(self.model).__name__)
+        return self.router.route(task).model
+
+    def _client_for(self, model_name):
+        if self._shared:
+            return self._client
+        with self._clients_lock:
+            client = self._clients.get(model_name)
+            if client is None:
+                model = load_genai().GenerativeModel(model_name)
+                client = self._clients[model_name] = LLMClient(model, slot=_call_slot)
+            return client
+
+    def _generate(self, prompt, **kwargs):
+        task = metrics.current_task()
+        route = self.router.route(task)
+        hedge_after = self.router.hedge_delay(task)
+        metrics.note(model=self._model_name(task), hedge_after=hedge_after)
+        started = time.perf_counter()
+        text = self._client_for(route.model).generate(prompt, timeout=route.timeout, hedge_after=hedge_after, **kwargs)
+        self.router.observe(task, time.perf_counter() - started)
+        return text
+
+    def analyze(self, prompt):
+        return self._generate(prompt)
+
+    def analyze_stream(self, prompt):
+        # Yields text chunks as they arrive
+        task = metrics.current_task()
+        route = self.router.route(task)
+        metrics.note(model=self._model_name(task))
+        return self._client_for(route.model).stream(prompt, timeout=route.timeout)
+
+    # --- Concurrent execution ---
+    def submit(self, fn, *args, **kwargs):
+        # Schedule any HirelyAI method on the shared pool and return a Future.
+        # Calls made from inside a pool worker run inline to avoid pool starvation.
+        if _in_pool():
+            future = Future()
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except BaseException as exc:
+                future.set_exception(exc)
+            return future
+        return _get_executor().submit(fn, *args, **kwargs)
+
+    def run_many(self, calls):
+        # calls: iterable of (fn, *args); results come back in the same order
+        futures = [self.submit(fn, *args) for fn, *args in calls]
+        return [future.result() for future in futures]
+
+    def analyze_many(self, prompts):
+        return self.run_many((self.analyze, prompt) for prompt in prompts)
+
+    async def analyze_async(self, prompt):
+        return await asyncio.wrap_future(self.submit(self.analyze, prompt))
+
+    @metrics.instrument("generate_technical_questions")
+    def generate_technical_questions(self, tech_stack):
+        prompt = f"""Generate 2-3 technical questions for each technology in this stack: {', '.join(tech_stack)}.
+        Make questions practical and relevant to real-world development.
+        Format as a list of questions."""
+        return self.analyze(prompt)
+
+    @metrics.instrument("generate_questions_for_technology")
+    def generate_questions_for_technology(self, tech):
+        prompt = f"""Generate {QUESTIONS_PER_TECHNOLOGY} technical interview questions about {tech}.
+        Make questions practical and relevant to real-world development, and vary their difficulty.
+        Respond with one question per line and nothing else."""
+        return parse_question_list(self.analyze(prompt))
+
+    def generate_questions_for_technologies(self, techs):
+        return self.run_many((self.generate_questions_for_technology, tech) for tech in techs)
+
+    @metrics.instrument("get_technical_questions")
+    def get_technical_questions(self, tech_stack, per_tech=3):
+        # Assemble from the question bank; only uncached technologies hit the model
+        if self.question_bank is None:
+            return parse_question_list(self.generate_technical_questions(tech_stack))
+        by_tech = self._assemble_questions(tech_stack, per_tech)
+        return [question for questions in by_tech.values() for question in questions]
+
+    @metrics.instrument("get_technical_question_pools")
+    def get_technical_question_pools(self, tech_stack, per_tech=QUESTIONS_PER_TECHNOLOGY):
+        # {technology: questions}, for adaptive interviews that track each technology
+        if self.question_bank is not None:
+            return self._assemble_questions(tech_stack, per_tech)
+        unique = {}
+        for tech in tech_stack:
+            key = canonicalize_technology(tech)
+            if key and key not in unique:
+                unique[key] = tech
+        techs = list(unique.values())
+        pools = self.generate_questions_for_technologies(techs)
+        return {tech: questions[:per_tech] for tech, questions in zip(techs, pools)}
+
+    def _assemble_questions(self, tech_stack, per_tech):
+        generated = []
+        def generate(techs):
+            generated.extend(techs)
+            return self.generate_questions_for_technologies(techs)
+        by_tech = self.question_bank.assemble(tech_stack, generate, per_tech)
+        metrics.note(cache="miss" if generated else "hit", generated_technologies=len(generated))
+        return by_tech
+
+    @metrics.instrument("generate_project_questions")
+    def generate_project_questions(self):
+        prompt = """Generate 5 project discussion questions covering:
+        1. Project goals and objectives
+        2. Technologies and tools used
+        3. Innovation and unique features
+        4. Challenges faced and solutions
+        5. Lessons learned and improvements
+        
+        Format as a list of questions."""
+        return self.analyze(prompt)
+
+    # --- Grading cache ---
+    def _cached_correctness(self, question, answer):
+        if self.grading_cache is None:
+            return None
+        verdict = self.grading_cache.get(self.grading_version, question, answer)
+        metrics.note(grading_cache="miss" if verdict is None else "hit")
+        return verdict
+
+    def _store_correctness(self, question, answer, verdict):
+        if self.grading_cache is not None and verdict in ("Correct", "Incorrect"):
+            self.grading_cache.put(self.grading_version, question, answer, verdict)
+
+    @metrics.instrument("check_correctness")
+    def check_correctness(self, question, answer):
+        cached = self._cached_correctness(question, answer)
+        if cached is not None:
+            metrics.note(cache="hit")
+            return cached
+        result = self.analyze(CORRECTNESS_PROMPT.format(question=question, answer=answer))
+        self._store_correctness(question, answer, _normalize_label(result, ["Correct", "Incorrect"]))
+        return result
+
+    @metrics.instrument("detect_ai_generated_text")
+    def detect_ai_generated_text(self, text, use_local=True):
+        # use_local=False asks the model even when the local detector has a
+        # verdict, for callers that fail answers on a "Yes"
+        local = self._local_ai_detection(text) if use_local else None
+        if local is not None:
+            ai_generated, confidence, reason = local
+            return f"AI-Generated: {ai_generated}\nConfidence: {confidence}\nReason: {reason}"
+        prompt = f"""Analyze if this text appears to be AI-generated. Consider:
+1. Repetitive patterns or overly perfect structure
+2. Generic or textbook-like language
+3. Lack of personal experience or specific details
+4. Overly formal or robotic tone
+5. Perfect grammar and spelling that seems too polished
+
+Text: {text}
+
+Provide your analysis in this format:
+AI-Generated: Yes/No
+Confidence: High/Medium/Low
+Reason: Brief explanation of why you think it's AI-generated or not
+"""
+        return self.analyze(prompt)
+
+    @metrics.instrument("analyze_sentiment")
+    def analyze_sentiment(self, text):
+        local = self._local_sentiment(text)
+        if local is not None:
+            return local
+        prompt = f"Analyze the sentiment of this text. Respond with only: 'Positive', 'Negative', or 'Neutral'\n\nText: {text}"
+        return self.analyze(prompt)
+
+    # --- Local fast path ---
+    def _local_sentiment(self, text):
+        if self.local_classifier is None:
+            return None
+        label = self.local_classifier.sentiment(text)
+        if label is None:
+            self.local_classifier.record(escalated=1)
+        else:
+            self.local_classifier.record(local=1, saved=1)
+            metrics.note(cache="local")
+        return label
+
+    def _local_ai_detection(self, text):
+        if self.local_classifier is None:
+            return None
+        result = self.local_classifier.ai_detection(text)
+        if result is None:
+            self.local_classifier.record(escalated=1)
+        else:
+            self.local_classifier.record(local=1, saved=1)
+            metrics.note(cache="local")
+        return result
+
+    def _local_evaluation(self, answer, mode, correctness=None):
+        # Project answers need only sentiment + AI detection. A technical
+        # answer can skip the LLM only when its correctness verdict is already
+        # known from the grading cache and the local detector finds it human:
+        # the stylometric scorer is uncalibrated (formal human prose trips
+        # it), so a local "AI-generated" never fails an answer by itself and
+        # goes to the model instead.
+        if self.local_classifier is None:
+            return None
+        sentiment = self.local_classifier.sentiment(answer)
+        ai_result = self.local_classifier.ai_detection(answer)
+        decided = sentiment is not None and ai_result is not None
+        if decided and mode == "technical" and (correctness is None or ai_result[0] == "Yes"):
+            decided = False
+        if not decided:
+            self.local_classifier.record(escalated=1)
+            return None
+        self.local_classifier.record(local=1, saved=1)
+        metrics.note(cache="local")
+        ai_detected, confidence, reason = ai_result
+        if mode != "technical":
+            correctness = "N/A"
+        return AnswerEvaluation(correctness, sentiment, ai_detected, confidence, reason)
+
+    @metrics.instrument("evaluate_answer")
+    def evaluate_answer(self, question, answer, mode="technical"):
+        # One structured round trip instead of detect/check/sentiment calls
+        cached = self._cached_correctness(question, answer) if mode == "technical" else None
+        local = self._local_evaluation(answer, mode, cached)
+        if local is not None:
+            return local
+        prompt = EVALUATION_PROMPT.format(
+            question=question,
+            answer=answer,
+            correctness_rule=TECHNICAL_CORRECTNESS_RULE if mode == "technical" else PROJECT_CORRECTNESS_RULE,
+        )
+        try:
+            raw = self._generate(
+                prompt,
+                # A plain mapping, which the SDK accepts too: building a
+                # GenerationConfig would import the SDK even for offline models
+                generation_config={
+                    'response_mime_type': "application/json",
+                    'response_schema': EVALUATION_SCHEMA,
+                },
+            )
+            evaluation = parse_evaluation(raw, mode)
+        except ValueError:
+            evaluation = self._evaluate_answer_fallback(question, answer, mode)
+        if mode == "technical":
+            if cached is not None:
+                evaluation.correctness = cached
+            elif evaluation.ai_detected == "No":
+                # AI-flagged answers are failed regardless of content, so only
+                # content-based verdicts are shared with other candidates
+                self._store_correctness(question, answer, evaluation.correctness)
+            if evaluation.ai_detected == "Yes":
+                evaluation.correctness = "Incorrect"
+        return evaluation
+
+    def _evaluate_answer_fallback(self, question, answer, mode):
+        # Per-aspect calls, used when the structured response fails to validate.
+        # A technical answer flagged as AI-generated is failed, so its
+        # detection never comes from the uncalibrated local tier alone (see
+        # _local_evaluation).
+        calls = [(self.detect_ai_generated_text, answer, mode != "technical"), (self.analyze_sentiment, answer)]
+        if mode == "technical":
+            calls.append((self.check_correctness, question, answer))
+        ai_result, sentiment, *rest = self.run_many(calls)
+        ai_generated, confidence, reason = parse_ai_detection(ai_result)
+        correctness = "N/A"
+        if rest:
+            correctness = _normalize_label(rest[0], ["Correct", "Incorrect"]) or "Incorrect"
+        sentiment = _normalize_label(sentiment, ["Positive", "Negative", "Neutral"]) or sentiment.strip()
+        return AnswerEvaluation(correctness, sentiment, ai_generated, confidence, reason)
+
+    def _candidate_profile(self, candidate_data):
+        return f"""- **Name:** {candidate_data.get('fullName')}
+        - **Email:** {candidate_data.get('email')}
+        - **Phone:** {candidate_data.get('phone')}
+        - **Location:** {candidate_data.get('location')}
+        - **Experience:** {candidate_data.get('experience')}
+        - **Desired Position(s):** {', '.join(candidate_data.get('positions', []))}
+        - **Tech Stack:** {', '.join(candidate_data.get('techStack', []))}"""
+
+    def _final_report_prompt(self, candidate_data, history):
+        return f"""
+        Generate a comprehensive hiring report in Markdown for:
+        {self._candidate_profile(candidate_data)}
+        **Interview History:**
+        {history}
+        **Summary & Recommendation:**
+        Provide a final summary and a hiring recommendation (e.g., 'Strong Hire', 'Proceed with caution', 'Not a good fit').
+        """
+
+    def _report_summary_prompt(self, candidate_data, history):
+        return f"""
+        Write the closing section of a hiring report in Markdown for:
+        {self._candidate_profile(candidate_data)}
+        **Interview History (each answer already assessed):**
+        {history}
+        **Summary & Recommendation:**
+        Provide only a final summary and a hiring recommendation (e.g., 'Strong Hire', 'Proceed with caution', 'Not a good fit'), without a heading.
+        """
+
+    def _report_head(self, candidate_data, history):
+        return f"# Hiring Report: {candidate_data.get('fullName')}\n\n{history}\n## Summary & Recommendation\n\n"
+
+    @metrics.instrument("draft_answer_assessment")
+    def draft_answer_assessment(self, section, question, answer, analysis):
+        # One answer's entry in the final report, drafted in the background
+        # as the answer is recorded (see interview.draft_assessments)
+        prompt = f"""Assess one interview answer for the candidate's final report: two or three sentences on what it shows about the candidate, citing specifics from the answer. Respond with only the assessment.
+
+Section: {section}
+Question: {question}
+Answer: {answer}
+{analysis}"""
+        return self.analyze(prompt)
+
+    # assessed: `history` carries drafted per-answer assessments, so the
+    # report is that history plus a generated summary and recommendation
+    @metrics.instrument("generate_final_report")
+    def generate_final_report(self, candidate_data, history, assessed=False):
+        if assessed:
+            return self._report_head(candidate_data, history) + self.analyze(
+                self._report_summary_prompt(candidate_data, history)
+            )
+        return self.analyze(self._final_report_prompt(candidate_data, history))
+
+    @metrics.instrument_stream("stream_final_report")
+    def stream_final_report(self, candidate_data, history, assessed=False):
+        if assessed:
+            yield self._report_head(candidate_data, history)
+            yield from self.analyze_stream(self._report_summary_prompt(candidate_data, history))
+        else:
+            yield from self.analyze_stream(self._final_report_prompt(candidate_data, history))
+
+    def _user_question_prompt(self, question):
+        return f"Concisely answer the user's question in the context of a job interview.\n\nUser: {question}\nAI:"
+
+    @metrics.instrument("answer_user_question")
+    def answer_user_question(self, question):
+        return self.analyze(self._user_question_prompt(question))
+
+    @metrics.instrument_stream("stream_user_question_answer")
+    def stream_user_question_answer(self, question):
+        return self.analyze_stream(self._user_question_prompt(question))
+
+    def is_unhelpful_reply(self, reply):
+        # Empty or off-topic bot replies are replaced by fallback_response
+        return not reply or _UNHELPFUL_REPLY.search(reply) is not None
+
+    @metrics.instrument("re_explain_question")
+    def re_explain_question(self, question):
+        prompt = f"""Re-explain this technical question in simple, clear terms that a candidate can easily understand:
+
+Question: {question}
+
+Provide a friendly, helpful explanation that breaks down the question."""
+        return self.analyze(prompt)
+
+    def fallback_response(self, context):
+        return (
+            "I'm sorry, I didn't quite understand your response. "
+            "Could you please clarify or answer the question as best you can? "
+            f"Let's stay focused on your {context} experience."
+        )
@@ -0,0 +1,137 @@
+import streamlit as st
+import hmac
+import json
+import os
+import time
+
+from analytics_store import ORDER_COLUMNS, analytics_store_from_env
+from similarity_index import similarity_index_from_env
+
+# --- Recruiter Analytics ---
+# Filters and ranks past assessments across candidates. This is a separate
+# Streamlit entry point from the candidate-facing interview (app.py), so it
+# is never reachable from an interview session, and it only opens for the
+# recruiter token in HIRELY_RECRUITER_TOKEN:
+#
+#     HIRELY_RECRUITER_TOKEN=... streamlit run analytics_app.py --server.port 8502
+st.set_page_config(
+    page_title="Hirely AI · Analytics",
+    layout="wide",
+)
+
+RECRUITER_TOKEN = os.getenv("HIRELY_RECRUITER_TOKEN", "")
+
+@st.cache_resource
+def get_analytics_store():
+    return analytics_store_from_env()
+
+@st.cache_resource
+def get_similarity_index():
+    return similarity_index_from_env()
+
+def require_recruiter():
+    # Stops the script until the recruiter token has been entered this session
+    if not RECRUITER_TOKEN:
+        st.error("Set HIRELY_RECRUITER_TOKEN to enable the analytics view.")
+        st.stop()
+    if st.session_state.get("recruiter_authenticated"):
+        return
+    token = st.text_input("Recruiter token", type="password")
+    if token and hmac.compare_digest(token.encode("utf-8"), RECRUITER_TOKEN.encode("utf-8")):
+        st.session_state.recruiter_authenticated = True
+        st.rerun()
+    if token:
+        st.error("Invalid token.")
+    st.stop()
+
+def show_analytics_page():
+    st.title("📊 Candidate Analytics")
+    store = get_analytics_store()
+
+    # Index reports written since the last visit (unchanged files are skipped,
+    # deleted ones dropped)
+    if "analytics_ingested" not in st.session_state or st.button("🔄 Index new reports"):
+        stats = store.ingest()
+        st.session_state.analytics_ingested = True
+        if stats['added'] or stats['removed']:
+            st.toast(f"Indexed {stats['added']} new reports, dropped {stats['removed']} in {stats['seconds']:.2f}s")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        techs = st.multiselect("Tech stack (all of)", [tech for tech, _ in store.technologies()])
+        search = st.text_input("Name, email or position")
+    with col2:
+        min_authenticity = st.slider("Min authenticity rate (%)", 0, 100, 0)
+        min_completion = st.slider("Min completion rate (%)", 0, 100, 0)
+        min_positive = st.slider("Min positive sentiment rate (%)", 0, 100, 0)
+    with col3:
+        dates = st.date_input("Assessment date range", value=())
+        order_by = st.selectbox("Rank by", ORDER_COLUMNS, format_func=lambda c: c.replace("_", " ").capitalize())
+        descending = st.toggle("Highest first", value=True)
+        limit = st.number_input("Rows", min_value=10, max_value=1000, value=100, step=10)
+
+    filters = {
+        'techs': techs,
+        'min_authenticity': min_authenticity or None,
+        'min_completion': min_completion or None,
+        'min_positive': min_positive or None,
+        'since': dates[0].isoformat() if len(dates) > 0 else None,
+        'until': dates[1].isoformat() if len(dates) > 1 else None,
+        'search': search.strip() or None,
+    }
+    started = time.perf_counter()
+    rows = store.query(order_by=order_by, descending=descending, limit=int(limit), **filters)
+    total = store.count(**filters)
+    elapsed = time.perf_counter() - started
+
+    st.caption(f"{total} matching candidates · showing {len(rows)} · {elapsed * 1000:.0f} ms")
+    st.dataframe([
+        {
+            'Name': r['candidate_name'], 'Email': r['email'], 'Position': r['position'],
+            'Tech Stack': r['tech_stack'], 'Experience': r['experience'], 'Assessed': r['assessed_at'][:16],
+            'Authenticity %': r['authenticity_rate'], 'Completion %': r['completion_rate'],
+            'Positive %': r['positive_rate'], 'Report': os.path.basename(r['path']),
+        }
+        for r in rows
+    ], hide_index=True, use_container_width=True)
+    show_near_duplicates(rows)
+
+def show_near_duplicates(rows):
+    # Assessments list near-duplicate answers by similarity index id only;
+    # this is the one place they are resolved to the other candidates
+    st.subheader("Near-duplicate answers")
+    if not rows:
+        return
+    by_label = {f"{r['candidate_name']} · {os.path.basename(r['path'])}": r for r in rows}
+    row = by_label[st.selectbox("Assessment", list(by_label))]
+    try:
+        with open(row['path'], encoding="utf-8") as f:
+            assessment = json.load(f)
+    except (OSError, ValueError):
+        st.warning("This report is no longer readable; re-index the reports.")
+        return
+    results = [
+        (section, i, result)
+        for section in ("technical_interview", "project_interview")
+        for i, result in enumerate(assessment.get(section, {}).get('results', []), 1)
+        if result.get('similar_answers')
+    ]
+    if not results:
+        st.caption("No near-duplicate answers in this assessment.")
+        return
+    index = get_similarity_index()
+    matched = index.resolve(
+        m['answer_id'] for _, _, result in results for m in result['similar_answers'] if 'answer_id' in m
+    ) if index is not None else {}
+    st.dataframe([
+        {
+            'Section': section.split("_")[0].capitalize(), 'Question #': i,
+            'Similarity %': round(m['similarity'] * 100),
+            'Matched Candidate': matched.get(m.get('answer_id'), {}).get('candidate') or m.get('candidate') or "Not in index",
+            'Matched Answer': matched.get(m.get('answer_id'), {}).get('excerpt', ""),
+        }
+        for section, i, result in results for m in result['similar_answers']
+    ], hide_index=True, use_container_width=True)
+
+require_recruiter()
+show_analytics_page()
@@ -0,0 +1,248 @@
+import argparse
+from contextlib import contextmanager
+import json
+import os
+import sqlite3
+import time
+
+from question_bank import canonicalize_technology
+from report_cache import REPORTS_DIR
+
+# --- Analytics Store ---
+# An indexed SQLite table of past assessments, one row per assessment_*.json
+# in reports/, plus one row per (assessment, canonical technology). Ingestion
+# is incremental: files already indexed with the same mtime and size are
+# skipped, so re-running it only reads reports written since the last run,
+# and rows whose report file has been deleted are dropped.
+# Recruiters filter and rank candidates through query() instead of globbing
+# and parsing every report file.
+DEFAULT_DB_PATH = os.path.join(REPORTS_DIR, "analytics.sqlite3")
+
+# Columns query() may sort by
+ORDER_COLUMNS = (
+    "assessed_at", "authenticity_rate", "completion_rate", "positive_rate", "experience", "candidate_name",
+)
+
+def _number(value, default=0.0):
+    try:
+        return float(str(value).split("-")[0].strip())
+    except (TypeError, ValueError):
+        return default
+
+def _rate(part, whole):
+    return round(part / whole * 100, 1) if whole else 0.0
+
+def assessment_row(assessment):
+    # Flattens an assessment dict (report_export layout; older files may lack
+    # some fields) into (column values, canonical technologies)
+    info = assessment.get('candidate_information', {})
+    technical = assessment.get('technical_interview', {})
+    project = assessment.get('project_interview', {})
+    overall = assessment.get('overall_metrics', {})
+    answered = len(technical.get('results', [])) + len(project.get('results', []))
+    total = overall.get('total_questions_across_interviews') or answered
+    techs = sorted({
+        canonicalize_technology(tech) for tech in str(info.get('tech_stack', '')).split(',') if tech.strip()
+    })
+    row = {
+        'candidate_name': info.get('name', ''),
+        'email': info.get('email', ''),
+        'position': info.get('position', ''),
+        'tech_stack': info.get('tech_stack', ''),
+        'experience': _number(info.get('experience')),
+        'assessed_at': assessment.get('report_metadata', {}).get('generated_at', ''),
+        'questions_total': total,
+        'answered': answered,
+        'ai_generated': overall.get('total_ai_generated_responses', 0),
+        'authenticity_rate': overall.get('overall_authenticity_rate', 0.0),
+        'positive_rate': overall.get('overall_positive_rate', 0.0),
+        'completion_rate': overall.get('overall_completion_rate', _rate(answered, total)),
+    }
+    return row, techs
+
+class AnalyticsStore:
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS assessments (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT UNIQUE NOT NULL,
+                    mtime REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    candidate_name TEXT,
+                    email TEXT,
+                    position TEXT,
+                    tech_stack TEXT,
+                    experience REAL,
+                    assessed_at TEXT,
+                    questions_total INTEGER,
+                    answered INTEGER,
+                    ai_generated INTEGER,
+                    authenticity_rate REAL,
+                    positive_rate REAL,
+                    completion_rate REAL
+                )"""
+            )
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS assessment_techs (
+                    tech TEXT NOT NULL,
+                    assessment_id INTEGER NOT NULL REFERENCES assessments(id) ON DELETE CASCADE,
+                    PRIMARY KEY (tech, assessment_id)
+                ) WITHOUT ROWID"""
+            )
+            for column in ("assessed_at", "authenticity_rate", "completion_rate", "positive_rate", "email"):
+                conn.execute(f"CREATE INDEX IF NOT EXISTS idx_assessments_{column} ON assessments({column})")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_assessment_techs_id ON assessment_techs(assessment_id)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add(self, assessment, path, conn=None, stat=None):
+        # Index one assessment; re-adding the same path replaces its row
+        if conn is None:
+            with self._connect() as conn:
+                return self.add(assessment, path, conn, stat)
+        stat = stat or os.stat(path)
+        row, techs = assessment_row(assessment)
+        conn.execute("DELETE FROM assessments WHERE path = ?", (path,))
+        columns = ["path", "mtime", "size"] + list(row)
+        cursor = conn.execute(
+            f"INSERT INTO assessments ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+            [path, stat.st_mtime, stat.st_size] + list(row.values()),
+        )
+        conn.executemany(
+            "INSERT INTO assessment_techs (tech, assessment_id) VALUES (?, ?)",
+            [(tech, cursor.lastrowid) for tech in techs],
+        )
+
+    def ingest(self, reports_dir=REPORTS_DIR, batch_size=500):
+        # Index assessment_*.json files that are new or changed since the last
+        # run and drop rows for files deleted from reports_dir; returns
+        # {'added', 'skipped', 'failed', 'removed', 'seconds'}
+        started = time.perf_counter()
+        with self._connect() as conn:
+            known = {row['path']: (row['mtime'], row['size']) for row in conn.execute("SELECT path, mtime, size FROM assessments")}
+        added = skipped = failed = 0
+        pending = []
+        present = set()
+        with os.scandir(reports_dir) as entries:
+            for entry in entries:
+                if not (entry.name.startswith("assessment_") and entry.name.endswith(".json")):
+                    continue
+                present.add(entry.path)
+                stat = entry.stat()
+                if known.get(entry.path) == (stat.st_mtime, stat.st_size):
+                    skipped += 1
+                    continue
+                pending.append((entry.path, stat))
+
+        for start in range(0, len(pending), batch_size):
+            with self._connect() as conn:
+                for path, stat in pending[start:start + batch_size]:
+                    try:
+                        with open(path, encoding="utf-8") as f:
+                            assessment = json.load(f)
+                    except (OSError, ValueError):
+                        # Partially written or not an assessment; picked up on a later run
+                        failed += 1
+                        continue
+                    self.add(assessment, path, conn, stat)
+                    added += 1
+
+        # Only rows indexed from this directory; other directories may share the store
+        directory = os.path.abspath(reports_dir)
+        removed = [
+            (path,) for path in known
+            if path not in present and os.path.dirname(os.path.abspath(path)) == directory
+        ]
+        if removed:
+            with self._connect() as conn:
+                conn.executemany("DELETE FROM assessments WHERE path = ?", removed)
+        return {
+            'added': added, 'skipped': skipped, 'failed': failed, 'removed': len(removed),
+            'seconds': time.perf_counter() - started,
+        }
+
+    def _where(self, techs, min_authenticity, min_completion, min_positive, since, until, search):
+        clauses, params = [], []
+        if techs:
+            keys = sorted({canonicalize_technology(tech) for tech in techs if str(tech).strip()})
+            # Candidates whose stack includes every requested technology
+            clauses.append(
+                f"""id IN (SELECT assessment_id FROM assessment_techs WHERE tech IN ({', '.join('?' * len(keys))})
+                    GROUP BY assessment_id HAVING COUNT(*) = ?)"""
+            )
+            params += keys + [len(keys)]
+        for column, minimum in (
+            ("authenticity_rate", min_authenticity), ("completion_rate", min_completion), ("positive_rate", min_positive),
+        ):
+            if minimum is not None:
+                clauses.append(f"{column} >= ?")
+                params.append(minimum)
+        if since:
+            clauses.append("assessed_at >= ?")
+            params.append(str(since))
+        if until:
+            # Dates without a time include the whole day
+            clauses.append("assessed_at < ?")
+            params.append(str(until) + ("T99" if len(str(until)) == 10 else ""))
+        if search:
+            clauses.append("(candidate_name LIKE ? OR email LIKE ? OR position LIKE ?)")
+            params += [f"%{search}%"] * 3
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, techs=None, min_authenticity=None, min_completion=None, min_positive=None,
+              since=None, until=None, search=None, order_by="assessed_at", descending=True,
+              limit=100, offset=0):
+        # Matching assessments as dicts, ranked by `order_by` (one of ORDER_COLUMNS)
+        if order_by not in ORDER_COLUMNS:
+            raise ValueError(f"cannot order by {order_by!r}; expected one of {', '.join(ORDER_COLUMNS)}")
+        where, params = self._where(techs, min_authenticity, min_completion, min_positive, since, until, search)
+        sql = (
+            f"SELECT * FROM assessments{where} ORDER BY {order_by} {'DESC' if descending else 'ASC'}, id DESC "
+            "LIMIT ? OFFSET ?"
+        )
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(sql, params + [limit, offset])]
+
+    def count(self, techs=None, min_authenticity=None, min_completion=None, min_positive=None,
+              since=None, until=None, search=None):
+        where, params = self._where(techs, min_authenticity, min_completion, min_positive, since, until, search)
+        with self._connect() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM assessments{where}", params).fetchone()[0]
+
+    def technologies(self, limit=200):
+        # [(tech, candidates)] most common first, for filter pickers
+        with self._connect() as conn:
+            return [
+                (row['tech'], row['n']) for row in conn.execute(
+                    "SELECT tech, COUNT(*) AS n FROM assessment_techs GROUP BY tech ORDER BY n DESC LIMIT ?", (limit,)
+                )
+            ]
+
+def analytics_store_from_env():
+    return AnalyticsStore(os.getenv("HIRELY_ANALYTICS_DB", DEFAULT_DB_PATH))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index assessment reports for the Hirely AI analytics page.")
+    parser.add_argument("--reports-dir", default=REPORTS_DIR)
+    args = parser.parse_args(argv)
+    stats = analytics_store_from_env().ingest(args.reports_dir)
+    print(
+        f"Indexed {stats['added']} new reports ({stats['skipped']} unchanged, {stats['failed']} unreadable, "
+        f"{stats['removed']} deleted) in {stats['seconds']:.2f}s"
+    )
+
+if __name__ == "__main__":
+    main()
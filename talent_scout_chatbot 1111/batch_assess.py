@@ -0,0 +1,229 @@
+"""Bulk assessment of written interview transcripts.
+
+Reads candidates with their question/answer transcripts from JSONL or CSV,
+evaluates every answer and generates the final report with HirelyAI, and
+writes the same artifacts as the app (assessment_*.json/.md/.pdf per
+candidate and a row in the rolling summary.csv). Completed candidates are recorded in a manifest,
+so re-running the same command resumes where it stopped.
+
+JSONL, one candidate per line:
+    {"id": "c-1", "candidate": {"fullName": ..., "email": ..., "techStack": [...], ...},
+     "technical": [{"question": ..., "answer": ...}], "project": [{"question": ..., "answer": ...}]}
+
+CSV, one answer per row (grouped by candidate_id, or email where it is empty;
+rows with neither are rejected):
+    candidate_id,fullName,email,phone,location,experience,positions,techStack,section,question,answer
+    (positions/techStack comma-separated; section is "technical" or "project")
+
+Reports are cached under <output-dir>/cache, so a re-run regenerates no
+report whose answers are unchanged. --fake-model dry runs write everything
+(artifacts, summary.csv, manifest, cache, similarity index) under
+<output-dir>/dryrun, so they never mark candidates done for a real run or
+reach the analytics index.
+
+    python batch_assess.py transcripts.jsonl --workers 8
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import csv
+from datetime import datetime
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+from ai_analysis import HirelyAI, configure_genai
+from interview import answer_record, build_interview_history
+from grading_cache import grading_cache_from_env
+from local_classifiers import local_classifier_from_env
+from report_cache import REPORTS_DIR, ReportCache, report_cache_key
+from report_export import build_assessment, export_assessment
+from similarity_index import SimilarityIndex, candidate_label, similarity_index_from_env
+
+CANDIDATE_FIELDS = ["fullName", "email", "phone", "location", "experience", "positions", "techStack"]
+
+def _split_list(value):
+    if isinstance(value, list):
+        return value
+    return [item.strip() for item in str(value or "").split(',') if item.strip()]
+
+def _normalize_candidate(record):
+    candidate = dict(record.get('candidate') or {})
+    candidate['positions'] = _split_list(candidate.get('positions'))
+    candidate['techStack'] = _split_list(candidate.get('techStack'))
+    key = record.get('id') or candidate.get('email')
+    if not key:
+        encoded = json.dumps(record, sort_keys=True, ensure_ascii=False)
+        key = hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+    return {
+        'id': str(key),
+        'candidate': candidate,
+        'technical': list(record.get('technical') or []),
+        'project': list(record.get('project') or []),
+    }
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield _normalize_candidate(json.loads(line))
+
+def read_csv(path):
+    records = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            key = (row.get('candidate_id') or row.get('email') or '').strip()
+            if not key:
+                raise ValueError(f"{path}:{reader.line_num}: row has neither candidate_id nor email")
+            record = records.setdefault(key, {
+                'id': key,
+                'candidate': {field: row.get(field, '') for field in CANDIDATE_FIELDS},
+                'technical': [],
+                'project': [],
+            })
+            section = 'project' if (row.get('section') or '').strip().lower() == 'project' else 'technical'
+            record[section].append({'question': row.get('question', ''), 'answer': row.get('answer', '')})
+    for record in records.values():
+        yield _normalize_candidate(record)
+
+def read_transcripts(path):
+    return read_csv(path) if path.lower().endswith(".csv") else read_jsonl(path)
+
+class Manifest:
+    # Append-only record of completed candidate ids, one JSON object per line
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.completed = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self.completed.add(json.loads(line)['id'])
+                    except (ValueError, KeyError):
+                        # A torn last line from a crash; that candidate is redone
+                        continue
+
+    def mark_done(self, candidate_id, artifacts):
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({'id': candidate_id, 'artifacts': artifacts, 'at': datetime.now().isoformat()}) + "\n")
+            self.completed.add(candidate_id)
+
+def assess_candidate(hirely_ai, report_cache, record, similarity_index=None):
+    # Evaluates every answer, generates the report and returns the assessment dict
+    candidate = record['candidate']
+
+    def similar(item):
+        if similarity_index is None:
+            return None
+        return similarity_index.add(item['answer'], record['id'], candidate_label(candidate), item['question'])
+
+    def evaluate(section, mode):
+        items = [item for item in record[section] if str(item.get('answer', '')).strip()]
+        evaluations = hirely_ai.run_many(
+            (hirely_ai.evaluate_answer, item['question'], item['answer'], mode) for item in items
+        )
+        return {
+            i: answer_record(item['question'], item['answer'], evaluation.to_analysis(mode), similar(item))
+            for i, (item, evaluation) in enumerate(zip(items, evaluations))
+        }
+
+    technical_answers = evaluate('technical', "technical")
+    project_answers = evaluate('project', "project")
+    key = report_cache_key(candidate, technical_answers, project_answers)
+    report = report_cache.get_or_generate(
+        key,
+        lambda: hirely_ai.generate_final_report(candidate, build_interview_history(technical_answers, project_answers)),
+    )
+    return build_assessment(
+        candidate, technical_answers, project_answers, report,
+        technical_total=len(record['technical']), project_total=len(record['project']),
+    )
+
+def run_batch(records, hirely_ai, output_dir, manifest, workers, report_cache=None, similarity_index=None,
+              log=sys.stderr):
+    report_cache = report_cache or ReportCache(os.path.join(output_dir, "cache"))
+    records = list(records)
+    pending = [record for record in records if record['id'] not in manifest.completed]
+    # The manifest may also list candidates from other inputs
+    skipped = len({record['id'] for record in records} & manifest.completed)
+    print(f"{len(pending)} candidates to assess ({skipped} already completed)", file=log)
+
+    started = time.perf_counter()
+    done = failed = 0
+
+    def process(record):
+        assessment = assess_candidate(hirely_ai, report_cache, record, similarity_index)
+        paths, _ = export_assessment(assessment, output_dir)
+        manifest.mark_done(record['id'], list(paths.values()))
+        return record
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hirely-batch") as pool:
+        futures = {pool.submit(process, record): record for record in pending}
+        for future in as_completed(futures):
+            record = futures[future]
+            try:
+                future.result()
+                done += 1
+                status = "done"
+            except Exception as exc:
+                failed += 1
+                status = f"FAILED ({type(exc).__name__}: {exc})"
+            elapsed = time.perf_counter() - started
+            rate = done / elapsed * 60 if elapsed else 0.0
+            print(
+                f"[{done + failed}/{len(pending)}] {record['id']}: {status} — {rate:.1f} candidates/min",
+                file=log,
+            )
+    return {'completed': done, 'failed': failed, 'skipped': skipped, 'seconds': time.perf_counter() - started}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="transcripts file (.jsonl or .csv)")
+    parser.add_argument("--output-dir", default=REPORTS_DIR)
+    parser.add_argument("--workers", type=int, default=4, help="candidates assessed concurrently")
+    parser.add_argument("--manifest", help="resume manifest (default: <output-dir>/batch_<input>.manifest.jsonl)")
+    parser.add_argument(
+        "--fake-model", action="store_true", help="use the offline fake model (dry run, under <output-dir>/dryrun)",
+    )
+    args = parser.parse_args(argv)
+    if args.fake_model:
+        args.output_dir = os.path.join(args.output_dir, "dryrun")
+    try:
+        records = list(read_transcripts(args.input))
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    manifest_path = args.manifest or os.path.join(
+        args.output_dir, f"batch_{os.path.splitext(os.path.basename(args.input))[0]}.manifest.jsonl"
+    )
+    os.makedirs(args.output_dir, exist_ok=True)
+    manifest = Manifest(manifest_path)
+
+    if args.fake_model:
+        import fake_model
+        model = fake_model.FakeGenerativeModel()
+        similarity_index = SimilarityIndex(os.path.join(args.output_dir, "similarity_index.sqlite3"))
+    else:
+        configure_genai(api_key=os.getenv("GEMINI_API_KEY"))
+        model = None
+        similarity_index = similarity_index_from_env()
+    hirely_ai = HirelyAI(local_classifier=local_classifier_from_env(), model=model, grading_cache=grading_cache_from_env())
+
+    stats = run_batch(
+        records, hirely_ai, args.output_dir, manifest, args.workers, similarity_index=similarity_index,
+    )
+    minutes = stats['seconds'] / 60
+    print(
+        f"Completed {stats['completed']}, failed {stats['failed']}, skipped {stats['skipped']} "
+        f"in {stats['seconds']:.1f}s ({stats['completed'] / minutes if minutes else 0:.1f} candidates/min)",
+        file=sys.stderr,
+    )
+    return 1 if stats['failed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
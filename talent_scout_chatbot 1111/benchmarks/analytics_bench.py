@@ -0,0 +1,86 @@
+"""Analytics store query benchmark.
+
+Indexes N synthetic assessments into a temporary analytics store and times
+the recruiter-style filters the analytics page runs:
+
+    python benchmarks/analytics_bench.py --candidates 100000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from analytics_store import AnalyticsStore  # noqa: E402
+
+TECHS = ["Python", "React", "SQL", "Docker", "Java", "Spring", "Go", "Kubernetes", "AWS",
+         "TypeScript", "Node.js", "MongoDB", "PostgreSQL", "GraphQL", "Machine Learning"]
+
+QUERIES = {
+    'latest 50': dict(limit=50),
+    'python + sql': dict(techs=["Python", "SQL"], limit=50),
+    'authenticity >= 90, by completion': dict(min_authenticity=90, order_by="completion_rate", limit=50),
+    'go, completion >= 80, 2025 H2': dict(techs=["Go"], min_completion=80, since="2025-07-01", until="2025-12-31", limit=50),
+    'name search': dict(search="Candidate 4242", limit=50),
+    'positive >= 75, page 10': dict(min_positive=75, order_by="positive_rate", limit=50, offset=450),
+}
+
+def synthetic_assessment(rng, i):
+    answered = rng.randint(1, 12)
+    total = answered + rng.randint(0, 4)
+    ai = rng.randint(0, answered // 3)
+    positive = rng.randint(0, answered)
+    day = time.gmtime(1704067200 + rng.randint(0, 730) * 86400)
+    return {
+        'report_metadata': {'generated_at': time.strftime("%Y-%m-%dT%H:%M:%S", day)},
+        'candidate_information': {
+            'name': f"Candidate {i}", 'email': f"candidate{i}@example.com", 'position': "Software Engineer",
+            'experience': str(rng.randint(0, 20)), 'tech_stack': ", ".join(rng.sample(TECHS, rng.randint(2, 5))),
+        },
+        'technical_interview': {'results': [{}] * answered},
+        'project_interview': {'results': []},
+        'overall_metrics': {
+            'total_questions_across_interviews': total,
+            'total_ai_generated_responses': ai,
+            'overall_authenticity_rate': round((answered - ai) / answered * 100, 1),
+            'overall_positive_rate': round(positive / answered * 100, 1),
+            'overall_completion_rate': round(answered / total * 100, 1),
+        },
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per query; the best is reported")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    store = AnalyticsStore(os.path.join(tempfile.mkdtemp(), "analytics.sqlite3"))
+    stat = SimpleNamespace(st_mtime=0.0, st_size=0)
+    started = time.perf_counter()
+    with store._connect() as conn:
+        for i in range(args.candidates):
+            store.add(synthetic_assessment(rng, i), f"synthetic/{i}.json", conn, stat)
+    load_seconds = time.perf_counter() - started
+
+    results = {'candidates': args.candidates, 'load_seconds': round(load_seconds, 2), 'queries': {}}
+    for name, filters in QUERIES.items():
+        timings = []
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            rows = store.query(**filters)
+            count_filters = {k: v for k, v in filters.items() if k not in ("order_by", "limit", "offset")}
+            total = store.count(**count_filters)
+            timings.append(time.perf_counter() - t)
+        results['queries'][name] = {'ms': round(min(timings) * 1000, 2), 'rows': len(rows), 'matches': total}
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Intent router benchmark.
+
+Scores intent_router.IntentRouter (including its low-confidence fallback
+to "answer") next to the heuristics it replaced (trailing "?" means a
+question, a substring list means a clarification, an exact list of skip
+words), and times it. Two labeled sets, one {"text", "intent"} object per
+line: benchmarks/intent_corpus.jsonl, which the cue lists and weights were
+tuned against, and benchmarks/intent_heldout.jsonl, which was written
+separately and is never used for tuning; the held-out numbers are the ones
+to trust. Add new misroutes to the held-out set.
+
+A misrouted message costs the LLM call of the handler it was sent to: a
+question goes to answer_user_question, a clarification to
+re_explain_question and an answer to evaluate_answer; a skip costs no call
+but drops the candidate's input. Wasted calls and dropped inputs are
+reported per 1000 messages, over both sets and over the message mix
+interview_bench.py sends:
+
+    python benchmarks/intent_bench.py --runs 200
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from intent_router import INTENTS, IntentRouter  # noqa: E402
+from interview_bench import MESSAGES  # noqa: E402
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_corpus.jsonl")
+HELDOUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_heldout.jsonl")
+
+# LLM calls made by the handler each intent is routed to
+HANDLER_CALLS = {'answer': 1, 'question': 1, 'clarification': 1, 'skip': 0}
+
+_LEGACY_SKIP_WORDS = ['ok', 'continue', 'next', 'yes', 'got it']
+_LEGACY_CLARIFICATION_PHRASES = [
+    "i didn't understand", "explain", "repeat", "clarify",
+    "what do you mean", "can you explain", "i don't get it",
+    "not clear", "confused", "help me understand"
+]
+
+def legacy_route(text):
+    # The routing the app used before intent_router, for comparison
+    if text.strip().endswith('?'):
+        return "question"
+    if any(phrase in text.lower() for phrase in _LEGACY_CLARIFICATION_PHRASES):
+        return "clarification"
+    if text.lower() in _LEGACY_SKIP_WORDS:
+        return "skip"
+    return "answer"
+
+_router = IntentRouter()
+
+def router_route(text):
+    return _router.route(text)[0]
+
+def load_corpus(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def score(route, rows):
+    # rows: [(weight, text, intent)]
+    confusion = {want: dict.fromkeys(INTENTS, 0) for want in INTENTS}
+    total = correct = wasted = dropped = 0.0
+    for weight, text, want in rows:
+        got = route(text)
+        confusion[want][got] += weight
+        total += weight
+        if got == want:
+            correct += weight
+            continue
+        wasted += weight * HANDLER_CALLS[got]
+        dropped += weight * (got == "skip")
+    return {
+        'accuracy': round(correct / total, 4),
+        'wasted_llm_calls_per_1000': round(wasted / total * 1000, 1),
+        'dropped_inputs_per_1000': round(dropped / total * 1000, 1),
+        'confusion': {want: {got: round(n, 2) for got, n in row.items() if n} for want, row in confusion.items()},
+    }
+
+def misroutes(route, rows, limit):
+    return [
+        {'text': text, 'intent': want, 'routed': route(text)}
+        for _, text, want in rows if route(text) != want
+    ][:limit]
+
+def time_route(route, texts, runs):
+    started = time.perf_counter()
+    for _ in range(runs):
+        for text in texts:
+            route(text)
+    elapsed = time.perf_counter() - started
+    messages = runs * len(texts)
+    return {
+        'us_per_message': round(elapsed / messages * 1e6, 2),
+        'messages_per_second': round(messages / elapsed),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=CORPUS, help="tuning set")
+    parser.add_argument("--heldout", default=HELDOUT, help="held-out set")
+    parser.add_argument("--runs", type=int, default=100, help="passes over the corpus when timing")
+    parser.add_argument("--show-misroutes", type=int, default=10, help="router misroutes to list")
+    args = parser.parse_args(argv)
+
+    corpus = [(1, row['text'], row['intent']) for row in load_corpus(args.corpus)]
+    heldout = [(1, row['text'], row['intent']) for row in load_corpus(args.heldout)]
+    # interview_bench.py's weighted mix, labeled by what each message is
+    mix_labels = ["answer", "answer", "answer", "answer", "question", "clarification", "skip"]
+    mix = [(weight, text, intent) for (weight, text), intent in zip(MESSAGES, mix_labels)]
+    texts = [text for _, text, _ in corpus]
+
+    def by_intent(rows):
+        counts = {}
+        for _, _, intent in rows:
+            counts[intent] = counts.get(intent, 0) + 1
+        return counts
+
+    print(json.dumps({
+        'corpus': {'messages': len(corpus), 'by_intent': by_intent(corpus)},
+        'heldout': {'messages': len(heldout), 'by_intent': by_intent(heldout)},
+        'router': {
+            'heldout': score(router_route, heldout),
+            'corpus': score(router_route, corpus),
+            'interview_bench_mix': score(router_route, mix),
+            'timing': time_route(router_route, texts, args.runs),
+            'misroutes': misroutes(router_route, heldout + corpus, args.show_misroutes),
+        },
+        'legacy': {
+            'heldout': score(legacy_route, heldout),
+            'corpus': score(legacy_route, corpus),
+            'interview_bench_mix': score(legacy_route, mix),
+            'timing': time_route(legacy_route, texts, args.runs),
+        },
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
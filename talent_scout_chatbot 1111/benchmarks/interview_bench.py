@@ -0,0 +1,223 @@
+"""Headless interview benchmark and load test.
+
+Drives the full interview flow (question generation, answers, clarifications,
+project discussion, final report) through interview.InterviewSession against
+fake_model.FakeGenerativeModel, with N simulated candidates running
+concurrently. Writes machine-readable JSON so runs can be compared across
+revisions:
+
+    python benchmarks/interview_bench.py --candidates 50 --concurrency 10 \\
+        --latency lognormal:0.8,0.5 --error-rate 0.02 --output run.json
+    python benchmarks/interview_bench.py --compare run.json
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+import fake_model  # noqa: E402
+from adaptive import AdaptiveConfig  # noqa: E402
+from ai_analysis import HirelyAI, configure_concurrency  # noqa: E402
+from grading_cache import GradingCache  # noqa: E402
+from interview import InterviewSession  # noqa: E402
+from llm_client import RateLimiter  # noqa: E402
+from local_classifiers import LocalClassifier  # noqa: E402
+from metrics import REGISTRY as metrics  # noqa: E402
+from question_bank import QuestionBank  # noqa: E402
+from routing import ModelRouter  # noqa: E402
+from similarity_index import SimilarityIndex  # noqa: E402
+
+STACKS = [
+    ["Python", "React", "SQL", "Docker"],
+    ["Java", "Spring", "PostgreSQL"],
+    ["JavaScript", "Node.js", "MongoDB"],
+    ["Python", "Machine Learning", "SQL"],
+    ["Go", "Kubernetes", "AWS"],
+    ["TypeScript", "React", "GraphQL"],
+]
+
+# (weight, message) — a mix of typed answers, pasted model-style answers,
+# candidate questions, clarification requests and skips
+MESSAGES = [
+    (30, "honestly i'd use a dict here, lookups are O(1) and we did exactly that at my last job to cache user sessions"),
+    (20, "I think the main thing is indexes. We had a slow report query and adding a composite index took it from 8s to 200ms."),
+    (15, "Containers share the host kernel, so they start fast and are light. VMs virtualize hardware and run a full OS, which isolates more but costs more."),
+    (10, "Furthermore, it is important to note that asynchronous programming plays a crucial role in modern applications. "
+         "It enables non-blocking operations, ensures responsiveness, and facilitates scalability. "
+         "In conclusion, leveraging these paradigms provides a comprehensive solution for various use cases."),
+    (8, "Does this role involve on-call work?"),
+    (7, "Sorry, can you explain what you mean by that?"),
+    (10, "next"),
+]
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+def simulate_candidate(hirely_ai, index, seed, similarity_index=None, max_messages=200, adaptive=None):
+    rng = random.Random(f"{seed}:{index}")
+    weights, messages = zip(*MESSAGES)
+    candidate = {
+        'fullName': f"Candidate {index}",
+        'email': f"candidate{index}@example.com",
+        'phone': "0000000000",
+        'experience': rng.randint(0, 15),
+        'positions': ["Software Engineer"],
+        'location': "Remote",
+        'techStack': rng.choice(STACKS),
+    }
+    started = time.perf_counter()
+    session = InterviewSession(hirely_ai, candidate, similarity_index=similarity_index, adaptive=adaptive)
+    session.start()
+    sent = 0
+    intents = {}
+    while session.phase != "report" and sent < max_messages:
+        result = session.submit(rng.choices(messages, weights)[0])
+        intents[result['intent']] = intents.get(result['intent'], 0) + 1
+        sent += 1
+    session.generate_report()
+    return {
+        'seconds': time.perf_counter() - started,
+        'messages': sent,
+        'intents': intents,
+        'questions': len(session.technical_questions) + len(session.project_questions),
+        'technical_questions': len(session.technical_questions),
+    }
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=APP_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def run(args):
+    metrics.metrics_dir = None
+    configure_concurrency(args.max_concurrency)
+    model = fake_model.FakeGenerativeModel(
+        latency=fake_model.parse_latency(args.latency), error_rate=args.error_rate, seed=args.seed,
+    )
+    bank = None
+    if not args.no_question_bank:
+        bank = QuestionBank(os.path.join(tempfile.mkdtemp(), "bench_bank.sqlite3"), rng=random.Random(args.seed))
+    hirely_ai = HirelyAI(
+        question_bank=bank,
+        local_classifier=None if args.no_local_tier else LocalClassifier(),
+        model=model,
+        grading_cache=None if args.no_grading_cache else GradingCache(os.path.join(tempfile.mkdtemp(), "bench_grading.sqlite3")),
+        router=ModelRouter(hedging=not args.no_hedging),
+    )
+    hirely_ai.client.limiter = RateLimiter(args.rpm, args.tpm)
+    similarity_index = None
+    if not args.no_similarity_index:
+        similarity_index = SimilarityIndex(os.path.join(tempfile.mkdtemp(), "bench_similarity.sqlite3"))
+
+    started = time.perf_counter()
+    failures = []
+    interviews = []
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        adaptive = AdaptiveConfig(args.adaptive_min, args.adaptive_max) if args.adaptive else None
+        futures = [
+            pool.submit(simulate_candidate, hirely_ai, i, args.seed, similarity_index, adaptive=adaptive)
+            for i in range(args.candidates)
+        ]
+        for future in futures:
+            try:
+                interviews.append(future.result())
+            except Exception as exc:
+                failures.append(f"{type(exc).__name__}: {exc}")
+    wall = time.perf_counter() - started
+
+    latencies = [i['seconds'] for i in interviews]
+    completed = len(interviews)
+    return {
+        'benchmark': 'interview',
+        'revision': git_revision(),
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'config': vars(args),
+        'results': {
+            'interviews_completed': completed,
+            'interviews_failed': len(failures),
+            'failure_types': sorted(set(failures))[:10],
+            'wall_seconds': round(wall, 3),
+            'throughput_per_minute': round(completed / wall * 60, 2) if wall else 0.0,
+            'e2e_seconds_mean': round(sum(latencies) / completed, 3) if completed else 0.0,
+            'e2e_seconds_p50': round(_percentile(latencies, 0.50), 3),
+            'e2e_seconds_p95': round(_percentile(latencies, 0.95), 3),
+            'llm_calls_total': model.calls,
+            'llm_calls_per_interview': round(model.calls / max(1, args.candidates), 2),
+            'llm_injected_failures': model.failures,
+            'messages_per_interview': round(sum(i['messages'] for i in interviews) / max(1, completed), 2),
+            'technical_questions_per_interview': round(
+                sum(i['technical_questions'] for i in interviews) / max(1, completed), 2
+            ),
+            'client': dict(hirely_ai.client.stats),
+            'local_tier': hirely_ai.local_classifier.stats() if hirely_ai.local_classifier else None,
+            'grading_cache': hirely_ai.grading_cache.stats() if hirely_ai.grading_cache else None,
+        },
+        'tasks': metrics.summary(),
+    }
+
+# Lower is better for these; everything else is informational
+_COMPARE_KEYS = [
+    ('e2e_seconds_p50', -1), ('e2e_seconds_p95', -1), ('llm_calls_per_interview', -1),
+    ('throughput_per_minute', 1), ('interviews_failed', -1),
+]
+
+def compare(current, baseline):
+    print(f"Comparing {current['revision']} against baseline {baseline['revision']}:")
+    for key, direction in _COMPARE_KEYS:
+        new, old = current['results'][key], baseline['results'][key]
+        change = (new - old) / old * 100 if old else 0.0
+        better = (change * direction) > 0
+        marker = "" if abs(change) < 5 else (" (better)" if better else " (REGRESSION)")
+        print(f"  {key:26s} {old:>10} -> {new:>10}  {change:+6.1f}%{marker}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5, help="simulated candidates in flight")
+    parser.add_argument("--latency", default="lognormal:0.05,0.5", help='"0.5", "uniform:lo,hi" or "lognormal:median,sigma"')
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--max-concurrency", type=int, default=8, help="HIRELY_MAX_CONCURRENCY for the run")
+    parser.add_argument("--rpm", type=int, default=0, help="request rate limit (0 = unlimited)")
+    parser.add_argument("--tpm", type=int, default=0, help="token rate limit (0 = unlimited)")
+    parser.add_argument("--no-question-bank", action="store_true")
+    parser.add_argument("--no-local-tier", action="store_true")
+    parser.add_argument("--no-grading-cache", action="store_true")
+    parser.add_argument("--no-hedging", action="store_true")
+    parser.add_argument("--no-similarity-index", action="store_true")
+    parser.add_argument("--adaptive", action="store_true", help="adaptive technical phase (HIRELY_ADAPTIVE=on)")
+    parser.add_argument("--adaptive-min", type=int, default=AdaptiveConfig.min_per_tech)
+    parser.add_argument("--adaptive-max", type=int, default=AdaptiveConfig.max_per_tech)
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    args = parser.parse_args(argv)
+
+    output, baseline = args.output, args.compare
+    del args.output, args.compare
+    result = run(args)
+    print(json.dumps(result['results'], indent=2))
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    if baseline:
+        with open(baseline, encoding="utf-8") as f:
+            compare(result, json.load(f))
+    # Failed interviews make the numbers meaningless; fail the run too
+    return 1 if result['results']['interviews_failed'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
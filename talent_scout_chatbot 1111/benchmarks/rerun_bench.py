@@ -0,0 +1,168 @@
+"""Streamlit rerun benchmark.
+
+Renders the technical Q&A screen headlessly (streamlit.testing) for an
+interview with N answered questions and times each script run on the
+script-runner thread (the test harness polls, so its wall time is mostly
+sleeping), next to the time spent in the Q&A fragment alone, which is what
+an answer costs when Streamlit supports fragment-scoped reruns. Also
+reports the scorecard cost: the old full rescan of every answer per rerun
+versus the incremental counters updated once per recorded answer.
+
+    python benchmarks/rerun_bench.py --answered 0 25 50 100
+"""
+import argparse
+import functools
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+_state_dir = tempfile.mkdtemp()
+# Set before the app's modules are imported: no background LLM calls, and
+# stores go to a scratch directory
+os.environ.update({
+    'GEMINI_API_KEY': os.environ.get('GEMINI_API_KEY', 'bench'),
+    'HIRELY_PREFETCH': 'off',
+    'HIRELY_METRICS_DIR': 'off',
+    'HIRELY_SESSION_STORE': 'memory',
+    'HIRELY_QUESTION_BANK': 'off',
+    'HIRELY_GRADING_CACHE': 'off',
+    'HIRELY_SIMILARITY_INDEX': os.path.join(_state_dir, 'similarity_index.sqlite3'),
+})
+
+from interview import answer_record, new_scorecard, update_scorecard  # noqa: E402
+
+ANSWER = (
+    "I would index the lookup column, batch the writes in one transaction and measure "
+    "with EXPLAIN before and after. In my last project that cut the query from 2s to 40ms."
+)
+
+def seeded_interview(answered, total):
+    questions = [f"Technical question {i + 1} about databases?" for i in range(total)]
+    answers = {
+        i: answer_record(questions[i], ANSWER, {
+            'correctness': "Correct" if i % 3 else "Incorrect", 'sentiment': "Positive",
+            'ai_detected': "No", 'ai_confidence': "Low", 'ai_reason': "Specific details.",
+        })
+        for i in range(answered)
+    }
+    return {
+        'phase': "technical_qa",
+        'candidate_data': {
+            'fullName': "Bench Candidate", 'email': "bench@example.com", 'experience': "5",
+            'techStack': ["Python", "SQL", "Docker"],
+        },
+        'technical_questions': questions,
+        'technical_answers': answers,
+        'current_tech_q': answered,
+    }
+
+_script_seconds = []
+_fragment_seconds = []
+
+def _instrument_script_runner():
+    # Time each execution of app.py inside the script runner itself. The
+    # test harness compiles the script afresh on every run; a server caches
+    # the bytecode, so the runs here share one cache too.
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.runtime.scriptrunner.script_runner import ScriptRunner
+    from streamlit.testing.v1 import local_script_runner
+
+    script_cache = ScriptCache()
+    local_script_runner.ScriptCache = lambda: script_cache
+    run_script = ScriptRunner._run_script
+
+    def timed(self, rerun_data):
+        started = time.perf_counter()
+        try:
+            return run_script(self, rerun_data)
+        finally:
+            _script_seconds.append(time.perf_counter() - started)
+
+    ScriptRunner._run_script = timed
+
+def _instrument_fragments():
+    # app.py looks up st.fragment when it runs; time every fragment body
+    import streamlit as st
+
+    fragment = st.fragment
+
+    def timing_fragment(fn):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _fragment_seconds.append(time.perf_counter() - started)
+        return fragment(timed)
+
+    st.fragment = timing_fragment
+
+def time_reruns(state, runs):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(APP_DIR, "app.py"), default_timeout=60)
+    for key, value in state.items():
+        app.session_state[key] = value
+    app.run()  # first run pays module imports and resource construction
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+    del _script_seconds[:]
+    del _fragment_seconds[:]
+    for _ in range(runs):
+        app.run()
+    return list(_script_seconds), list(_fragment_seconds)
+
+def time_scorecard(answers, runs):
+    # Old: rescan every answer on each rerun. New: read the counters.
+    rescans = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        correct = sum(1 for ans in answers.values() if ans['analysis']['correctness'].lower() == 'correct')
+        _ = correct / len(answers) * 100 if answers else 0
+        rescans.append(time.perf_counter() - started)
+    scorecard = new_scorecard()
+    started = time.perf_counter()
+    for record in answers.values():
+        update_scorecard(scorecard, record)
+    per_answer = (time.perf_counter() - started) / max(1, len(answers))
+    return statistics.median(rescans), per_answer
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answered", type=int, nargs="+", default=[0, 25, 50, 100])
+    parser.add_argument("--runs", type=int, default=20, help="reruns timed per interview size")
+    args = parser.parse_args(argv)
+
+    import streamlit as st
+    from streamlit.logger import set_log_level
+
+    set_log_level("error")
+    results = {
+        'streamlit': st.__version__,
+        'interviews': [],
+    }
+    _instrument_script_runner()
+    _instrument_fragments()
+    for answered in args.answered:
+        state = seeded_interview(answered, answered + 5)
+        timings, fragment_timings = time_reruns(state, args.runs)
+        rescan, per_answer = time_scorecard(state['technical_answers'], args.runs)
+        results['interviews'].append({
+            'answered': answered,
+            'rerun_ms_median': round(statistics.median(timings) * 1000, 2),
+            'rerun_ms_p95': round(sorted(timings)[int(0.95 * (len(timings) - 1))] * 1000, 2),
+            'fragment_ms_median': round(statistics.median(fragment_timings) * 1000, 2),
+            'scorecard_rescan_us': round(rescan * 1e6, 2),
+            'scorecard_update_us_per_answer': round(per_answer * 1e6, 2),
+        })
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
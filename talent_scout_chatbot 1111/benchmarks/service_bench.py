@@ -0,0 +1,179 @@
+"""Interview service load test.
+
+Starts interview_service.py with the offline fake model in a subprocess and
+drives N simulated candidates through it concurrently over keep-alive HTTP
+connections: start, answer until every question is done, fetch the report.
+Reports throughput, per-endpoint latency and errors as JSON:
+
+    python benchmarks/service_bench.py --candidates 300 --latency lognormal:0.8,0.5
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import secrets
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from interview_bench import MESSAGES, STACKS, _percentile  # noqa: E402
+
+class _Connection:
+    # One keep-alive HTTP/1.1 connection per simulated candidate
+    def __init__(self, host, port, token):
+        self.host, self.port, self.token = host, port, token
+        self.reader = self.writer = None
+
+    async def request(self, method, path, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.writer.write((
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nAuthorization: Bearer {self.token}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+        ).encode("latin-1") + body)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self.reader.readexactly(length))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+async def simulate_candidate(host, port, token, index, seed, timings, max_messages=200):
+    rng = random.Random(f"{seed}:{index}")
+    weights, messages = zip(*MESSAGES)
+    candidate = {
+        'fullName': f"Candidate {index}", 'email': f"candidate{index}@example.com", 'phone': "0000000000",
+        'experience': rng.randint(0, 15), 'positions': ["Software Engineer"], 'location': "Remote",
+        'techStack': rng.choice(STACKS),
+    }
+    connection = _Connection(host, port, token)
+
+    async def call(endpoint, method, path, payload=None):
+        started = time.perf_counter()
+        status, body = await connection.request(method, path, payload)
+        timings.setdefault(endpoint, []).append(time.perf_counter() - started)
+        if status >= 400:
+            raise RuntimeError(f"{endpoint} -> {status}: {body.get('error')}")
+        return body
+
+    started = time.perf_counter()
+    try:
+        state = await call("start", "POST", "/interviews", candidate)
+        session = f"/interviews/{state['session_id']}"
+        sent = 0
+        while state['phase'] != "report" and sent < max_messages:
+            result = await call("submit", "POST", f"{session}/answers", {'text': rng.choices(messages, weights)[0]})
+            state = result['state']
+            sent += 1
+        await call("question", "GET", session)
+        await call("report", "GET", f"{session}/report")
+    finally:
+        connection.close()
+    return time.perf_counter() - started
+
+async def drive(host, port, token, args):
+    timings, latencies, failures = {}, [], []
+    limit = asyncio.Semaphore(args.concurrency)
+
+    async def one(index):
+        async with limit:
+            try:
+                latencies.append(await simulate_candidate(host, port, token, index, args.seed, timings))
+            except Exception as exc:
+                failures.append(f"{type(exc).__name__}: {exc}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(args.candidates)))
+    return time.perf_counter() - started, timings, latencies, failures
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _wait_ready(port, process, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("interview service exited during startup")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("interview service did not start")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=200, help="candidates in flight at once")
+    parser.add_argument("--latency", default="lognormal:0.2,0.5", help="fake model latency distribution")
+    parser.add_argument("--max-concurrency", type=int, default=32, help="HIRELY_MAX_CONCURRENCY for the service")
+    parser.add_argument("--service-concurrency", type=int, default=64, help="session steps run at once")
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args(argv)
+
+    port = _free_port()
+    token = secrets.token_hex(16)  # exercises the service's auth check on every request
+    env = dict(os.environ)
+    env.update({
+        'HIRELY_SERVICE_TOKEN': token,
+        'HIRELY_MAX_CONCURRENCY': str(args.max_concurrency),
+        'HIRELY_LLM_RPM': "1000000",
+        'HIRELY_METRICS_DIR': "off",
+    })
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(APP_DIR, "interview_service.py"), "--host", "127.0.0.1", "--port", str(port),
+         "--fake-model", "--fake-latency", args.latency, "--concurrency", str(args.service_concurrency)],
+        cwd=APP_DIR, env=env, stdout=subprocess.DEVNULL,
+    )
+    try:
+        _wait_ready(port, process)
+        wall, timings, latencies, failures = asyncio.run(drive("127.0.0.1", port, token, args))
+    finally:
+        # SIGINT lets the service remove its throwaway fake-model stores
+        process.send_signal(signal.SIGINT)
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+    completed = len(latencies)
+    print(json.dumps({
+        'config': vars(args),
+        'interviews_completed': completed,
+        'interviews_failed': len(failures),
+        'failure_types': sorted(set(failures))[:10],
+        'wall_seconds': round(wall, 3),
+        'throughput_per_minute': round(completed / wall * 60, 2) if wall else 0.0,
+        'e2e_seconds_p50': round(_percentile(latencies, 0.50), 3),
+        'e2e_seconds_p95': round(_percentile(latencies, 0.95), 3),
+        'endpoints': {
+            endpoint: {
+                'requests': len(values),
+                'p50_ms': round(_percentile(values, 0.50) * 1000, 1),
+                'p95_ms': round(_percentile(values, 0.95) * 1000, 1),
+            }
+            for endpoint, values in sorted(timings.items())
+        },
+    }, indent=2))
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""Similarity index benchmark.
+
+Indexes N synthetic answers into a temporary similarity index, plants
+lightly edited copies of some of them, and reports insert throughput,
+lookup latency and how many planted copies were found:
+
+    python benchmarks/similarity_bench.py --answers 100000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+from similarity_index import SimilarityIndex, band_buckets, minhash  # noqa: E402
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+def synthetic_answer(rng, vocab):
+    return " ".join(rng.choices(vocab, k=rng.randint(15, 80)))
+
+def edit(rng, text, vocab, edits=2):
+    # A pasted answer with a couple of words changed
+    words = text.split()
+    for _ in range(edits):
+        words[rng.randrange(len(words))] = rng.choice(vocab)
+    return " ".join(words)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answers", type=int, default=100000)
+    parser.add_argument("--planted", type=int, default=200, help="edited copies to look up")
+    parser.add_argument("--lookups", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    vocab = [f"w{i}" for i in range(5000)]
+    index = SimilarityIndex(os.path.join(tempfile.mkdtemp(), "similarity.sqlite3"))
+    originals = []
+    started = time.perf_counter()
+    for i in range(args.answers):
+        text = synthetic_answer(rng, vocab)
+        if len(originals) < args.planted and rng.random() < args.planted / args.answers * 2:
+            originals.append(text)
+        index.add(text, owner=f"candidate-{i}", candidate=f"Candidate {i}", question="q")
+    insert_seconds = time.perf_counter() - started
+
+    found = sum(bool(index.query(edit(rng, text, vocab))) for text in originals)
+
+    timings = []
+    for _ in range(args.lookups):
+        signature = minhash(synthetic_answer(rng, vocab))
+        buckets = band_buckets(signature)
+        t = time.perf_counter()
+        with index._lock:
+            index._matches(signature, buckets, None, 5)
+        timings.append(time.perf_counter() - t)
+
+    print(json.dumps({
+        'answers': args.answers,
+        'inserts_per_second': round(args.answers / insert_seconds, 1),
+        'lookup_ms_p50': round(_percentile(timings, 0.50) * 1000, 3),
+        'lookup_ms_p99': round(_percentile(timings, 0.99) * 1000, 3),
+        'planted_copies': len(originals),
+        'planted_copies_found': found,
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Cold-start benchmark.
+
+Times, in a fresh interpreter per run, what a serverless cold start pays
+before the welcome screen is on screen: importing Streamlit, the app's own
+modules and the Gemini SDK, and the first full script run of app.py
+(rendered headlessly with streamlit.testing). First render is measured
+with lazy initialization on and off:
+
+    python benchmarks/startup_bench.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORTS = {
+    'streamlit': "import streamlit",
+    'app_modules': (
+        "import ai_analysis, analytics_store, interview, grading_cache, local_classifiers, metrics, "
+        "prefetch, question_bank, report_cache, report_export, session_store, similarity_index"
+    ),
+    'google.generativeai': "import google.generativeai",
+}
+
+# Runs app.py once, as a new browser session would, and reports whether
+# the SDK got imported on the way
+FIRST_RENDER = """
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file("app.py", default_timeout=120).run()
+print(json.dumps({
+    'seconds': time.perf_counter() - started,
+    'errors': [str(e.value) for e in app.exception],
+    'sdk_imported': 'google.generativeai' in sys.modules,
+}))
+"""
+
+def _child_env(state_dir, **overrides):
+    # Stores point at a scratch directory so runs don't touch the app's data
+    env = dict(os.environ)
+    env.update({
+        'GEMINI_API_KEY': env.get('GEMINI_API_KEY', 'bench'),
+        'HIRELY_METRICS_DIR': 'off',
+        'HIRELY_SESSION_STORE': os.path.join(state_dir, 'sessions.sqlite3'),
+        'HIRELY_QUESTION_BANK': os.path.join(state_dir, 'question_bank.sqlite3'),
+        'HIRELY_GRADING_CACHE': os.path.join(state_dir, 'grading_cache.sqlite3'),
+        'HIRELY_SIMILARITY_INDEX': os.path.join(state_dir, 'similarity_index.sqlite3'),
+        **overrides,
+    })
+    return env
+
+def _run(code, env):
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=APP_DIR, env=env, capture_output=True, text=True, timeout=300,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "child failed")
+    return result.stdout.strip().splitlines()[-1]
+
+def time_import(statement, env):
+    code = f"import time\nt = time.perf_counter()\n{statement}\nprint(time.perf_counter() - t)"
+    return float(_run(code, env))
+
+def first_render(env):
+    return json.loads(_run(FIRST_RENDER, env))
+
+def _summary(values):
+    return {'median_ms': round(statistics.median(values) * 1000, 1), 'max_ms': round(max(values) * 1000, 1)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per measurement")
+    args = parser.parse_args(argv)
+
+    env = _child_env(tempfile.mkdtemp())
+    results = {'runs': args.runs, 'imports': {}, 'first_render': {}}
+    for name, statement in IMPORTS.items():
+        try:
+            results['imports'][name] = _summary([time_import(statement, env) for _ in range(args.runs)])
+        except RuntimeError as exc:
+            results['imports'][name] = {'error': str(exc)}
+
+    for mode, lazy in (("lazy", "on"), ("eager", "off")):
+        mode_env = _child_env(tempfile.mkdtemp(), HIRELY_LAZY_INIT=lazy)
+        try:
+            runs = [first_render(mode_env) for _ in range(args.runs)]
+        except RuntimeError as exc:
+            results['first_render'][mode] = {'error': str(exc)}
+            continue
+        results['first_render'][mode] = {
+            **_summary([run['seconds'] for run in runs]),
+            'sdk_imported': runs[-1]['sdk_imported'],
+            'errors': runs[-1]['errors'],
+        }
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import json
+import math
+import random
+import re
+import threading
+import time
+
+# --- Fake Gemini Model ---
+# Drop-in stand-in for genai.GenerativeModel used to exercise HirelyAI,
+# the LLM client and the benchmarks offline. Latency, failure rate and
+# responses are all configurable; by default it returns canned outputs in
+# the shapes each HirelyAI prompt expects.
+class FakeAPIError(Exception):
+    def __init__(self, code, message):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+class FakeUsage:
+    def __init__(self, prompt_token_count, candidates_token_count):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+        self.total_token_count = prompt_token_count + candidates_token_count
+
+class FakeResponse:
+    def __init__(self, text, prompt_tokens=0):
+        self.text = text
+        self.usage_metadata = FakeUsage(prompt_tokens, max(1, len(text) // 4))
+
+class FakeTokenCount:
+    def __init__(self, total_tokens):
+        self.total_tokens = total_tokens
+
+def canned_response(prompt, generation_config=None):
+    # Plausible output for each HirelyAI prompt family
+    text = str(prompt)
+    if isinstance(generation_config, dict):
+        mime_type = generation_config.get("response_mime_type", "")
+    else:
+        mime_type = getattr(generation_config, "response_mime_type", "")
+    if mime_type == "application/json":
+        correctness = "N/A" if "always 'N/A'" in text else "Correct"
+        return json.dumps({
+            "correctness": correctness, "sentiment": "Neutral", "ai_detected": "No",
+            "confidence": "Medium", "reason": "Specific, conversational answer.",
+        })
+    match = re.search(r"Generate (\d+) technical interview questions about (.+?)\.", text)
+    if match:
+        count, tech = int(match.group(1)), match.group(2)
+        return "\n".join(f"How would you use {tech} for task {i + 1}?" for i in range(count))
+    if "technical questions for each technology" in text:
+        return "1. What is a closure?\n2. Explain indexing in SQL.\n3. How do containers differ from VMs?"
+    if "project discussion questions" in text:
+        return "\n".join(f"{i}. Project question {i}?" for i in range(1, 6))
+    if "Assess one interview answer" in text:
+        return "The answer names a concrete approach and backs it with a specific example."
+    if "hiring report" in text:
+        return "## Summary\nThe candidate answered consistently.\n\n**Recommendation:** Proceed with caution"
+    if "AI-generated" in text and "AI-Generated: Yes/No" in text:
+        return "AI-Generated: No\nConfidence: Medium\nReason: Conversational tone."
+    if "Respond with only: 'Correct' or 'Incorrect'" in text:
+        return "Correct"
+    if "Analyze the sentiment" in text:
+        return "Neutral"
+    if "Re-explain" in text:
+        return "In other words, describe how you would approach this in practice."
+    return "This is a concise answer from the fake model."
+
+class FakeGenerativeModel:
+    def __init__(self, model_name="models/fake", latency=0.0, error_rate=0.0, error_code=503,
+                 responder=None, seed=None, chunk_size=40):
+        # latency: seconds, or a callable(rng) -> seconds for a distribution
+        # responder: callable(prompt, generation_config) -> text, defaults to canned_response
+        self.model_name = model_name
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.responder = responder or canned_response
+        self.chunk_size = chunk_size
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._seen = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+
+    def _draw(self, prompt):
+        # With a seed, each call's latency/failure is derived from the prompt and how
+        # often it has been seen, so runs are reproducible under any thread interleaving.
+        with self._lock:
+            self.calls += 1
+            if self.seed is None:
+                rng = self._rng
+            else:
+                key = str(prompt)
+                occurrence = self._seen.get(key, 0)
+                self._seen[key] = occurrence + 1
+                rng = random.Random(f"{self.seed}:{occurrence}:{key}")
+            latency = self.latency(rng) if callable(self.latency) else self.latency
+            fail = rng.random() < self.error_rate
+            if fail:
+                self.failures += 1
+        return max(0.0, latency), fail
+
+    def generate_content(self, prompt, generation_config=None, stream=False, request_options=None, **kwargs):
+        latency, fail = self._draw(prompt)
+        timeout = (request_options or {}).get("timeout")
+        if timeout is not None and latency > timeout:
+            time.sleep(timeout)
+            raise FakeAPIError(504, "Deadline Exceeded")
+        time.sleep(latency)
+        if fail:
+            raise FakeAPIError(self.error_code, "Injected failure")
+        text = self.responder(prompt, generation_config)
+        prompt_tokens = max(1, len(str(prompt)) // 4)
+        if stream:
+            return iter([
+                FakeResponse(text[i:i + self.chunk_size], prompt_tokens)
+                for i in range(0, len(text), self.chunk_size)
+            ])
+        return FakeResponse(text, prompt_tokens)
+
+    def count_tokens(self, contents):
+        return FakeTokenCount(max(1, len(str(contents)) // 4))
+
+# --- Latency Distributions ---
+def constant(seconds):
+    return lambda rng: seconds
+
+def uniform(low, high):
+    return lambda rng: rng.uniform(low, high)
+
+def lognormal(median, sigma=0.5):
+    # Long right tail, like real LLM latency
+    return lambda rng: rng.lognormvariate(math.log(median), sigma)
+
+def parse_latency(spec):
+    # "0.5", "uniform:0.2,1.0" or "lognormal:0.8,0.5"
+    kind, _, params = spec.partition(":")
+    if not params:
+        return constant(float(kind))
+    values = [float(v) for v in params.split(",")]
+    if kind == "uniform":
+        return uniform(*values)
+    if kind == "lognormal":
+        return lognormal(*values)
+    raise ValueError(f"unknown latency distribution {spec!r}")
@@ -0,0 +1,124 @@
+from contextlib import contextmanager
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+# --- Grading Cache ---
+# Correctness verdicts are shared across candidates: many of them get the
+# same bank questions and give near-identical short answers. Entries are
+# keyed on the canonicalized (question, answer) pair and on a version hash
+# of the model name and grading prompt templates, so switching models or
+# editing a prompt starts from an empty cache without any manual flush.
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "grading_cache.sqlite3")
+DEFAULT_MAX_ENTRIES = 50000
+
+# Negations stay: "is" and "is not" must never share a verdict
+STOPWORDS = frozenset("""
+a an the is are was were be been being am do does did of to in on at by for from with as
+it its this that these those and or but so i we you he she they me my our your their um uh
+well basically actually just really like
+""".split())
+
+# Sentence punctuation is dropped; symbols that carry meaning in code and
+# complexity notation (= + - * / < > ( ) [ ] { } %) are kept as tokens
+_SENTENCE_PUNCTUATION = re.compile(r"[.,;:!?\"'`“”‘’…]+")
+_SYMBOLS = re.compile(r"([=+\-*/<>()\[\]{}%])")
+_WORD_HYPHEN = re.compile(r"(?<=[^\W\d])-(?=[^\W\d])")
+
+def canonicalize_text(text):
+    text = unicodedata.normalize("NFKC", str(text)).lower()
+    text = _SENTENCE_PUNCTUATION.sub(" ", text)
+    text = _WORD_HYPHEN.sub(" ", text)  # "hash-map" == "hash map"
+    text = _SYMBOLS.sub(r" \1 ", text)
+    return " ".join(word for word in text.split() if word not in STOPWORDS)
+
+def grading_version(model_name, *templates):
+    # Changes whenever the model or any grading prompt template changes
+    encoded = "\x00".join([str(model_name), *templates])
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:16]
+
+def grading_key(version, question, answer):
+    encoded = "\x00".join([version, canonicalize_text(question), canonicalize_text(answer)])
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+class GradingCache:
+    def __init__(self, db_path=DEFAULT_DB_PATH, max_entries=DEFAULT_MAX_ENTRIES):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stored': 0}
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS verdicts (
+                    key TEXT PRIMARY KEY,
+                    version TEXT NOT NULL,
+                    verdict TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_verdicts_last_used ON verdicts(last_used)")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, version, question, answer):
+        # Cached verdict for this pair under this model/prompt version, or None
+        key = grading_key(version, question, answer)
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT verdict FROM verdicts WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._stats['misses'] += 1
+                return None
+            conn.execute("UPDATE verdicts SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._stats['hits'] += 1
+        return row[0]
+
+    def put(self, version, question, answer, verdict):
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO verdicts (key, version, verdict, created_at, last_used) VALUES (?, ?, ?, ?, ?)",
+                (grading_key(version, question, answer), version, verdict, now, now),
+            )
+            self._stats['stored'] += 1
+            self._evict(conn)
+
+    def _evict(self, conn):
+        # Verdicts from older model/prompt versions are never read again, so
+        # they age out of the LRU order first
+        if self.max_entries:
+            conn.execute(
+                """DELETE FROM verdicts WHERE key IN (
+                    SELECT key FROM verdicts ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,),
+            )
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0.0
+        return stats
+
+def grading_cache_from_env():
+    # None when HIRELY_GRADING_CACHE is set to "off"
+    path = os.getenv("HIRELY_GRADING_CACHE", DEFAULT_DB_PATH)
+    if path.lower() in ("off", "0", "false", "none", ""):
+        return None
+    return GradingCache(
+        db_path=path,
+        max_entries=int(os.getenv("HIRELY_GRADING_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES))),
+    )
@@ -0,0 +1,274 @@
+import math
+import os
+import re
+import threading
+
+# --- Intent Router ---
+# Labels each candidate message as 'question' (for the interviewer),
+# 'clarification' (of the current interview question), 'skip' or 'answer',
+# with a confidence. Cue phrases are compiled once into a single regex trie
+# and found in one pass; each cue counts fully in the opening sentence or a
+# sentence ending in "?", and much less deep inside a longer answer, so
+# "explain" in the middle of a real answer doesn't trigger a re-explanation.
+# Topical cues ("remote", "the team") only count in a sentence phrased as an
+# ask, so "The team used Kafka..." stays an answer. A hand-tuned linear score per intent over the cues and a few cheap
+# features (trailing "?", interrogative opener, length, first-person and
+# code-like content) is turned into probabilities with a softmax, and
+# IntentRouter falls back to 'answer' when a question or clarification is
+# not confident enough. Pure Python, tens of microseconds per message, no
+# LLM call.
+INTENTS = ("answer", "question", "clarification", "skip")
+
+# Whole-message acknowledgements and skips (case and punctuation ignored)
+SKIP_PHRASES = frozenset(line.strip() for line in """
+ok
+okay
+k
+yes
+sure
+alright
+understood
+noted
+got it
+got it thanks
+next
+next question
+next question please
+continue
+ok next
+okay next
+sure next
+ok continue
+okay continue
+ok thanks
+okay thanks
+skip
+skip please
+skip this
+skip this one
+skip this question
+let's skip
+let's skip this
+pass
+i'll pass
+i'll pass on this one
+move on
+let's move on
+can we move on
+no idea skip
+i don't know this one next
+""".strip().splitlines())
+# Short messages made only of these words that include a skip verb
+# ("next please", "skip it", "ok let's move on") are skips too
+SKIP_VOCABULARY = frozenset("""
+ok okay sure yes alright fine thanks thank you please let's lets can we go to the it this that one question
+next skip continue pass move on
+""".split())
+SKIP_VERBS = frozenset("next skip continue pass move".split())
+
+# phrase -> (intent, weight, topical). Topical cues name a subject rather than
+# make a request ("remote", "the team", "unclear"), so they only count when
+# the message is phrased as an ask: a trailing "?", an interrogative opener
+# or "you" in the opening words. "The team used Kafka..." is an answer.
+# Apostrophe-free spellings are added below.
+CUES = {
+    # Asking about the interview question itself
+    **{phrase: ("clarification", 3.0, False) for phrase in (
+        "what do you mean", "what does that mean", "what do you mean by", "what is meant by",
+        "i didn't understand", "i don't understand", "didn't understand", "don't understand the question",
+        "i didn't get", "didn't get that", "i don't get it", "don't get the question",
+        "can you explain", "could you explain", "explain the question", "explain that again",
+        "explain it differently", "can you repeat", "could you repeat", "repeat the question", "repeat that",
+        "say that again", "rephrase", "can you clarify", "could you clarify", "please clarify",
+        "i'm confused", "im confused", "confused by the question",
+        "help me understand", "what are you asking", "what exactly are you asking",
+        "not sure what you mean", "in simpler terms", "give an example of what you mean",
+        "elaborate on the question", "be more specific", "break the question down", "question is a bit vague",
+        "i'm lost", "pardon", "sorry?", "sorry what", "come again", "quite understand",
+        "what you're asking", "not sure i follow", "don't follow", "didn't follow", "understand the question",
+        "question is not clear", "question is unclear", "question isn't clear",
+    )},
+    **{phrase: ("clarification", 3.0, True) for phrase in (
+        "not clear", "is not clear", "unclear", "are you asking", "do you mean", "does it mean", "mean here",
+        "which part", "is this about", "another way", "other words", "do you want", "should i",
+        "are we talking about", "you mean", "a hint",
+    )},
+    # Asking the interviewer about the role, company or process
+    **{phrase: ("question", 1.5, True) for phrase in (
+        "this role", "the role", "this position", "the position", "the team", "your team", "the team's",
+        "the company", "your company", "the interview", "interview process", "next steps", "hear back",
+        "salary", "compensation", "benefits", "on-call", "remote", "hybrid", "relocation", "visa",
+        "working hours", "probation", "reporting to", "dress code", "career growth", "mentoring",
+        "notice period", "start date", "how soon", "take-home", "coding round", "questions are left",
+        "questions timed", "these questions", "this interview", "in production", "typical day", "rounds",
+    )},
+    **{phrase: ("question", 2.5, False) for phrase in (
+        "can i use", "is it okay if", "am i allowed", "can i ask", "i have a question", "come back to this question",
+        "do you use", "do you offer", "do you have", "does the team", "does the company",
+    )},
+    # Describing experience or a solution
+    **{phrase: ("answer", 0.7, False) for phrase in (
+        "i'd", "i would", "i used", "we used", "i have used", "i've used", "i think", "i built", "we built",
+        "i implemented", "we had", "i had", "in my last", "at my last", "my approach", "we deployed",
+        "because", "so that", "for example", "e.g.", "the difference", "means that", "depends on",
+        "first i'd", "i'm not 100% sure", "i know", "instead", "which is why", "as long as",
+    )},
+}
+for _phrase, _label in list(CUES.items()):
+    CUES.setdefault(_phrase.replace("'", ""), _label)
+
+INTERROGATIVES = frozenset("""
+what what's how why when where who whom which whose is are am do does did can could will would
+should may might shall was were have has
+""".split())
+SECOND_PERSON = frozenset("you your you're yours".split())
+ASK_OPENERS = frozenset("tell please".split())  # "tell me about...", "please share..."
+FIRST_PERSON = frozenset("i i'm i've i'd i'll im ive id me my we we're we've our us".split())
+
+MIN_CONFIDENCE = float(os.getenv("HIRELY_INTENT_MIN_CONFIDENCE", "0.45"))
+
+LEAD_WORDS = 12  # cues in the opening words of a message always count fully
+ASK_WORDS = 4  # "you" this early makes a message an ask
+BARE_CUE_WORDS = 3  # a message this short is all cue ("not clear", "remote?")
+BURIED_CUE_FACTOR = 0.3
+
+_CODE_LIKE = re.compile(r"[(){}\[\]=<>;]|\bo\(|\d|\b[a-z]+_[a-z_]+\b|\b[a-z]+[A-Z]\w*")
+_SENTENCE = re.compile(r"[^.!?]*[.!?]+|[^.!?]+$")
+_SPACE = re.compile(r"\s+")
+_QUOTED = re.compile(r"[\"'“‘][^\"'”’]*[\"'”’]")
+
+def _trie_pattern(phrases):
+    # One regex for every phrase: a character trie written as nested groups,
+    # so the re engine walks shared prefixes once and matches the longest cue
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node):
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        group = branches[0] if len(branches) == 1 and "" not in node else "(?:" + "|".join(branches) + ")"
+        return group + "?" if "" in node else group
+
+    return re.compile(r"(?<![\w'-])" + emit(trie) + r"(?![\w'-])")
+
+_CUE_PATTERN = _trie_pattern(CUES)
+
+def normalize(text):
+    text = str(text).replace("’", "'").replace("‘", "'").lower()
+    return _SPACE.sub(" ", text).strip()
+
+def _is_skip(bare):
+    if bare in SKIP_PHRASES:
+        return True
+    words = bare.split()
+    return len(words) <= 6 and SKIP_VOCABULARY.issuperset(words) and not SKIP_VERBS.isdisjoint(words)
+
+def _is_ask(sentence):
+    # Phrased as a question or request: "is the role remote", "tell me about
+    # your team", "could you rephrase?"
+    words = [word.strip("?,.!") for word in sentence.split()]
+    return sentence.endswith("?") or (bool(words) and (
+        words[0] in INTERROGATIVES or words[0] in ASK_OPENERS or not SECOND_PERSON.isdisjoint(words[:ASK_WORDS])
+    ))
+
+def intent_features(text):
+    # Cue scores per intent plus the surface features the model uses
+    norm = normalize(text)
+    words = norm.split()
+    cues = dict.fromkeys(INTENTS, 0.0)
+    sentences = [(m.start(), m.end(), m.group().strip()) for m in _SENTENCE.finditer(norm) if m.group().strip()]
+    quoted = [(m.start(), m.end()) for m in _QUOTED.finditer(norm)]
+    for match in _CUE_PATTERN.finditer(norm):
+        intent, weight, topical = CUES[match.group()]
+        start = match.start()
+        sentence = next((sentence for s, e, sentence in sentences if s <= start < e), "")
+        if topical and len(words) > BARE_CUE_WORDS and not _is_ask(sentence):
+            continue
+        lead = norm.count(" ", 0, start) < LEAD_WORDS
+        in_question = sentence.endswith("?")
+        if any(s < start < e for s, e in quoted):
+            weight *= BURIED_CUE_FACTOR
+        elif intent != "answer" and not (lead or in_question):
+            weight *= BURIED_CUE_FACTOR
+        cues[intent] += weight
+    stripped = norm.rstrip()
+    return {
+        'cues': cues,
+        'words': len(words),
+        'sentences': len(sentences),
+        'ends_with_question': stripped.endswith("?"),
+        'last_sentence_words': len(sentences[-1][2].split()) if sentences else 0,
+        'interrogative_start': bool(words) and words[0].strip(",") in INTERROGATIVES,
+        'second_person': sum(word.strip("?,.!") in SECOND_PERSON for word in words),
+        'first_person': sum(word.strip("?,.!") in FIRST_PERSON for word in words),
+        'code_like': len(_CODE_LIKE.findall(str(text))),
+        'skip_like': _is_skip(stripped.strip(" .!?,;:-").replace(",", "")),
+    }
+
+def _scores(features):
+    cues, words = features['cues'], features['words']
+    # A trailing "?" on a short last sentence after a real answer ("does that
+    # make sense?") is a check-in, not a question for the interviewer
+    trailing = features['ends_with_question'] and (features['sentences'] == 1 or features['last_sentence_words'] > 6)
+    length = min(words, 60)
+    return {
+        'answer': (
+            0.6 + cues['answer'] + 0.35 * min(features['code_like'], 4) + 0.05 * length
+            + 0.3 * min(features['first_person'], 3) + 0.6 * (features['sentences'] >= 2)
+        ),
+        'question': (
+            cues['question'] + 1.4 * trailing + 0.9 * features['interrogative_start']
+            + 0.4 * min(features['second_person'], 2) - 0.06 * max(0, words - 12)
+        ),
+        'clarification': cues['clarification'] + 0.4 * features['ends_with_question'] - 0.06 * max(0, words - 12),
+        'skip': 6.0 if features['skip_like'] else 0.0,
+    }
+
+def intent_probabilities(text):
+    # {intent: probability} for one candidate message
+    features = intent_features(text)
+    if not features['words']:
+        return {**dict.fromkeys(INTENTS, 0.0), 'answer': 1.0}
+    scores = _scores(features)
+    peak = max(scores.values())
+    weights = {intent: math.exp(score - peak) for intent, score in scores.items()}
+    total = sum(weights.values())
+    return {intent: weight / total for intent, weight in weights.items()}
+
+def classify_intent(text):
+    # (intent, confidence in [0, 1]) for one candidate message
+    probabilities = intent_probabilities(text)
+    intent = max(probabilities, key=probabilities.get)
+    return intent, probabilities[intent]
+
+class IntentRouter:
+    # classify_intent with a safe default: a question or clarification below
+    # min_confidence is treated as an answer, since grading a stray question
+    # costs one call while answering a real answer loses its grade. Keeps
+    # per-process counts for the admin panel.
+    def __init__(self, min_confidence=MIN_CONFIDENCE):
+        self.min_confidence = min_confidence
+        self._lock = threading.Lock()
+        self.counts = {**dict.fromkeys(INTENTS, 0), 'low_confidence': 0}
+
+    def route(self, text):
+        probabilities = intent_probabilities(text)
+        intent = max(probabilities, key=probabilities.get)
+        low_confidence = intent in ("question", "clarification") and probabilities[intent] < self.min_confidence
+        if low_confidence:
+            intent = "answer"
+        with self._lock:
+            self.counts[intent] += 1
+            self.counts['low_confidence'] += low_confidence
+        return intent, probabilities[intent]
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counts)
+
+ROUTER = IntentRouter()
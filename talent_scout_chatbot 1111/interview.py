@@ -0,0 +1,424 @@
+# --- Headless Interview Flow ---
+# The interview logic without Streamlit: routing candidate input, building
+# the report history, and an InterviewSession state machine that walks
+# info_gathering -> technical_qa -> project_discussion -> report. app.py
+# drives it from its panels; the interview service and the benchmarks run
+# it off the UI.
+import hashlib
+import os
+import re
+import uuid
+
+from adaptive import adaptive_summary, new_adaptive_plan, queue_next_question, record_adaptive_result
+from intent_router import ROUTER
+from llm_client import estimate_tokens
+from prefetch import PrefetchStore
+from similarity_index import candidate_label
+
+def route_input(text):
+    # ('question' | 'clarification' | 'skip' | 'answer', confidence), decided
+    # locally by the intent router; uncertain questions and clarifications
+    # come back as 'answer' so they are still graded. See intent_router.py
+    return ROUTER.route(text)
+
+def parse_project_questions(text):
+    return [q.strip() for q in text.split('\n') if q.strip()]
+
+# --- Report History ---
+# The final-report prompt carries the interview transcript. Each answer gets
+# a compressed extractive summary when it is recorded, and the history is
+# assembled within a token budget: every question, its analysis and the
+# answer summary always go in, then answers are restored verbatim, cheapest
+# first, while the budget allows. Prompt size stays bounded however long the
+# interview or the answers get.
+REPORT_HISTORY_TOKEN_BUDGET = int(os.getenv("HIRELY_REPORT_HISTORY_TOKENS", "6000"))
+ANSWER_SUMMARY_TOKENS = 60
+QUESTION_TOKENS = 60
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+_SALIENT_TOKEN = re.compile(r"\d|[A-Z][a-z]*[A-Z]|[._/()]\w|^[A-Z]{2,}")
+
+def _clip(text, max_tokens):
+    # Whole words up to ~max_tokens (4 chars per token, as estimate_tokens)
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    clipped = text[:max_tokens * 4].rsplit(" ", 1)[0]
+    return clipped.rstrip(" ,;:") + " …"
+
+def summarize_answer(text, max_tokens=ANSWER_SUMMARY_TOKENS):
+    # Extractive summary: the opening sentence plus the sentences densest in
+    # specifics (numbers, identifiers, acronyms), kept in original order
+    text = " ".join(str(text).split())
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    sentences = [sentence for sentence in _SENTENCE_END.split(text) if sentence.strip()]
+    if len(sentences) == 1:
+        return _clip(text, max_tokens)
+
+    def salience(sentence):
+        words = sentence.split()
+        specific = sum(1 for word in words if _SALIENT_TOKEN.search(word) or len(word) >= 9)
+        return specific / max(1, len(words))
+
+    chosen = {0}
+    used = estimate_tokens(sentences[0])
+    for i in sorted(range(1, len(sentences)), key=lambda i: salience(sentences[i]), reverse=True):
+        cost = estimate_tokens(sentences[i])
+        if used + cost <= max_tokens:
+            chosen.add(i)
+            used += cost
+    return _clip(" … ".join(sentences[i] for i in sorted(chosen)), max_tokens)
+
+def answer_record(question, answer, analysis, similar=None):
+    # The stored form of an analyzed answer, including its rolling summary
+    # and any near-duplicate answers from other candidates
+    record = {'question': question, 'answer': answer, 'analysis': analysis, 'summary': summarize_answer(answer)}
+    if similar:
+        record['similar'] = similar
+    return record
+
+# --- Scorecard ---
+# Running counts over the technical answers, updated as each answer is
+# recorded so rendering the scorecard never rescans the answer history.
+def new_scorecard(technical_answers=None):
+    scorecard = {'answered': 0, 'correct': 0}
+    for record in (technical_answers or {}).values():
+        update_scorecard(scorecard, record)
+    return scorecard
+
+def update_scorecard(scorecard, record, replaced=None):
+    # `replaced`: the record previously stored for the same question, if any
+    for data, sign in ((replaced, -1), (record, 1)):
+        if data is not None:
+            scorecard['answered'] += sign
+            if str(data['analysis'].get('correctness', '')).lower() == 'correct':
+                scorecard['correct'] += sign
+    return scorecard
+
+def _analysis_line(answer_data, technical):
+    analysis = answer_data['analysis']
+    parts = [f"Correctness: {analysis.get('correctness', 'N/A')}"] if technical else []
+    parts += [f"Sentiment: {analysis.get('sentiment', 'N/A')}", f"AI-Detected: {analysis.get('ai_detected', 'N/A')}"]
+    similar = answer_data.get('similar')
+    if similar:
+        parts.append(
+            f"Near-duplicate of {len(similar)} other candidate answer(s), up to {similar[0]['similarity']:.0%} similar"
+        )
+    return f"**Analysis:** {', '.join(parts)}\n\n"
+
+def build_interview_history(technical_answers, project_answers, token_budget=None, adaptive=None, assessments=None):
+    # Markdown transcript for the report prompt, within token_budget
+    # (HIRELY_REPORT_HISTORY_TOKENS; 0 means no limit, everything verbatim).
+    # adaptive: adaptive_summary() of an adaptive interview, so the report
+    # knows why fewer questions were asked. assessments: the drafted entries
+    # from draft_assessments(), written in place of the answers.
+    budget = REPORT_HISTORY_TOKEN_BUDGET if token_budget is None else token_budget
+    if assessments is not None:
+        # A few sentences per answer: nothing to fit into a budget
+        budget = 0
+    entries = []
+    for section, answers in (("technical", technical_answers), ("project", project_answers)):
+        for q_num, answer_data in sorted(answers.items(), key=lambda item: int(item[0])):
+            answer = answer_data['answer']
+            summary = answer_data.get('summary') or summarize_answer(answer)
+            question = answer_data['question'] if not budget else _clip(answer_data['question'], QUESTION_TOKENS)
+            entries.append({
+                'section': section,
+                'header': f"**Q{int(q_num) + 1}:** {question}\n",
+                'analysis': _analysis_line(answer_data, section == "technical"),
+                'answer': answer,
+                'summary': summary,
+                'verbatim': not budget or summary == answer,
+                'assessment': assessments.get((section, int(q_num))) if assessments is not None else None,
+            })
+
+    if budget:
+        fixed = sum(estimate_tokens(e['header'] + e['analysis']) for e in entries)
+        used = fixed + sum(estimate_tokens(e['summary']) for e in entries)
+        if used > budget and entries:
+            # Even the summaries don't fit: shrink them to an equal share
+            share = max(15, (budget - fixed) // len(entries))
+            for entry in entries:
+                if not entry['verbatim']:
+                    entry['summary'] = summarize_answer(entry['summary'], share)
+            used = fixed + sum(estimate_tokens(e['summary']) for e in entries)
+        upgrades = sorted(
+            (e for e in entries if not e['verbatim']),
+            key=lambda e: estimate_tokens(e['answer']) - estimate_tokens(e['summary']),
+        )
+        for entry in upgrades:
+            extra = estimate_tokens(entry['answer']) - estimate_tokens(entry['summary'])
+            if used + extra > budget:
+                break
+            entry['verbatim'] = True
+            used += extra
+
+    parts = []
+    for section, title in (("technical", "## Technical Assessment\n"), ("project", "## Project Discussion\n")):
+        parts.append(title)
+        for entry in entries:
+            if entry['section'] != section:
+                continue
+            parts.append(entry['header'])
+            if entry['assessment'] is not None:
+                parts.append(f"**Assessment:** {entry['assessment'].strip()}\n")
+            elif entry['verbatim']:
+                parts.append(f"**Answer:** {entry['answer']}\n")
+            else:
+                parts.append(f"**Answer (summarized):** {entry['summary']}\n")
+            parts.append(entry['analysis'])
+        if section == "technical" and adaptive:
+            parts.append(f"**Interview length (adaptive):** {adaptive['stop_reason']}\n")
+            for tech in adaptive['technologies']:
+                parts.append(
+                    f"- {tech['technology']}: {tech['verdict']} (P(pass) {tech['pass_probability']:.0%}, "
+                    f"{tech['correct_answers']}/{tech['graded_answers']} correct)\n"
+                )
+            parts.append("\n")
+    return "".join(parts)
+
+# --- Report Drafting ---
+# Each answer's entry in the final report is drafted by its own LLM call as
+# soon as the answer is recorded, while the candidate types the next one.
+# The report itself is then those entries plus one call for the summary and
+# recommendation, instead of one long generation over the whole transcript.
+def assessment_key(section, index, record):
+    # Prefetch key; changes when the answer at this index is replaced
+    digest = hashlib.sha256(f"{record['question']}\0{record['answer']}".encode("utf-8")).hexdigest()[:16]
+    return f"assessment:{section}:{int(index)}:{digest}"
+
+def assessment_args(section, record):
+    # draft_answer_assessment() arguments for one recorded answer
+    return section, record['question'], record['answer'], _analysis_line(record, section == "technical").strip()
+
+def draft_assessments(hirely_ai, prefetch, technical_answers, project_answers):
+    # {(section, index): drafted entry} for every answer. Entries the prefetch
+    # store doesn't hold (prefetch off, or a session resumed on another server
+    # process) are drafted now, concurrently.
+    answers = [
+        (section, int(index), record)
+        for section, section_answers in (("technical", technical_answers), ("project", project_answers))
+        for index, record in section_answers.items()
+    ]
+    missing = [item for item in answers if not prefetch.has(assessment_key(*item))]
+    drafted = hirely_ai.run_many(
+        (hirely_ai.draft_answer_assessment, *assessment_args(section, record)) for section, _, record in missing
+    )
+    assessments = {(section, index): text for (section, index, _), text in zip(missing, drafted)}
+    for section, index, record in answers:
+        if (section, index) not in assessments:
+            assessments[(section, index)] = prefetch.result(
+                assessment_key(section, index, record), hirely_ai.draft_answer_assessment,
+                *assessment_args(section, record),
+            )
+    return assessments
+
+def assessed_report(hirely_ai, prefetch, candidate_data, technical_answers, project_answers, adaptive=None):
+    # The final report from the drafted entries; safe to run off the UI thread
+    assessments = draft_assessments(hirely_ai, prefetch, technical_answers, project_answers)
+    history = build_interview_history(technical_answers, project_answers, adaptive=adaptive, assessments=assessments)
+    return hirely_ai.generate_final_report(candidate_data, history, assessed=True)
+
+# --- Interview Session ---
+# Per-interview state, each key with a factory for its initial value. The
+# keys match app.py's session state, which the app passes in as `state` so
+# its interviews persist and resume like the rest of the session; the
+# service and the benchmarks use a plain dict.
+SESSION_FIELDS = {
+    'interview_phase': lambda: "info_gathering",
+    'technical_questions': list,
+    'project_questions': list,
+    'technical_answers': dict,
+    'project_answers': dict,
+    'current_tech_q': int,
+    'current_proj_q': int,
+    'scorecard': new_scorecard,
+    'adaptive': lambda: None,
+}
+
+def _state_field(key):
+    return property(lambda self: self.fields[key], lambda self, value: self.fields.__setitem__(key, value))
+
+class InterviewSession:
+    phase = _state_field('interview_phase')
+    candidate_data = _state_field('candidate_data')
+    session_id = _state_field('session_id')
+    technical_questions = _state_field('technical_questions')
+    project_questions = _state_field('project_questions')
+    technical_answers = _state_field('technical_answers')
+    project_answers = _state_field('project_answers')
+    current_tech_q = _state_field('current_tech_q')
+    current_proj_q = _state_field('current_proj_q')
+    scorecard = _state_field('scorecard')
+    adaptive_plan = _state_field('adaptive')
+
+    def __init__(self, hirely_ai, candidate_data=None, similarity_index=None, session_id=None, adaptive=None,
+                 state=None, prefetch=None):
+        self.hirely_ai = hirely_ai
+        self.similarity_index = similarity_index
+        self.adaptive = adaptive  # AdaptiveConfig, or None for a fixed question list
+        # Project questions and report entries are drafted in the background
+        self.prefetch = prefetch if prefetch is not None else PrefetchStore(hirely_ai.submit, enabled=True)
+        self.fields = {} if state is None else state
+        if candidate_data is not None:
+            self.candidate_data = candidate_data
+        if session_id is not None or 'session_id' not in self.fields:
+            self.session_id = session_id or uuid.uuid4().hex
+        resumed = 'interview_phase' not in self.fields and bool(self.fields.get('technical_questions'))
+        for key, factory in SESSION_FIELDS.items():
+            if key not in self.fields:
+                self.fields[key] = factory()
+        if resumed:
+            # State saved before the interview phase was tracked
+            self.phase = "technical_qa"
+            self._advance_phase()
+        self.report = None
+
+    def start(self):
+        self.prefetch.schedule("project_questions", self.hirely_ai.generate_project_questions)
+        tech_stack = self.candidate_data.get('techStack', [])
+        if self.adaptive is not None:
+            pools = self.hirely_ai.get_technical_question_pools(tech_stack)
+            self.adaptive_plan = new_adaptive_plan(pools, self.adaptive, self.hirely_ai.question_bank)
+            self.technical_questions = []
+            queue_next_question(self.adaptive_plan, self.technical_questions, 0)
+        else:
+            self.technical_questions = self.hirely_ai.get_technical_questions(tech_stack)
+        self.phase = "technical_qa"
+        self._advance_phase()
+        return self.current_question()
+
+    def current_question(self):
+        if self.phase == "technical_qa":
+            return self.technical_questions[self.current_tech_q]
+        if self.phase == "project_discussion":
+            return self.project_questions[self.current_proj_q]
+        return None
+
+    def context(self):
+        return "technical" if self.phase == "technical_qa" else "project"
+
+    def current_index(self):
+        return self.current_tech_q if self.phase == "technical_qa" else self.current_proj_q
+
+    def state(self):
+        # JSON-serializable view of where the interview stands
+        question = self.current_question()
+        if self.phase == "technical_qa":
+            index, total = self.current_tech_q, len(self.technical_questions)
+        elif self.phase == "project_discussion":
+            index, total = self.current_proj_q, len(self.project_questions)
+        else:
+            index, total = None, None
+        return {
+            'session_id': self.session_id,
+            'phase': self.phase,
+            'question': question,
+            'question_number': index + 1 if question is not None else None,
+            'total_questions': total,
+            'technical_questions': self.technical_questions,
+            'project_questions': self.project_questions,
+            'current_tech_q': self.current_tech_q,
+            'current_proj_q': self.current_proj_q,
+            'scorecard': dict(self.scorecard),
+            'adaptive': self.adaptive_plan,
+        }
+
+    # --- Candidate Input ---
+    def route(self, text):
+        # (intent, confidence) for a message to the open question
+        if self.current_question() is None:
+            raise ValueError(f"no open question in phase {self.phase!r}")
+        if not text.strip():
+            raise ValueError("empty answer")
+        return route_input(text)
+
+    def submit(self, text):
+        # Handle one candidate message; returns {'intent', 'confidence',
+        # 'reply', 'analysis', 'record'}
+        intent, confidence = self.route(text)
+        result = {'intent': intent, 'confidence': confidence, 'reply': None, 'analysis': None, 'record': None}
+        if intent == "question":
+            result['reply'] = self.answer_question(text)
+        elif intent == "clarification":
+            result['reply'] = self.clarify()
+        elif intent == "answer":
+            result['record'] = self.answer(text)
+            result['analysis'] = result['record']['analysis']
+        else:
+            self.skip()
+        return result
+
+    def answer_question(self, text):
+        reply = self.hirely_ai.answer_user_question(text)
+        if self.hirely_ai.is_unhelpful_reply(reply):
+            reply = self.hirely_ai.fallback_response(self.context())
+        return reply
+
+    def clarify(self):
+        # Only on request: most questions are never re-explained
+        return f"Let me clarify: {self.hirely_ai.re_explain_question(self.current_question())}"
+
+    def answer(self, text):
+        # Grade the answer to the open question, record it and move on;
+        # returns the stored record
+        question = self.current_question()
+        analysis = self.hirely_ai.evaluate_answer(question, text, self.context()).to_analysis(self.context())
+        return self.record_answer(question, text, analysis)
+
+    def skip(self):
+        self._next_question()
+
+    def record_answer(self, question, text, analysis):
+        answers = self.technical_answers if self.phase == "technical_qa" else self.project_answers
+        section, index = self.context(), self.current_index()
+        similar = None
+        if self.similarity_index is not None:
+            similar = self.similarity_index.add(
+                text, self.session_id, candidate_label(self.candidate_data), question
+            )
+        record = answer_record(question, text, analysis, similar)
+        if self.phase == "technical_qa":
+            update_scorecard(self.scorecard, record, answers.get(index))
+            record_adaptive_result(self.adaptive_plan, index, analysis.get('correctness'), self.hirely_ai.question_bank)
+        answers[index] = record
+        self.prefetch_assessment(section, index, record)
+        self._next_question()
+        return record
+
+    def prefetch_assessment(self, section, index, record):
+        # A replaced answer's draft is stale
+        key = assessment_key(section, index, record)
+        self.prefetch.cancel_prefix(f"assessment:{section}:{index}:", keep={key})
+        self.prefetch.schedule(key, self.hirely_ai.draft_answer_assessment, *assessment_args(section, record))
+
+    def _next_question(self):
+        if self.phase == "technical_qa":
+            self.current_tech_q += 1
+            queue_next_question(self.adaptive_plan, self.technical_questions, self.current_tech_q)
+        else:
+            self.current_proj_q += 1
+        self._advance_phase()
+
+    def _advance_phase(self):
+        # Skip past phases whose questions are exhausted
+        if self.phase == "technical_qa" and self.current_tech_q >= len(self.technical_questions):
+            if not self.project_questions:
+                self.project_questions = parse_project_questions(
+                    self.prefetch.result("project_questions", self.hirely_ai.generate_project_questions)
+                )
+            self.phase = "project_discussion"
+        if self.phase == "project_discussion" and self.current_proj_q >= len(self.project_questions):
+            self.phase = "report"
+
+    # --- Report ---
+    def adaptive_summary(self):
+        return adaptive_summary(self.adaptive_plan) if self.adaptive_plan is not None else None
+
+    def generate_report(self):
+        if self.report is None:
+            self.report = assessed_report(
+                self.hirely_ai, self.prefetch, self.candidate_data, self.technical_answers, self.project_answers,
+                adaptive=self.adaptive_summary(),
+            )
+        return self.report
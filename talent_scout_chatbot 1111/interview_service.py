@@ -0,0 +1,399 @@
+"""Interview service: the interview state machine over HTTP.
+
+Runs InterviewSession behind a small JSON API on one asyncio event loop, so
+the LLM side scales independently of the Streamlit UI. Every session shares
+one HirelyAI, meaning one LLM client per model, the process-wide rate
+limiter and the HIRELY_MAX_CONCURRENCY cap on in-flight Gemini requests.
+Blocking session steps run on a bounded thread pool, so a slow model queues
+work instead of stalling the loop.
+
+    POST /interviews                     candidate data -> session state and first question
+    GET  /interviews/<id>                session state (current question, progress, scorecard)
+    POST /interviews/<id>/answers        {"text": ...} -> intent, confidence, reply, answer, state
+    GET  /interviews/<id>/report         final report and assessment (once all questions are done)
+    GET  /healthz, GET /metrics
+
+Listens on 127.0.0.1 by default. With HIRELY_SERVICE_TOKEN set, every
+/interviews request must carry "Authorization: Bearer <token>"; binding any
+address but loopback requires the token, since sessions hold candidate PII.
+/healthz and /metrics (no candidate data) stay open for probes and scrapers.
+
+    HIRELY_SERVICE_TOKEN=... python interview_service.py --port 8600
+    python interview_service.py --fake-model --fake-latency lognormal:0.8,0.5   # offline load testing
+"""
+import argparse
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+import hmac
+from http import HTTPStatus
+import ipaddress
+import json
+import os
+import re
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from interview import InterviewSession
+from llm_client import LLMTimeoutError
+from metrics import REGISTRY as metrics
+from report_export import build_assessment
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8600
+DEFAULT_CONCURRENCY = 64
+DEFAULT_SESSION_TTL_MINUTES = 180
+DEFAULT_MAX_SESSIONS = 10000
+MAX_BODY_BYTES = 64 * 1024
+REQUIRED_CANDIDATE_FIELDS = ("fullName", "email", "techStack")
+
+class ServiceError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+class _Entry:
+    def __init__(self, session):
+        self.session = session
+        self.lock = asyncio.Lock()  # one step at a time per candidate
+        self.last_used = time.monotonic()
+        self.report = None
+
+class InterviewService:
+    def __init__(self, hirely_ai, similarity_index=None, concurrency=DEFAULT_CONCURRENCY,
+                 session_ttl=DEFAULT_SESSION_TTL_MINUTES * 60, max_sessions=DEFAULT_MAX_SESSIONS, adaptive=None,
+                 token=None):
+        self.hirely_ai = hirely_ai
+        self.token = token  # shared secret for /interviews; None only on loopback
+        self.similarity_index = similarity_index
+        self.adaptive = adaptive
+        self.session_ttl = session_ttl
+        self.max_sessions = max_sessions
+        # Session steps mostly wait on the model; upstream calls are capped
+        # separately by HirelyAI's process-wide concurrency limit
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="hirely-service")
+        self._sessions = OrderedDict()
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _entry(self, session_id):
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            raise ServiceError(HTTPStatus.NOT_FOUND, f"unknown interview {session_id!r}")
+        entry.last_used = time.monotonic()
+        self._sessions.move_to_end(session_id)
+        return entry
+
+    def _prune(self):
+        # Least recently used first: drop expired sessions, then any over the cap
+        cutoff = time.monotonic() - self.session_ttl
+        while self._sessions:
+            session_id, entry = next(iter(self._sessions.items()))
+            if entry.last_used >= cutoff and len(self._sessions) < self.max_sessions:
+                break
+            del self._sessions[session_id]
+
+    # --- Interview API ---
+    async def start(self, candidate_data):
+        if not isinstance(candidate_data, dict):
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "candidate data must be a JSON object")
+        missing = [field for field in REQUIRED_CANDIDATE_FIELDS if not candidate_data.get(field)]
+        if missing:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, f"missing candidate fields: {', '.join(missing)}")
+        self._prune()
+        session = InterviewSession(
+            self.hirely_ai, candidate_data, similarity_index=self.similarity_index, adaptive=self.adaptive,
+        )
+        entry = self._sessions[session.session_id] = _Entry(session)
+        async with entry.lock:
+            try:
+                await self._run(session.start)
+            except BaseException:
+                del self._sessions[session.session_id]
+                raise
+            return session.state()
+
+    async def state(self, session_id):
+        entry = self._entry(session_id)
+        async with entry.lock:
+            return entry.session.state()
+
+    async def submit(self, session_id, text):
+        entry = self._entry(session_id)
+        if not isinstance(text, str) or not text.strip():
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "answer text is required")
+        async with entry.lock:
+            session = entry.session
+            if session.current_question() is None:
+                raise ServiceError(HTTPStatus.CONFLICT, f"no open question in phase {session.phase!r}")
+            result = await self._run(session.submit, text)
+            return {
+                'intent': result['intent'], 'confidence': round(result['confidence'], 3),
+                'reply': result['reply'], 'record': result['record'], 'state': session.state(),
+            }
+
+    async def report(self, session_id):
+        entry = self._entry(session_id)
+        async with entry.lock:
+            session = entry.session
+            if session.phase != "report":
+                raise ServiceError(HTTPStatus.CONFLICT, f"interview still in phase {session.phase!r}")
+            if entry.report is None:
+                report = await self._run(session.generate_report)
+                entry.report = {
+                    'report': report,
+                    'assessment': build_assessment(
+                        session.candidate_data, session.technical_answers, session.project_answers, report,
+                        technical_total=len(session.technical_questions),
+                        project_total=len(session.project_questions),
+                        adaptive=session.adaptive_summary(),
+                    ),
+                }
+            return entry.report
+
+    # --- HTTP ---
+    _ROUTES = [
+        ("POST", re.compile(r"^/interviews$"), "_post_interview"),
+        ("GET", re.compile(r"^/interviews/(?P<session_id>[0-9a-f]+)$"), "_get_interview"),
+        ("POST", re.compile(r"^/interviews/(?P<session_id>[0-9a-f]+)/answers$"), "_post_answer"),
+        ("GET", re.compile(r"^/interviews/(?P<session_id>[0-9a-f]+)/report$"), "_get_report"),
+        ("GET", re.compile(r"^/healthz$"), "_get_health"),
+    ]
+
+    async def _post_interview(self, body):
+        return HTTPStatus.CREATED, await self.start(body)
+
+    async def _get_interview(self, body, session_id):
+        return HTTPStatus.OK, await self.state(session_id)
+
+    async def _post_answer(self, body, session_id):
+        return HTTPStatus.OK, await self.submit(session_id, body.get('text') if isinstance(body, dict) else None)
+
+    async def _get_report(self, body, session_id):
+        return HTTPStatus.OK, await self.report(session_id)
+
+    async def _get_health(self, body):
+        return HTTPStatus.OK, {'status': "ok", 'sessions': len(self._sessions)}
+
+    def authorized(self, headers):
+        if not self.token:
+            return True
+        scheme, _, supplied = headers.get("authorization", "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(supplied.strip().encode(), self.token.encode())
+
+    async def dispatch(self, method, path, body, headers=None):
+        # (status, JSON-serializable payload) for one request
+        path = path.split("?", 1)[0]
+        if path.startswith("/interviews") and not self.authorized(headers or {}):
+            return HTTPStatus.UNAUTHORIZED, {'error': "missing or invalid service token"}
+        allowed = False
+        for route_method, pattern, handler in self._ROUTES:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            if route_method != method:
+                allowed = True
+                continue
+            try:
+                return await getattr(self, handler)(body, **match.groupdict())
+            except ServiceError as exc:
+                return exc.status, {'error': str(exc)}
+            except LLMTimeoutError as exc:
+                return HTTPStatus.GATEWAY_TIMEOUT, {'error': f"model timed out: {exc}"}
+            except Exception as exc:
+                # Model or SDK failure after retries; the candidate can resend
+                return HTTPStatus.BAD_GATEWAY, {'error': f"{type(exc).__name__}: {exc}"}
+        if allowed:
+            return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f"{method} not allowed on {path}"}
+        return HTTPStatus.NOT_FOUND, {'error': f"no route for {path}"}
+
+    async def handle_connection(self, reader, writer):
+        # HTTP/1.1 with keep-alive; JSON in, JSON out
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY_BYTES:
+                    status, payload, body = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': "request body too large"}, None
+                else:
+                    raw = await reader.readexactly(length) if length else b""
+                    try:
+                        body = json.loads(raw) if raw else None
+                    except ValueError:
+                        body = None
+                    if raw and body is None:
+                        status, payload = HTTPStatus.BAD_REQUEST, {'error': "request body is not valid JSON"}
+                    elif method == "GET" and path == "/metrics":
+                        status, payload = HTTPStatus.OK, metrics.to_prometheus()
+                    else:
+                        status, payload = await self.dispatch(method, path, body, headers)
+                keep_alive = headers.get("connection", "").lower() != "close" and length <= MAX_BODY_BYTES
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        if not self.token and not _is_loopback(host):
+            raise ValueError(f"refusing to serve on {host} without HIRELY_SERVICE_TOKEN")
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+def _is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def _response(status, payload, keep_alive):
+    if isinstance(payload, str):
+        body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+    else:
+        body, content_type = json.dumps(payload, default=str).encode("utf-8"), "application/json"
+    head = (
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    return head.encode("latin-1") + body
+
+# --- Client ---
+# Blocking client for the Streamlit app (thin-client mode)
+class InterviewServiceError(Exception):
+    def __init__(self, status, message):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+class InterviewServiceClient:
+    # Every failure, including an unreachable service, raises
+    # InterviewServiceError; status 503 when no HTTP response came back
+    def __init__(self, base_url, timeout=180.0, token=None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.token = token
+
+    def _request(self, method, path, payload=None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {'Content-Type': "application/json"}
+        if self.token:
+            headers['Authorization'] = f"Bearer {self.token}"
+        request = urllib.request.Request(self.base_url + path, data=data, method=method, headers=headers)
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as exc:
+            try:
+                message = json.loads(exc.read()).get('error', exc.reason)
+            except ValueError:
+                message = exc.reason
+            raise InterviewServiceError(exc.code, message) from None
+        except (urllib.error.URLError, OSError, ValueError) as exc:
+            # Connection refused or reset, timeout, or a truncated response
+            raise InterviewServiceError(HTTPStatus.SERVICE_UNAVAILABLE, f"service unreachable: {exc}") from None
+
+    def start(self, candidate_data):
+        return self._request("POST", "/interviews", candidate_data)
+
+    def state(self, session_id):
+        return self._request("GET", f"/interviews/{session_id}")
+
+    def submit(self, session_id, text):
+        return self._request("POST", f"/interviews/{session_id}/answers", {'text': text})
+
+    def report(self, session_id):
+        return self._request("GET", f"/interviews/{session_id}/report")
+
+def interview_service_client_from_env():
+    # None unless HIRELY_SERVICE_URL points the app at a running service
+    url = os.getenv("HIRELY_SERVICE_URL", "")
+    return InterviewServiceClient(url, token=os.getenv("HIRELY_SERVICE_TOKEN") or None) if url else None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--host", default=os.getenv("HIRELY_SERVICE_HOST", DEFAULT_HOST),
+        help="address to bind; anything but loopback requires HIRELY_SERVICE_TOKEN",
+    )
+    parser.add_argument("--port", type=int, default=int(os.getenv("HIRELY_SERVICE_PORT", str(DEFAULT_PORT))))
+    parser.add_argument(
+        "--concurrency", type=int, default=int(os.getenv("HIRELY_SERVICE_CONCURRENCY", str(DEFAULT_CONCURRENCY))),
+        help="session steps run at once; the rest queue",
+    )
+    parser.add_argument(
+        "--fake-model", action="store_true",
+        help="use the offline fake model with throwaway question bank, grading cache and similarity index (load testing)",
+    )
+    parser.add_argument("--fake-latency", default="0", help='fake model latency, e.g. "lognormal:0.8,0.5"')
+    args = parser.parse_args(argv)
+    token = os.getenv("HIRELY_SERVICE_TOKEN") or None
+    if not token and not _is_loopback(args.host):
+        parser.error(f"--host {args.host} requires HIRELY_SERVICE_TOKEN (sessions hold candidate data)")
+
+    from adaptive import adaptive_config_from_env
+    from ai_analysis import HirelyAI, configure_genai
+    from grading_cache import GradingCache, grading_cache_from_env
+    from local_classifiers import local_classifier_from_env
+    from question_bank import QuestionBank, question_bank_from_env
+    from similarity_index import SimilarityIndex, similarity_index_from_env
+
+    with contextlib.ExitStack() as stack:
+        if args.fake_model:
+            # Fake questions, verdicts and answers must never reach the
+            # production stores real candidates are served from, so the fake
+            # model gets SQLite stores in a directory removed on exit
+            import fake_model
+            model = fake_model.FakeGenerativeModel(latency=fake_model.parse_latency(args.fake_latency))
+            scratch = stack.enter_context(tempfile.TemporaryDirectory(prefix="hirely-fake-"))
+            question_bank = QuestionBank(os.path.join(scratch, "question_bank.sqlite3"))
+            grading_cache = GradingCache(os.path.join(scratch, "grading_cache.sqlite3"))
+            similarity_index = SimilarityIndex(os.path.join(scratch, "similarity_index.sqlite3"))
+        else:
+            configure_genai(api_key=os.getenv("GEMINI_API_KEY"))
+            model = None
+            question_bank = question_bank_from_env()
+            grading_cache = grading_cache_from_env()
+            similarity_index = similarity_index_from_env()
+        hirely_ai = HirelyAI(
+            question_bank=question_bank,
+            local_classifier=local_classifier_from_env(),
+            model=model,
+            grading_cache=grading_cache,
+        )
+        service = InterviewService(
+            hirely_ai,
+            similarity_index=similarity_index,
+            concurrency=args.concurrency,
+            session_ttl=float(os.getenv("HIRELY_SERVICE_SESSION_TTL_MINUTES", str(DEFAULT_SESSION_TTL_MINUTES))) * 60,
+            adaptive=adaptive_config_from_env(),
+            token=token,
+        )
+        print(f"Interview service listening on {args.host}:{args.port}", flush=True)
+        try:
+            asyncio.run(service.serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+import contextlib
+import hashlib
+import json
+import os
+import queue
+import random
+import threading
+import time
+
+from metrics import REGISTRY as metrics
+
+# --- Resilient LLM Client ---
+# Sits between HirelyAI and the Gemini model: a process-wide token bucket
+# (requests/min and tokens/min), per-call deadlines, jittered exponential
+# backoff on retryable errors, and single-flight coalescing so identical
+# in-flight prompts from concurrent sessions share one upstream request.
+# Calls given a hedge delay send a second request if the first hasn't
+# answered in time, and return whichever finishes first.
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+RETRYABLE_ERROR_NAMES = {
+    "ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+    "DeadlineExceeded", "GatewayTimeout", "BadGateway", "Aborted", "RetryError",
+}
+
+class LLMTimeoutError(TimeoutError):
+    pass
+
+def is_retryable(exc):
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+    code = getattr(exc, "code", None)
+    if callable(code):
+        code = None
+    try:
+        if code is not None and int(code) in RETRYABLE_STATUS_CODES:
+            return True
+    except (TypeError, ValueError):
+        pass
+    return type(exc).__name__ in RETRYABLE_ERROR_NAMES
+
+def estimate_tokens(text):
+    # ~4 characters per token; good enough for budgeting without a count_tokens round trip
+    return max(1, len(str(text)) // 4)
+
+class TokenBucket:
+    def __init__(self, rate_per_minute, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+
+    def acquire(self, amount=1, deadline=None):
+        # Block until `amount` tokens are available, or raise LLMTimeoutError at deadline
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                raise LLMTimeoutError("rate limit wait exceeds the call deadline")
+            self._sleep(min(wait, 1.0))
+
+class RateLimiter:
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+    def acquire(self, tokens, deadline=None):
+        if self.requests is not None:
+            self.requests.acquire(1, deadline)
+        if self.tokens is not None:
+            self.tokens.acquire(tokens, deadline)
+
+_default_limiter = None
+_default_limiter_lock = threading.Lock()
+
+def default_rate_limiter():
+    # Shared by every client in the process, so all sessions draw from one quota
+    global _default_limiter
+    with _default_limiter_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter(
+                requests_per_minute=int(os.getenv("HIRELY_LLM_RPM", "1000")),
+                tokens_per_minute=int(os.getenv("HIRELY_LLM_TPM", "4000000")),
+            )
+        return _default_limiter
+
+def _describe(value):
+    if hasattr(value, "__dict__"):
+        return vars(value)
+    return repr(value)
+
+class LLMClient:
+    def __init__(self, model, limiter=None, timeout=None, max_retries=None,
+                 base_backoff=0.5, max_backoff=8.0, slot=None, sleep=time.sleep):
+        self.model = model
+        self.limiter = limiter if limiter is not None else default_rate_limiter()
+        self.timeout = timeout if timeout is not None else float(os.getenv("HIRELY_LLM_TIMEOUT", "60"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("HIRELY_LLM_RETRIES", "3"))
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        # slot() returns a context manager bounding concurrent upstream calls
+        self._slot = slot or contextlib.nullcontext
+        self._sleep = sleep
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {'calls': 0, 'upstream': 0, 'retries': 0, 'coalesced': 0, 'timeouts': 0, 'errors': 0,
+                      'hedges': 0, 'hedge_wins': 0}
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _coalesce_key(self, prompt, kwargs):
+        encoded = json.dumps([str(prompt), kwargs], sort_keys=True, default=_describe)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def generate(self, prompt, timeout=None, hedge_after=None, **kwargs):
+        # Text of the model response; identical concurrent calls share one request.
+        # hedge_after: seconds after which a second, racing request is sent.
+        self._count('calls')
+        timeout = timeout or self.timeout
+        key = self._coalesce_key(prompt, kwargs)
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+        if not leader:
+            self._count('coalesced')
+            try:
+                return future.result(timeout=timeout)
+            except FutureTimeoutError:
+                self._count('timeouts')
+                raise LLMTimeoutError(f"no response within {timeout:.1f}s") from None
+
+        deadline = time.monotonic() + timeout
+        try:
+            if hedge_after is not None and hedge_after < timeout:
+                result, usage = self._hedged_call(prompt, deadline, kwargs, hedge_after)
+            else:
+                result, usage = self._call_with_retries(prompt, deadline, kwargs)
+            metrics.add_tokens(*usage)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _hedged_call(self, prompt, deadline, kwargs, hedge_after):
+        # Race a second request against a slow first one. The loser is
+        # cancelled: it skips any attempt it hasn't started yet, and a
+        # response already in flight is discarded when it lands (the SDK
+        # call itself can't be interrupted).
+        cancelled = threading.Event()
+        outcomes = queue.Queue()
+
+        def attempt(name):
+            try:
+                outcomes.put((name, self._call_with_retries(prompt, deadline, kwargs, cancelled), None))
+            except BaseException as exc:
+                outcomes.put((name, None, exc))
+
+        def launch(name):
+            threading.Thread(target=attempt, args=(name,), name=f"hirely-{name}", daemon=True).start()
+
+        launch("primary")
+        pending, hedged, error = 1, False, None
+        try:
+            while pending:
+                wait = deadline - time.monotonic() if hedged else hedge_after
+                try:
+                    name, result, exc = outcomes.get(timeout=max(0.0, wait))
+                except queue.Empty:
+                    if hedged or time.monotonic() >= deadline:
+                        self._count('timeouts')
+                        raise LLMTimeoutError("call deadline exceeded") from None
+                    self._count('hedges')
+                    launch("hedge")
+                    pending, hedged = pending + 1, True
+                    continue
+                pending -= 1
+                if exc is None:
+                    if name == "hedge":
+                        self._count('hedge_wins')
+                    metrics.note(hedged=hedged, hedge_winner=name if hedged else None)
+                    return result
+                # Primary failed before the hedge delay: its retries are spent
+                error = exc
+            raise error
+        finally:
+            cancelled.set()
+
+    def _call_with_retries(self, prompt, deadline, kwargs, cancelled=None):
+        # (text, (prompt_tokens, response_tokens)) for one logical call
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._count('timeouts')
+                raise LLMTimeoutError("call deadline exceeded")
+            try:
+                self.limiter.acquire(estimate_tokens(prompt), deadline)
+                with self._slot():
+                    if cancelled is not None and cancelled.is_set():
+                        return None, (0, 0)
+                    self._count('upstream')
+                    response = self.model.generate_content(
+                        prompt, request_options={"timeout": max(0.001, deadline - time.monotonic())}, **kwargs
+                    )
+                    text = response.text
+                    return text, self._usage(prompt, response, text)
+            except LLMTimeoutError:
+                self._count('timeouts')
+                raise
+            except Exception as exc:
+                if not is_retryable(exc) or attempt >= self.max_retries:
+                    self._count('errors')
+                    raise
+                delay = self._backoff(attempt)
+                if time.monotonic() + delay >= deadline:
+                    self._count('errors')
+                    raise
+                self._count('retries')
+                self._sleep(delay)
+                attempt += 1
+
+    def _usage(self, prompt, response, text):
+        # (prompt, response) tokens; estimated if the SDK gave no usage
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", 0) or estimate_tokens(prompt)
+        response_tokens = getattr(usage, "candidates_token_count", 0) or estimate_tokens(text)
+        return prompt_tokens, response_tokens
+
+    def _record_usage(self, prompt, response, text):
+        # Attribute tokens to the running HirelyAI task
+        metrics.add_tokens(*self._usage(prompt, response, text))
+
+    def _backoff(self, attempt):
+        # Full jitter: uniform over [0, min(cap, base * 2^attempt)]
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** attempt)))
+
+    def stream(self, prompt, timeout=None, **kwargs):
+        # Yields text chunks. Retries only happen before the first chunk is out.
+        self._count('calls')
+        deadline = time.monotonic() + (timeout or self.timeout)
+        attempt = 0
+        while True:
+            started = False
+            try:
+                self.limiter.acquire(estimate_tokens(prompt), deadline)
+                with self._slot():
+                    self._count('upstream')
+                    remaining = max(0.001, deadline - time.monotonic())
+                    response = self.model.generate_content(
+                        prompt, stream=True, request_options={"timeout": remaining}, **kwargs
+                    )
+                    parts = []
+                    last_chunk = None
+                    for chunk in response:
+                        last_chunk = chunk
+                        try:
+                            text = chunk.text
+                        except ValueError:
+                            # Chunks without text parts (e.g. the final finish-reason chunk)
+                            continue
+                        if text:
+                            started = True
+                            parts.append(text)
+                            yield text
+                    self._record_usage(prompt, last_chunk, "".join(parts))
+                return
+            except LLMTimeoutError:
+                self._count('timeouts')
+                raise
+            except Exception as exc:
+                delay = self._backoff(attempt)
+                if (started or not is_retryable(exc) or attempt >= self.max_retries
+                        or time.monotonic() + delay >= deadline):
+                    self._count('errors')
+                    raise
+                self._count('retries')
+                self._sleep(delay)
+                attempt += 1
@@ -0,0 +1,195 @@
+import math
+import os
+import re
+import threading
+
+# --- Local Fast-Path Classifiers ---
+# Sentiment and AI-text detection are decided locally when the signal is
+# clear; only low-confidence answers escalate to the Gemini prompts in
+# HirelyAI. Both scorers are pure Python and run in microseconds.
+_WORD = re.compile(r"[a-z]+(?:'[a-z]+)?")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+
+POSITIVE_WORDS = frozenset("""
+    good great excellent enjoy enjoyed enjoying love loved like liked happy glad excited exciting
+    confident comfortable success successful successfully proud achieve achieved improve improved
+    improvement efficient effective benefit benefits helpful useful interesting passionate fun
+    easy easily solved solve robust reliable clean elegant powerful fast faster best better
+    learned learning grow growth opportunity thanks thank appreciate awesome amazing fantastic
+    rewarding satisfying smooth productive eager motivated strong positive win won
+""".split())
+
+NEGATIVE_WORDS = frozenset("""
+    bad poor terrible awful hate hated dislike difficult hard struggle struggled struggling
+    problem problems issue issues fail failed failure failing bug bugs broken slow slower
+    confusing confused frustrating frustrated annoying annoyed worried worry stress stressful
+    unfortunately sadly messy painful impossible wrong mistake mistakes error errors crash
+    crashed worse worst weak negative boring tired unsure nervous afraid lost regret useless
+    complicated blocked blocker delay delayed
+""".split())
+
+NEGATIONS = frozenset("not no never cannot without hardly neither nor".split())
+
+# Phrases that are far more common in model output than in typed interview answers
+AI_MARKERS = (
+    "furthermore", "moreover", "additionally", "in conclusion", "in summary", "overall,",
+    "it is important to note", "it's important to note", "plays a crucial role", "crucial",
+    "leverage", "leveraging", "seamless", "seamlessly", "robust", "delve", "comprehensive",
+    "various", "ensures", "facilitates", "in essence", "key aspects", "a wide range of",
+    "on the other hand", "by contrast", "this allows", "enabling", "utilize", "utilizing",
+)
+
+FIRST_PERSON = frozenset("i i'm i've i'd i'll me my mine we we're our us".split())
+
+def _tokens(text):
+    return _WORD.findall(text.lower())
+
+def _sentences(text):
+    return [s for s in (part.strip() for part in _SENTENCE_SPLIT.split(text)) if s]
+
+def score_sentiment(text):
+    # Lexicon polarity with a three-token negation window.
+    # Returns (label, confidence in [0, 1]).
+    tokens = _tokens(text)
+    positive = negative = 0
+    negate_until = -1
+    for i, token in enumerate(tokens):
+        if token in NEGATIONS or token.endswith("n't"):
+            negate_until = i + 3
+            continue
+        polarity = (token in POSITIVE_WORDS) - (token in NEGATIVE_WORDS)
+        if polarity and i <= negate_until:
+            polarity = -polarity
+        if polarity > 0:
+            positive += 1
+        elif polarity < 0:
+            negative += 1
+
+    hits = positive + negative
+    if not tokens:
+        return "Neutral", 0.0
+    if hits == 0:
+        # Plain technical explanations carry no sentiment words at all
+        return "Neutral", min(0.9, 0.5 + 0.02 * len(tokens))
+    polarity = (positive - negative) / hits
+    support = min(1.0, hits / 3)
+    if abs(polarity) < 0.5:
+        return "Neutral", 0.4 * support + 0.2
+    label = "Positive" if polarity > 0 else "Negative"
+    return label, 0.5 + 0.5 * abs(polarity) * support
+
+def stylometric_features(text):
+    tokens = _tokens(text)
+    sentences = _sentences(text)
+    lengths = [len(_tokens(s)) for s in sentences] or [0]
+    mean_len = sum(lengths) / len(lengths)
+    variance = sum((n - mean_len) ** 2 for n in lengths) / len(lengths)
+    n_words = max(1, len(tokens))
+    window = tokens[:100]
+    lower = text.lower()
+    return {
+        'words': len(tokens),
+        'sentences': len(sentences),
+        'mean_sentence_length': mean_len,
+        'sentence_length_variance': variance,
+        # Coefficient of variation of sentence length: humans are bursty
+        'burstiness': math.sqrt(variance) / mean_len if mean_len else 0.0,
+        'type_token_ratio': len(set(window)) / len(window) if window else 0.0,
+        'marker_rate': sum(lower.count(m) for m in AI_MARKERS) / max(1, len(sentences)),
+        'first_person_rate': sum(t in FIRST_PERSON for t in tokens) / n_words,
+        'contraction_rate': sum("'" in t for t in tokens) / n_words,
+        'formal_punctuation_rate': (text.count(';') + text.count(':') + text.count('—')) / max(1, len(sentences)),
+        'comma_rate': text.count(',') / max(1, len(sentences)),
+        'casual_punctuation': int('...' in text or '!!' in text or '??' in text),
+        'lowercase_starts': sum(s[:1].islower() for s in sentences) / max(1, len(sentences)),
+        'structured': int(bool(re.search(r"^\s*(?:[-*•]|\d+\.)\s", text, re.M)) or '**' in text),
+    }
+
+# Hand-tuned logistic model: name -> (weight, centre, cue when above centre, cue when below)
+_AI_FEATURES = {
+    'burstiness': (-2.5, 0.45, "varied sentence lengths", "uniform sentence lengths"),
+    'type_token_ratio': (2.0, 0.7, "polished, varied vocabulary", "repetitive everyday vocabulary"),
+    'marker_rate': (2.5, 0.0, "generic transition phrases", ""),
+    'first_person_rate': (-12.0, 0.0, "personal experience", "no personal experience"),
+    'contraction_rate': (-15.0, 0.0, "casual contractions", ""),
+    'formal_punctuation_rate': (1.0, 0.0, "formal punctuation", ""),
+    'comma_rate': (0.4, 0.0, "long comma-heavy sentences", ""),
+    'casual_punctuation': (-1.5, 0.0, "casual punctuation", ""),
+    'lowercase_starts': (-3.0, 0.0, "informal capitalisation", ""),
+    'structured': (1.5, 0.0, "list/markdown structure", ""),
+}
+_AI_BIAS = -0.925
+
+def detect_ai_text(text):
+    # Returns (ai_detected 'Yes'/'No', confidence in [0, 1], reason)
+    features = stylometric_features(text)
+    if features['words'] < 15:
+        return "No", 0.75, "Short, conversational answer."
+    contributions = {
+        name: weight * (features[name] - centre)
+        for name, (weight, centre, _, _) in _AI_FEATURES.items()
+    }
+    z = _AI_BIAS + sum(contributions.values())
+    probability = 1 / (1 + math.exp(-z))
+    confidence = abs(2 * probability - 1)
+    if features['sentences'] < 3:
+        # Burstiness and variance mean little over one or two sentences
+        confidence *= 0.6
+    verdict = "Yes" if probability >= 0.5 else "No"
+    # Explain with the features pushing hardest toward the verdict
+    sign = 1 if verdict == "Yes" else -1
+    cues = []
+    for name in sorted(contributions, key=lambda name: sign * contributions[name], reverse=True)[:2]:
+        if sign * contributions[name] <= 0:
+            continue
+        _, centre, above, below = _AI_FEATURES[name]
+        cue = above if features[name] > centre else below
+        if cue:
+            cues.append(cue)
+    reason = f"Local stylometric check: {', '.join(cues) or 'no strong cues'}."
+    return verdict, confidence, reason
+
+def confidence_label(confidence):
+    if confidence >= 0.8:
+        return "High"
+    if confidence >= 0.5:
+        return "Medium"
+    return "Low"
+
+class LocalClassifier:
+    def __init__(self, sentiment_threshold=0.75, ai_threshold=0.8):
+        self.sentiment_threshold = sentiment_threshold
+        self.ai_threshold = ai_threshold
+        self._lock = threading.Lock()
+        self.counts = {'local': 0, 'escalated': 0, 'llm_calls_saved': 0}
+
+    def sentiment(self, text):
+        # Label if confident enough to skip the LLM, else None
+        label, confidence = score_sentiment(text)
+        return label if confidence >= self.sentiment_threshold else None
+
+    def ai_detection(self, text):
+        # (ai_detected, confidence label, reason) if confident enough, else None
+        verdict, confidence, reason = detect_ai_text(text)
+        if confidence < self.ai_threshold:
+            return None
+        return verdict, confidence_label(confidence), reason
+
+    def record(self, local=0, escalated=0, saved=0):
+        with self._lock:
+            self.counts['local'] += local
+            self.counts['escalated'] += escalated
+            self.counts['llm_calls_saved'] += saved
+
+    def stats(self):
+        with self._lock:
+            return dict(self.counts)
+
+def local_classifier_from_env():
+    # None when HIRELY_LOCAL_TIER is "off"
+    if os.getenv("HIRELY_LOCAL_TIER", "on").lower() in ("off", "0", "false"):
+        return None
+    return LocalClassifier(
+        sentiment_threshold=float(os.getenv("HIRELY_LOCAL_SENTIMENT_THRESHOLD", "0.75")),
+        ai_threshold=float(os.getenv("HIRELY_LOCAL_AI_THRESHOLD", "0.8")),
+    )
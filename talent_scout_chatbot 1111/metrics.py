@@ -0,0 +1,280 @@
+from collections import defaultdict, deque
+import functools
+import json
+import os
+import threading
+import time
+
+# --- Metrics ---
+# Per-call and per-phase instrumentation. Every LLM-backed HirelyAI method
+# records wall time, prompt/response tokens, cache outcome and error class;
+# the UI records how long each interview phase took. Events are appended
+# to a JSONL file and aggregated into a Prometheus text exposition.
+# Tokens are counted once, under the innermost task running when the model
+# was called, so a task's tokens exclude those of tasks nested inside it
+# and summing across tasks gives the total.
+METRICS_DIR = os.getenv(
+    "HIRELY_METRICS_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "metrics"),
+)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SAMPLE_WINDOW = 2000
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[index]
+
+class _Series:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.samples.append(seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+
+class Metrics:
+    def __init__(self, metrics_dir=METRICS_DIR, flush_interval=10.0):
+        # metrics_dir=None keeps everything in memory
+        self.metrics_dir = metrics_dir
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._calls = defaultdict(_Series)
+        self._phases = defaultdict(_Series)
+        self._tokens = defaultdict(lambda: {'prompt': 0, 'response': 0})
+        self._cache = defaultdict(int)
+        self._errors = defaultdict(int)
+        self._hedges = defaultdict(int)
+        self._last_flush = 0.0
+        self._context = threading.local()
+
+    # --- Recording ---
+    def record_call(self, task, seconds, prompt_tokens=0, response_tokens=0, cache=None, error=None, **extra):
+        with self._lock:
+            self._calls[task].observe(seconds)
+            self._tokens[task]['prompt'] += prompt_tokens
+            self._tokens[task]['response'] += response_tokens
+            if cache:
+                self._cache[(task, cache)] += 1
+            if error:
+                self._errors[(task, error)] += 1
+            if extra.get('hedged'):
+                self._hedges[(task, extra.get('hedge_winner'))] += 1
+        self._emit({
+            'type': 'call', 'task': task, 'seconds': round(seconds, 6),
+            'prompt_tokens': prompt_tokens, 'response_tokens': response_tokens,
+            'cache': cache, 'error': error, **extra,
+        })
+
+    def record_phase(self, phase, seconds, session=None):
+        with self._lock:
+            self._phases[phase].observe(seconds)
+        self._emit({'type': 'phase', 'phase': phase, 'seconds': round(seconds, 6), 'session': session})
+
+    # --- Call context (lets the LLM client attribute tokens to the running task) ---
+    def _stack(self):
+        stack = getattr(self._context, "stack", None)
+        if stack is None:
+            stack = self._context.stack = []
+        return stack
+
+    def add_tokens(self, prompt_tokens, response_tokens):
+        stack = self._stack()
+        if stack:
+            stack[-1]['prompt_tokens'] += prompt_tokens
+            stack[-1]['response_tokens'] += response_tokens
+
+    def current_task(self):
+        # Innermost running task on this thread, e.g. for per-task model routing
+        tasks = getattr(self._context, "tasks", None)
+        return tasks[-1] if tasks else None
+
+    def note(self, **fields):
+        # Annotate the innermost running task, e.g. note(cache="hit")
+        stack = self._stack()
+        if stack:
+            stack[-1].update(fields)
+
+    def track(self, task):
+        return _Tracked(self, task)
+
+    def instrument(self, task):
+        # Decorator for HirelyAI methods; generators are timed until exhausted
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.track(task):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def instrument_stream(self, task):
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.track(task) as frame:
+                    started = time.perf_counter()
+                    for chunk in fn(*args, **kwargs):
+                        if 'first_token_seconds' not in frame:
+                            frame['first_token_seconds'] = round(time.perf_counter() - started, 6)
+                        yield chunk
+            return wrapper
+        return decorator
+
+    # --- Export ---
+    def _emit(self, event):
+        if not self.metrics_dir:
+            return
+        event = {'ts': round(time.time(), 3), **event}
+        line = json.dumps(event, default=str)
+        with self._lock:
+            try:
+                os.makedirs(self.metrics_dir, exist_ok=True)
+                with open(os.path.join(self.metrics_dir, "events.jsonl"), "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError:
+                # Metrics must never break an interview
+                return
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.write_prometheus()
+
+    def write_prometheus(self, path=None):
+        if not (path or self.metrics_dir):
+            return
+        path = path or os.path.join(self.metrics_dir, "metrics.prom")
+        text = self.to_prometheus()
+        with self._lock:
+            self._last_flush = time.monotonic()
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def to_prometheus(self):
+        lines = []
+        with self._lock:
+            for name, label, series_map in (
+                ("hirely_llm_call_seconds", "task", self._calls),
+                ("hirely_phase_seconds", "phase", self._phases),
+            ):
+                lines.append(f"# TYPE {name} histogram")
+                for key, series in sorted(series_map.items()):
+                    for bound, count in zip(LATENCY_BUCKETS, series.buckets):
+                        lines.append(f'{name}_bucket{{{label}="{key}",le="{bound}"}} {count}')
+                    lines.append(f'{name}_bucket{{{label}="{key}",le="+Inf"}} {series.count}')
+                    lines.append(f'{name}_sum{{{label}="{key}"}} {series.total:.6f}')
+                    lines.append(f'{name}_count{{{label}="{key}"}} {series.count}')
+            lines.append("# TYPE hirely_llm_tokens_total counter")
+            for task, tokens in sorted(self._tokens.items()):
+                for kind, value in tokens.items():
+                    lines.append(f'hirely_llm_tokens_total{{task="{task}",kind="{kind}"}} {value}')
+            lines.append("# TYPE hirely_cache_total counter")
+            for (task, outcome), value in sorted(self._cache.items()):
+                lines.append(f'hirely_cache_total{{task="{task}",outcome="{outcome}"}} {value}')
+            lines.append("# TYPE hirely_llm_errors_total counter")
+            for (task, error), value in sorted(self._errors.items()):
+                lines.append(f'hirely_llm_errors_total{{task="{task}",error="{error}"}} {value}')
+            lines.append("# TYPE hirely_llm_hedges_total counter")
+            for (task, winner), value in sorted(self._hedges.items()):
+                lines.append(f'hirely_llm_hedges_total{{task="{task}",winner="{winner}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        # Rows for the admin panel: latency percentiles per prompt type
+        with self._lock:
+            rows = []
+            for task, series in sorted(self._calls.items()):
+                samples = list(series.samples)
+                rows.append({
+                    'task': task,
+                    'calls': series.count,
+                    'p50_s': round(_percentile(samples, 0.50), 3),
+                    'p95_s': round(_percentile(samples, 0.95), 3),
+                    'prompt_tokens': self._tokens[task]['prompt'],
+                    'response_tokens': self._tokens[task]['response'],
+                    'cache_hits': self._cache.get((task, 'hit'), 0),
+                    'errors': sum(v for (t, _), v in self._errors.items() if t == task),
+                    'hedges': sum(v for (t, _), v in self._hedges.items() if t == task),
+                })
+            return rows
+
+    def phase_summary(self):
+        with self._lock:
+            return [
+                {
+                    'phase': phase,
+                    'count': series.count,
+                    'p50_s': round(_percentile(list(series.samples), 0.50), 3),
+                    'p95_s': round(_percentile(list(series.samples), 0.95), 3),
+                }
+                for phase, series in sorted(self._phases.items())
+            ]
+
+    def percentile(self, task, q):
+        with self._lock:
+            series = self._calls.get(task)
+            return _percentile(list(series.samples), q) if series else None
+
+class _Tracked:
+    def __init__(self, metrics, task):
+        self.metrics = metrics
+        self.task = task
+
+    def __enter__(self):
+        self.frame = {'prompt_tokens': 0, 'response_tokens': 0}
+        self.metrics._stack().append(self.frame)
+        if not hasattr(self.metrics._context, "tasks"):
+            self.metrics._context.tasks = []
+        self.metrics._context.tasks.append(self.task)
+        self.started = time.perf_counter()
+        return self.frame
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.started
+        self.metrics._stack().pop()
+        self.metrics._context.tasks.pop()
+        # Only this task's own tokens: nested tasks record theirs themselves
+        self.metrics.record_call(
+            self.task,
+            seconds,
+            error=exc_type.__name__ if exc_type and not issubclass(exc_type, GeneratorExit) else None,
+            **self.frame,
+        )
+        return False
+
+def serve_prometheus(metrics, port):
+    # Optional /metrics endpoint on a daemon thread
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = metrics.to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("0.0.0.0", int(port)), Handler)
+    threading.Thread(target=server.serve_forever, name="hirely-metrics", daemon=True).start()
+    return server
+
+_disabled = os.getenv("HIRELY_METRICS_DIR", "").lower() in ("off", "none")
+REGISTRY = Metrics(metrics_dir=None if _disabled else METRICS_DIR)
@@ -0,0 +1,73 @@
+import os
+import threading
+
+# --- Speculative Prefetch ---
+# Candidates spend minutes typing each answer while the server is idle.
+# The interview schedules LLM work it will need next (project questions,
+# each answer's entry in the final report, then the report itself) into a
+# per-session store and consumes the futures when the candidate gets there.
+PREFETCH_ENABLED = os.getenv("HIRELY_PREFETCH", "on").lower() not in ("off", "0", "false")
+
+class PrefetchStore:
+    def __init__(self, submit, enabled=PREFETCH_ENABLED):
+        # submit(fn, *args) -> concurrent.futures.Future, e.g. HirelyAI.submit
+        self._submit = submit
+        self.enabled = enabled
+        self._futures = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.cancelled = 0
+
+    def schedule(self, key, fn, *args):
+        # No-op if the key is already pending or done
+        if not self.enabled:
+            return None
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None or future.cancelled():
+                future = self._submit(fn, *args)
+                self._futures[key] = future
+            return future
+
+    def has(self, key):
+        with self._lock:
+            return key in self._futures
+
+    def ready(self, key):
+        with self._lock:
+            future = self._futures.get(key)
+        return future is not None and future.done() and not future.cancelled()
+
+    def result(self, key, fn=None, *args):
+        # Result of the prefetched call (waiting if still in flight); falls back
+        # to calling fn directly when nothing was prefetched or it failed.
+        with self._lock:
+            future = self._futures.get(key)
+        if future is not None and not future.cancelled():
+            try:
+                result = future.result()
+                self.hits += 1
+                return result
+            except Exception:
+                if fn is None:
+                    raise
+        self.misses += 1
+        return fn(*args) if fn is not None else None
+
+    def cancel(self, key):
+        with self._lock:
+            future = self._futures.pop(key, None)
+        if future is not None and not future.done():
+            # Already-running calls can't be interrupted; their result is dropped
+            future.cancel()
+            self.cancelled += 1
+
+    def cancel_prefix(self, prefix, keep=()):
+        with self._lock:
+            keys = [key for key in self._futures if key.startswith(prefix) and key not in keep]
+        for key in keys:
+            self.cancel(key)
+
+    def cancel_all(self):
+        self.cancel_prefix("")
@@ -0,0 +1,262 @@
+import argparse
+from contextlib import contextmanager
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+
+# --- Question Bank ---
+# Generated technical questions are stored per canonical technology, so a
+# stack like "Python, React, SQL, Docker" is assembled from cached entries
+# and only technologies the bank has never seen (or whose entry expired)
+# cost a Gemini call. Graded outcomes are counted per question as well, which
+# calibrates question difficulty for adaptive interviews (adaptive.py).
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_bank.sqlite3")
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_TECHNOLOGIES = 500
+QUESTIONS_PER_TECHNOLOGY = 6
+
+TECH_ALIASES = {
+    "py": "python",
+    "python3": "python",
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "es6": "javascript",
+    "ts": "typescript",
+    "reactjs": "react",
+    "react.js": "react",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "vue.js": "vue",
+    "vuejs": "vue",
+    "angularjs": "angular",
+    "golang": "go",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "k8s": "kubernetes",
+    "tf": "tensorflow",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "aws cloud": "aws",
+    "amazon web services": "aws",
+    "gcp": "google cloud",
+    "c sharp": "c#",
+    "csharp": "c#",
+    "cpp": "c++",
+    "dotnet": ".net",
+}
+
+_VERSION_SUFFIX = re.compile(r"[\s\-_]+v?\d+(?:\.\d+)*x?$")
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•]+|\d+[.)]|\(\d+\))\s*")
+
+def canonicalize_technology(name):
+    # "Python 3", "python" and "py" all map to "python"
+    key = " ".join(str(name).lower().split())
+    if not key:
+        return key
+    if key in TECH_ALIASES:
+        return TECH_ALIASES[key]
+    stripped = _VERSION_SUFFIX.sub("", key)
+    if stripped and stripped != key:
+        return TECH_ALIASES.get(stripped, stripped)
+    return key
+
+def parse_question_list(text):
+    # Model output is a loose list; drop numbering, bullets, markdown and headings
+    questions = []
+    for line in text.split('\n'):
+        line = _LIST_MARKER.sub("", line.strip()).replace("**", "").strip()
+        if not line or line.endswith(":") or line.startswith("#"):
+            continue
+        questions.append(line)
+    return questions
+
+class QuestionBank:
+    def __init__(self, db_path=DEFAULT_DB_PATH, ttl_seconds=DEFAULT_TTL_SECONDS,
+                 max_technologies=DEFAULT_MAX_TECHNOLOGIES, rng=None):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_technologies = max_technologies
+        self._rng = rng or random.Random()
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS technologies (
+                    tech TEXT PRIMARY KEY,
+                    questions TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_technologies_last_used ON technologies(last_used)")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS question_outcomes (
+                    tech TEXT NOT NULL,
+                    question TEXT NOT NULL,
+                    attempts INTEGER NOT NULL,
+                    correct INTEGER NOT NULL,
+                    PRIMARY KEY (tech, question)
+                )"""
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, tech):
+        # Cached questions for a technology, or None if missing or expired
+        key = canonicalize_technology(tech)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT questions, created_at FROM technologies WHERE tech = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM technologies WHERE tech = ?", (key,))
+                return None
+            conn.execute("UPDATE technologies SET last_used = ? WHERE tech = ?", (now, key))
+        return json.loads(row[0])
+
+    def put(self, tech, questions):
+        key = canonicalize_technology(tech)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO technologies (tech, questions, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(list(questions)), now, now),
+            )
+            self._evict(conn, now)
+
+    def invalidate(self, tech):
+        key = canonicalize_technology(tech)
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM technologies WHERE tech = ?", (key,))
+            conn.execute("DELETE FROM question_outcomes WHERE tech = ?", (key,))
+
+    def record_outcome(self, tech, question, correct):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                """INSERT INTO question_outcomes (tech, question, attempts, correct) VALUES (?, ?, 1, ?)
+                ON CONFLICT(tech, question) DO UPDATE SET
+                    attempts = attempts + 1, correct = correct + excluded.correct""",
+                (canonicalize_technology(tech), question, int(bool(correct))),
+            )
+
+    def outcomes(self, tech, questions):
+        # {question: (attempts, correct)} for the questions graded before
+        questions = list(questions)
+        if not questions:
+            return {}
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                f"""SELECT question, attempts, correct FROM question_outcomes
+                WHERE tech = ? AND question IN ({', '.join('?' * len(questions))})""",
+                (canonicalize_technology(tech), *questions),
+            ).fetchall()
+        return {question: (attempts, correct) for question, attempts, correct in rows}
+
+    def _evict(self, conn, now):
+        if self.ttl_seconds:
+            conn.execute("DELETE FROM technologies WHERE created_at < ?", (now - self.ttl_seconds,))
+        if self.max_technologies:
+            conn.execute(
+                """DELETE FROM technologies WHERE tech IN (
+                    SELECT tech FROM technologies ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_technologies,),
+            )
+        conn.execute("DELETE FROM question_outcomes WHERE tech NOT IN (SELECT tech FROM technologies)")
+
+    def assemble(self, tech_stack, generate, per_tech=3):
+        # Returns {display name: sampled questions}. generate(missing_techs) must
+        # return a list of question lists aligned with missing_techs.
+        unique = {}
+        for tech in tech_stack:
+            key = canonicalize_technology(tech)
+            if key and key not in unique:
+                unique[key] = tech
+        pools = {key: self.get(key) for key in unique}
+        missing = [key for key, pool in pools.items() if not pool]
+        if missing:
+            for key, questions in zip(missing, generate([unique[key] for key in missing])):
+                if questions:
+                    self.put(key, questions)
+                pools[key] = questions
+        return {
+            unique[key]: self.sample(pools[key] or [], per_tech)
+            for key in unique
+        }
+
+    def sample(self, questions, k):
+        # Random subset in original order so candidates sharing a stack differ
+        if len(questions) <= k:
+            return list(questions)
+        picked = sorted(self._rng.sample(range(len(questions)), k))
+        return [questions[i] for i in picked]
+
+    def warm(self, stacks, generate):
+        # Pre-populate the bank; returns the technologies that had to be generated
+        missing = []
+        for stack in stacks:
+            for tech in stack:
+                key = canonicalize_technology(tech)
+                if key and key not in missing and self.get(key) is None:
+                    missing.append(key)
+        if missing:
+            for key, questions in zip(missing, generate(missing)):
+                if questions:
+                    self.put(key, questions)
+        return missing
+
+def question_bank_from_env():
+    # None when HIRELY_QUESTION_BANK is set to "off"
+    path = os.getenv("HIRELY_QUESTION_BANK", DEFAULT_DB_PATH)
+    if path.lower() in ("off", "0", "false", "none", ""):
+        return None
+    return QuestionBank(
+        db_path=path,
+        ttl_seconds=float(os.getenv("HIRELY_QUESTION_BANK_TTL_DAYS", "30")) * 24 * 3600,
+        max_technologies=int(os.getenv("HIRELY_QUESTION_BANK_MAX_TECHS", str(DEFAULT_MAX_TECHNOLOGIES))),
+    )
+
+# --- Warm-up Command ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-populate the Hirely AI question bank.")
+    parser.add_argument("stacks", nargs="*", help='Comma-separated stacks, e.g. "Python, React, SQL"')
+    parser.add_argument("--file", help="File with one comma-separated stack per line")
+    args = parser.parse_args(argv)
+
+    lines = list(args.stacks)
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            lines.extend(f)
+    stacks = [[tech.strip() for tech in line.split(',') if tech.strip()] for line in lines]
+    if not any(stacks):
+        parser.error("no technologies given")
+
+    from ai_analysis import HirelyAI, configure_genai
+
+    configure_genai(api_key=os.getenv("GEMINI_API_KEY"))
+    bank = question_bank_from_env()
+    if bank is None:
+        parser.error("question bank is disabled (HIRELY_QUESTION_BANK=off)")
+    hirely_ai = HirelyAI(question_bank=bank)
+    generated = bank.warm(stacks, hirely_ai.generate_questions_for_technologies)
+    print(f"Generated questions for {len(generated)} technologies: {', '.join(generated) or '-'}")
+
+if __name__ == "__main__":
+    main()
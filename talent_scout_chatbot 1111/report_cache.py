@@ -0,0 +1,126 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import threading
+
+# --- Report Cache ---
+# Final reports are keyed by a hash of the candidate profile plus the
+# normalized answer history (with each answer's near-duplicate matches) and
+# the adaptive summary, i.e. everything the report prompt is built from, so
+# any rerun of the same interview (widget clicks, page reloads, a new
+# worker) is served without another Gemini call. Reports are kept in memory
+# and on disk, each tier bounded and evicted least recently used first.
+REPORTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
+DEFAULT_CACHE_DIR = os.path.join(REPORTS_DIR, "cache")
+DEFAULT_MAX_FILES = 2000
+
+def _normalize_text(value):
+    return " ".join(str(value).split())
+
+def normalize_answer_history(technical_answers, project_answers):
+    # Session answer dicts are keyed by question index; order and whitespace
+    # must not change the key.
+    def _section(answers):
+        return [
+            {
+                'index': int(q_num),
+                'question': _normalize_text(data.get('question', '')),
+                'answer': _normalize_text(data.get('answer', '')),
+                'analysis': {k: _normalize_text(v) for k, v in sorted(data.get('analysis', {}).items())},
+                'similar': data.get('similar') or [],
+            }
+            for q_num, data in sorted(answers.items(), key=lambda item: int(item[0]))
+        ]
+    return {'technical': _section(technical_answers), 'project': _section(project_answers)}
+
+def report_cache_key(candidate_data, technical_answers, project_answers, adaptive=None):
+    # adaptive: adaptive_summary() of an adaptive interview, as passed to
+    # build_interview_history
+    payload = {
+        'candidate': candidate_data,
+        'history': normalize_answer_history(technical_answers, project_answers),
+        'adaptive': adaptive,
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+class ReportCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_entries=128, max_files=DEFAULT_MAX_FILES):
+        # max_entries: reports kept in memory; max_files: on disk (0 means no limit)
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_files = max_files
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"report_{key}.md")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                report = f.read()
+            # The file's mtime is its last use, for eviction
+            os.utime(self._path(key))
+        except OSError:
+            return None
+        self._remember(key, report)
+        return report
+
+    def put(self, key, report):
+        self._remember(key, report)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write-then-rename so a concurrent reader never sees a partial report
+        tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(report)
+        os.replace(tmp_path, self._path(key))
+        self._evict_files()
+
+    def invalidate(self, key):
+        with self._lock:
+            self._memory.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def get_or_generate(self, key, generate):
+        report = self.get(key)
+        if report is None:
+            report = generate()
+            self.put(key, report)
+        return report
+
+    def _evict_files(self):
+        # Drop the least recently used reports beyond max_files. Another
+        # process may be evicting the same files at the same time.
+        if not self.max_files:
+            return
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.startswith("report_") and entry.name.endswith(".md"):
+                try:
+                    files.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    continue
+        if len(files) <= self.max_files:
+            return
+        files.sort(reverse=True)
+        for _, path in files[self.max_files:]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _remember(self, key, report):
+        with self._lock:
+            self._memory[key] = report
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
@@ -0,0 +1,481 @@
+import csv
+from datetime import datetime
+import glob
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+import zlib
+
+from report_cache import REPORTS_DIR
+from similarity_index import describe_matches
+
+# --- Assessment Export ---
+# Builds the structured assessment (the assessment_*.json layout in
+# reports/) from interview answers once, and renders every artifact from
+# it in one pass: JSON, Markdown, a compact PDF and the row appended to the
+# rolling summary.csv.
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("json", "md", "pdf")
+SUMMARY_CSV = os.path.join(REPORTS_DIR, "summary.csv")
+SUMMARY_FIELDS = [
+    "candidate_name", "email", "experience_years", "position", "tech_stack", "assessment_date",
+    "technical_questions_total", "technical_ai_generated", "technical_positive_sentiment",
+    "project_questions_total", "project_questions_completed", "project_ai_generated",
+    "project_positive_sentiment", "overall_authenticity_rate", "overall_completion_rate",
+]
+
+def _rate(part, whole):
+    return round(part / whole * 100, 1) if whole else 0.0
+
+def _results(answers):
+    return [
+        {
+            'question': data['question'],
+            'answer': data['answer'],
+            'ai_detection': "AI Generated" if data['analysis'].get('ai_detected') == "Yes" else "Human Written",
+            'sentiment': data['analysis'].get('sentiment', 'N/A'),
+            **({'correctness': data['analysis']['correctness']} if 'correctness' in data['analysis'] else {}),
+            # Other candidates' answers by similarity index id only; names
+            # are resolved in the recruiter analytics view
+            **({'similar_answers': [
+                {'answer_id': m['answer_id'], 'similarity': m['similarity']} for m in data['similar']
+            ]} if data.get('similar') else {}),
+        }
+        for _, data in sorted(answers.items(), key=lambda item: int(item[0]))
+    ]
+
+def build_assessment(candidate_data, technical_answers, project_answers, report,
+                     technical_total=None, project_total=None, generated_at=None, adaptive=None):
+    # *_total: questions asked, when more were asked than answered (skips);
+    # adaptive: adaptive_summary() when the technical phase was adaptive
+    generated_at = generated_at or datetime.now()
+    technical = _results(technical_answers)
+    project = _results(project_answers)
+    technical_total = max(technical_total or 0, len(technical))
+    project_total = max(project_total or 0, len(project))
+    tech_ai = sum(r['ai_detection'] == "AI Generated" for r in technical)
+    tech_positive = sum(r['sentiment'] == "Positive" for r in technical)
+    proj_ai = sum(r['ai_detection'] == "AI Generated" for r in project)
+    proj_positive = sum(r['sentiment'] == "Positive" for r in project)
+    answered = len(technical) + len(project)
+    near_duplicates = sum(bool(r.get('similar_answers')) for r in technical + project)
+    assessment = {
+        'report_metadata': {
+            'generated_at': generated_at.isoformat(),
+            'report_type': "candidate_assessment",
+            'version': "1.0",
+        },
+        'candidate_information': {
+            'name': candidate_data.get('fullName', ''),
+            'email': candidate_data.get('email', ''),
+            'phone': candidate_data.get('phone', ''),
+            'location': candidate_data.get('location', ''),
+            'experience': str(candidate_data.get('experience', '')),
+            'position': ', '.join(candidate_data.get('positions', [])),
+            'tech_stack': ', '.join(candidate_data.get('techStack', [])),
+        },
+        'technical_interview': {
+            'total_questions': technical_total,
+            'results': technical,
+            'summary': {
+                'total_questions': technical_total,
+                'ai_generated_responses': tech_ai,
+                'positive_sentiment_responses': tech_positive,
+                'authenticity_rate': _rate(len(technical) - tech_ai, len(technical)),
+                'positive_sentiment_rate': _rate(tech_positive, len(technical)),
+            },
+        },
+        'project_interview': {
+            'total_questions': project_total,
+            'results': project,
+            'summary': {
+                'total_questions': project_total,
+                'completed_questions': len(project),
+                'ai_generated_responses': proj_ai,
+                'positive_sentiment_responses': proj_positive,
+                'completion_rate': _rate(len(project), project_total),
+                'authenticity_rate': _rate(len(project) - proj_ai, len(project)),
+                'positive_sentiment_rate': _rate(proj_positive, len(project)),
+            },
+        },
+        'ai_assessment': report,
+        'feedback': {},
+        'overall_metrics': {
+            'total_questions_across_interviews': technical_total + project_total,
+            'total_ai_generated_responses': tech_ai + proj_ai,
+            'total_positive_responses': tech_positive + proj_positive,
+            'overall_authenticity_rate': _rate(answered - tech_ai - proj_ai, answered),
+            'overall_positive_rate': _rate(tech_positive + proj_positive, answered),
+            'overall_completion_rate': _rate(answered, technical_total + project_total),
+            'near_duplicate_responses': near_duplicates,
+        },
+    }
+    if adaptive:
+        assessment['technical_interview']['adaptive'] = adaptive
+    return assessment
+
+def render_markdown(assessment):
+    info = assessment['candidate_information']
+    technical = assessment['technical_interview']
+    project = assessment['project_interview']
+    overall = assessment['overall_metrics']
+    generated = datetime.fromisoformat(assessment['report_metadata']['generated_at']).strftime("%Y-%m-%d %H:%M:%S")
+    lines = [
+        "# Candidate Assessment Report",
+        "",
+        "## Candidate Information",
+        f"- **Name:** {info.get('name') or 'N/A'}",
+        f"- **Email:** {info.get('email') or 'N/A'}",
+        f"- **Phone:** {info.get('phone') or 'N/A'}",
+        f"- **Location:** {info.get('location') or 'N/A'}",
+        f"- **Experience:** {info.get('experience') or 'N/A'} years",
+        f"- **Desired Position:** {info.get('position') or 'N/A'}",
+        f"- **Tech Stack:** {info.get('tech_stack') or 'N/A'}",
+        f"- **Assessment Date:** {generated}",
+        "",
+        "## Technical Interview Results",
+        "",
+        "### Summary",
+        f"- **Total Questions:** {technical['summary']['total_questions']}",
+        f"- **AI-Generated Responses:** {technical['summary']['ai_generated_responses']}",
+        f"- **Positive Sentiment Responses:** {technical['summary']['positive_sentiment_responses']}",
+        f"- **Authenticity Rate:** {technical['summary']['authenticity_rate']}%",
+        "",
+    ]
+    adaptive = technical.get('adaptive')
+    if adaptive:
+        lines += [
+            "### Interview Length (Adaptive)",
+            f"- **Why it stopped:** {adaptive['stop_reason']}",
+        ]
+        lines += [
+            f"- **{tech['technology']}:** {tech['verdict']} (P(pass) {tech['pass_probability']:.0%}, "
+            f"{tech['correct_answers']}/{tech['graded_answers']} correct, {tech['questions_asked']} asked; "
+            f"{tech['stop_reason']})"
+            for tech in adaptive['technologies']
+        ]
+        lines.append("")
+    lines.append("### Detailed Results")
+    lines += _render_results(technical['results'])
+    lines += [
+        "## Project Interview Results",
+        "",
+        "### Summary",
+        f"- **Total Questions:** {project['summary']['total_questions']}",
+        f"- **Questions Completed:** {project['summary']['completed_questions']}",
+        f"- **AI-Generated Responses:** {project['summary']['ai_generated_responses']}",
+        f"- **Positive Sentiment Responses:** {project['summary']['positive_sentiment_responses']}",
+        "",
+        "### Detailed Results",
+    ]
+    lines += _render_results(project['results'])
+    lines += [
+        "## AI-Generated Assessment",
+        "",
+        assessment['ai_assessment'],
+        "",
+        "## Overall Metrics",
+        "",
+        "",
+        f"- **Total Questions Asked:** {overall['total_questions_across_interviews']}",
+        f"- **AI-Generated Responses:** {overall['total_ai_generated_responses']}",
+        f"- **Positive Sentiment Responses:** {overall['total_positive_responses']}",
+        f"- **Overall Authenticity Rate:** {overall['overall_authenticity_rate']}%",
+        f"- **Overall Positive Response Rate:** {overall['overall_positive_rate']}%",
+        f"- **Near-Duplicate Responses:** {overall.get('near_duplicate_responses', 0)}",
+        "",
+        "",
+        "---",
+        f"*Report generated by Hirely AI on {generated}*",
+    ]
+    return "\n".join(lines) + "\n"
+
+def _render_results(results):
+    lines = [""]
+    for i, result in enumerate(results, 1):
+        lines += [
+            f"#### Question {i}",
+            f"- **Question:** {result['question']}",
+            f"- **Answer:** {result['answer']}",
+            f"- **AI Detection:** {result['ai_detection']}",
+            f"- **Sentiment:** {result['sentiment']}",
+        ]
+        if 'correctness' in result:
+            lines.append(f"- **Correctness:** {result['correctness']}")
+        if result.get('similar_answers'):
+            lines.append(f"- **Similar Answers:** {describe_matches(result['similar_answers'])}")
+        lines.append("")
+    return lines
+
+def summary_row(assessment):
+    info = assessment['candidate_information']
+    technical = assessment['technical_interview']['summary']
+    project = assessment['project_interview']['summary']
+    overall = assessment['overall_metrics']
+    return {
+        'candidate_name': info['name'],
+        'email': info['email'],
+        'experience_years': info['experience'],
+        'position': info['position'],
+        'tech_stack': info['tech_stack'],
+        'assessment_date': assessment['report_metadata']['generated_at'],
+        'technical_questions_total': technical['total_questions'],
+        'technical_ai_generated': technical['ai_generated_responses'],
+        'technical_positive_sentiment': technical['positive_sentiment_responses'],
+        'project_questions_total': project['total_questions'],
+        'project_questions_completed': project['completed_questions'],
+        'project_ai_generated': project['ai_generated_responses'],
+        'project_positive_sentiment': project['positive_sentiment_responses'],
+        'overall_authenticity_rate': overall['overall_authenticity_rate'],
+        'overall_completion_rate': overall['overall_completion_rate'],
+    }
+
+def candidate_slug(name):
+    return re.sub(r"[^a-z0-9]+", "_", str(name).lower()).strip("_") or "candidate"
+
+def render_exports(assessment, formats=EXPORT_FORMATS):
+    # {extension: bytes} for each requested format
+    renderers = {
+        'json': lambda: json.dumps(assessment, indent=2, ensure_ascii=False).encode("utf-8"),
+        'md': lambda: render_markdown(assessment).encode("utf-8"),
+        'pdf': lambda: render_pdf(assessment),
+    }
+    return {fmt: renderers[fmt]() for fmt in formats}
+
+def export_basename(assessment):
+    # assessment_<name>_<timestamp>_<id>: the id part (from the export key, or
+    # random without one) keeps two candidates with the same name exported in
+    # the same second from overwriting each other's files
+    stamp = datetime.fromisoformat(assessment['report_metadata']['generated_at']).strftime("%Y%m%d_%H%M%S")
+    unique = (assessment['report_metadata'].get('export_key') or uuid.uuid4().hex)[:8]
+    return f"assessment_{candidate_slug(assessment['candidate_information']['name'])}_{stamp}_{unique}"
+
+def export_key(report_key, report):
+    # Identifies one export: the report cache key plus the report text, so a
+    # regenerated report under the same key is exported again
+    return hashlib.sha256(f"{report_key}\0{report}".encode("utf-8")).hexdigest()[:32]
+
+def find_export(assessment, key, output_dir=REPORTS_DIR, formats=EXPORT_FORMATS):
+    # ({ext: path}, {ext: bytes}) of an earlier export of this candidate with
+    # the same export key, or None. Only this candidate's files are read.
+    pattern = os.path.join(output_dir, f"assessment_{candidate_slug(assessment['candidate_information']['name'])}_*.json")
+    for path in sorted(glob.glob(pattern), reverse=True):
+        try:
+            with open(path, encoding="utf-8") as f:
+                if json.load(f).get('report_metadata', {}).get('export_key') != key:
+                    continue
+        except (OSError, ValueError):
+            continue
+        base = path[:-len(".json")]
+        paths = {fmt: f"{base}.{fmt}" for fmt in formats}
+        try:
+            rendered = {}
+            for fmt, fmt_path in paths.items():
+                with open(fmt_path, "rb") as f:
+                    rendered[fmt] = f.read()
+        except OSError:
+            return None  # partially deleted; export afresh
+        return paths, rendered
+    return None
+
+def export_assessment(assessment, output_dir=REPORTS_DIR, summary_path=None, formats=EXPORT_FORMATS, key=None):
+    # Renders and writes assessment_<name>_<timestamp>_<id>.<ext> for each format
+    # and appends the summary row. Returns ({ext: path}, {ext: bytes}) so
+    # callers can serve downloads without rendering again. With an export
+    # key (see export_key), an earlier export with the same key on disk is
+    # returned instead, so reloading a report page in a new browser session
+    # or after a resume writes no new files and no second summary row.
+    os.makedirs(output_dir, exist_ok=True)
+    if key is not None:
+        existing = find_export(assessment, key, output_dir, formats)
+        if existing is not None:
+            return existing
+        assessment['report_metadata']['export_key'] = key
+    rendered = render_exports(assessment, formats)
+    base = os.path.join(output_dir, export_basename(assessment))
+    paths = {}
+    for fmt, data in rendered.items():
+        paths[fmt] = f"{base}.{fmt}"
+        with open(paths[fmt], "wb") as f:
+            f.write(data)
+    append_summary_rows(summary_path or os.path.join(output_dir, "summary.csv"), [summary_row(assessment)])
+    return paths, rendered
+
+_summary_lock = threading.Lock()
+
+def append_summary_rows(path, rows):
+    # Appends to the rolling summary CSV, writing the header if the file is
+    # new. Rows go out in a single write so concurrent writers don't interleave.
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=SUMMARY_FIELDS)
+    writer.writerows(rows)
+    with _summary_lock:
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        with open(path, "a", newline="", encoding="utf-8") as f:
+            if new_file:
+                csv.DictWriter(f, fieldnames=SUMMARY_FIELDS).writeheader()
+            f.write(buffer.getvalue())
+
+# --- PDF Rendering ---
+# A minimal PDF writer for the Markdown report: text only, the standard
+# Helvetica fonts (referenced, not embedded) and Flate-compressed page
+# streams, so a typical report is a few KB.
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 in points
+PAGE_MARGIN = 50
+_HEADING_SIZES = {1: 18, 2: 14, 3: 12, 4: 11}
+BODY_SIZE = 10
+
+# Helvetica advance widths (1/1000 em) for ASCII 32-126, from the standard AFM
+_HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+
+def _text_width(text, size, bold):
+    units = sum(_HELVETICA_WIDTHS[ord(c) - 32] if 32 <= ord(c) < 127 else 556 for c in text)
+    # Bold glyphs run ~8% wider; over-estimating only wraps a little early
+    return units * size / 1000 * (1.08 if bold else 1.0)
+
+def _pdf_escape(text):
+    # Characters outside WinAnsi become "?" (markdown_to_pdf notes and logs it)
+    encoded = text.encode("cp1252", errors="replace")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+def _inline_runs(text, bold=False):
+    # "**Name:** John" -> [("Name:", True), (" John", False)]; other emphasis markers dropped
+    runs = []
+    for i, part in enumerate(text.split("**")):
+        part = part.replace("*", "").replace("`", "")
+        if part:
+            runs.append((part, bold or i % 2 == 1))
+    return runs
+
+def _markdown_blocks(markdown):
+    # (kind, runs, size, indent) per Markdown line; kind is "text", "rule" or "gap"
+    blocks = []
+    for line in markdown.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            blocks.append(("gap", [], BODY_SIZE, 0))
+        elif re.fullmatch(r"-{3,}|\*{3,}|_{3,}", stripped):
+            blocks.append(("rule", [], BODY_SIZE, 0))
+        elif stripped.startswith("#"):
+            level = min(len(stripped) - len(stripped.lstrip("#")), 4)
+            blocks.append(("text", _inline_runs(stripped.lstrip("#").strip(), bold=True), _HEADING_SIZES[level], 0))
+        else:
+            bullet = re.match(r"^(\s*)(?:[-*+]|\d+[.)])\s+", line)
+            if bullet:
+                indent = 12 + 12 * (len(bullet.group(1)) // 2)
+                marker = "\u2022 " if not bullet.group(0).strip()[0].isdigit() else bullet.group(0).strip() + " "
+                blocks.append(("text", [(marker, False)] + _inline_runs(line[bullet.end():]), BODY_SIZE, indent))
+            else:
+                blocks.append(("text", _inline_runs(stripped), BODY_SIZE, 0))
+    return blocks
+
+def _wrap_runs(runs, size, width):
+    # Greedy word wrap across styled runs; returns lines of runs
+    lines, line, used = [], [], 0.0
+    for text, bold in runs:
+        for word in re.findall(r"\s*\S+\s*|\s+", text):
+            word_width = _text_width(word.rstrip(), size, bold)
+            if line and used + word_width > width:
+                lines.append(line)
+                line, used = [], 0.0
+            line.append((word, bold))
+            used += _text_width(word, size, bold)
+    if line:
+        lines.append(line)
+    return lines
+
+def _layout_pages(markdown):
+    # Content stream bytes per page
+    pages, ops = [], []
+    y = PAGE_HEIGHT - PAGE_MARGIN
+    for kind, runs, size, indent in _markdown_blocks(markdown):
+        leading = size * 1.4
+        if kind == "gap":
+            y -= BODY_SIZE * 0.6
+            continue
+        if kind == "rule":
+            y -= BODY_SIZE * 0.6
+            ops.append(f"0.5 w {PAGE_MARGIN} {y:.1f} m {PAGE_WIDTH - PAGE_MARGIN} {y:.1f} l S".encode())
+            y -= BODY_SIZE * 0.6
+            continue
+        if size > BODY_SIZE:
+            y -= size * 0.4
+        for line in _wrap_runs(runs, size, PAGE_WIDTH - 2 * PAGE_MARGIN - indent):
+            if y - leading < PAGE_MARGIN:
+                pages.append(b"\n".join(ops))
+                ops, y = [], PAGE_HEIGHT - PAGE_MARGIN
+            y -= leading
+            ops.append(f"BT {PAGE_MARGIN + indent} {y:.1f} Td".encode())
+            for text, bold in line:
+                ops.append(f"/{'F2' if bold else 'F1'} {size} Tf (".encode() + _pdf_escape(text) + b") Tj")
+            ops.append(b"ET")
+    pages.append(b"\n".join(ops))
+    return pages
+
+def render_pdf(assessment):
+    return markdown_to_pdf(render_markdown(assessment))
+
+def _unsupported_chars(text):
+    unsupported = set()
+    for char in set(text):
+        try:
+            char.encode("cp1252")
+        except UnicodeEncodeError:
+            unsupported.add(char)
+    return unsupported
+
+def markdown_to_pdf(markdown):
+    # The standard fonts only cover WinAnsi (cp1252); other scripts would
+    # need an embedded font. They are shown as "?" with a note, never dropped.
+    unsupported = _unsupported_chars(markdown)
+    if unsupported:
+        logger.warning(
+            "PDF export: %d distinct characters outside WinAnsi shown as '?' (%s)",
+            len(unsupported), "".join(sorted(unsupported))[:40],
+        )
+        markdown += (
+            "\n\n---\n*Some characters cannot be shown in this PDF and appear as \"?\". "
+            "The Markdown and JSON exports contain the full text.*\n"
+        )
+    pages = _layout_pages(markdown)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for content in pages:
+        stream = zlib.compress(content, 9)
+        objects.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> >>" % (PAGE_WIDTH, PAGE_HEIGHT, len(objects))
+        )
+        page_ids.append(len(objects))
+    kids = b" ".join(b"%d 0 R" % i for i in page_ids)
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
@@ -0,0 +1,90 @@
+from collections import defaultdict, deque
+from dataclasses import dataclass, replace
+import json
+import os
+import threading
+
+# --- Model Routing ---
+# Maps each HirelyAI task (the names its methods are instrumented under) to
+# a model, a deadline and an optional hedge delay. Short classification
+# tasks hedge: if the primary request hasn't answered after the task's p95
+# latency, a second request is sent and whichever answers first wins.
+#
+# Configured with HIRELY_MODEL_ROUTES, a JSON object (or @path to a JSON
+# file) of task -> {"model", "timeout", "hedge_after"}; "default" sets the
+# fallback route. hedge_after is seconds, "p95" (observed p95 of the task,
+# hedge_floor until enough samples) or null for no hedging.
+DEFAULT_MODEL = "models/gemini-1.5-flash-latest"
+P95_MIN_SAMPLES = 20
+LATENCY_WINDOW = 500
+
+@dataclass(frozen=True)
+class Route:
+    model: str = DEFAULT_MODEL
+    timeout: float = None  # None: the LLM client's HIRELY_LLM_TIMEOUT
+    hedge_after: object = None  # seconds, "p95" or None
+    hedge_floor: float = 2.0  # hedge delay while "p95" has too few samples
+
+_CLASSIFICATION = dict(timeout=20.0, hedge_after="p95")
+DEFAULT_ROUTES = {
+    'analyze_sentiment': _CLASSIFICATION,
+    'detect_ai_generated_text': _CLASSIFICATION,
+    'check_correctness': _CLASSIFICATION,
+    'evaluate_answer': dict(timeout=30.0, hedge_after="p95", hedge_floor=4.0),
+    'generate_final_report': dict(timeout=120.0),
+    'stream_final_report': dict(timeout=120.0),
+}
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+class ModelRouter:
+    def __init__(self, routes=None, default=None, hedging=True):
+        self.default = default or Route()
+        self.routes = {
+            task: replace(self.default, **spec) if isinstance(spec, dict) else spec
+            for task, spec in (DEFAULT_ROUTES if routes is None else routes).items()
+        }
+        self.hedging = hedging
+        self._latencies = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+        self._lock = threading.Lock()
+
+    def route(self, task):
+        return self.routes.get(task, self.default)
+
+    def models(self):
+        return sorted({self.default.model, *(route.model for route in self.routes.values())})
+
+    def observe(self, task, seconds):
+        with self._lock:
+            self._latencies[task].append(seconds)
+
+    def hedge_delay(self, task):
+        # Seconds to wait before hedging this task, or None
+        hedge_after = self.route(task).hedge_after
+        if not self.hedging or hedge_after is None:
+            return None
+        if hedge_after != "p95":
+            return float(hedge_after)
+        with self._lock:
+            samples = list(self._latencies[task])
+        if len(samples) < P95_MIN_SAMPLES:
+            return self.route(task).hedge_floor
+        return max(_percentile(samples, 0.95), 0.05)
+
+def _load_routes_config(value):
+    if value.startswith("@"):
+        with open(value[1:], encoding="utf-8") as f:
+            return json.load(f)
+    return json.loads(value)
+
+def router_from_env():
+    # Built-in routes, overridden per task by HIRELY_MODEL_ROUTES
+    config = _load_routes_config(os.getenv("HIRELY_MODEL_ROUTES", "") or "{}")
+    default = Route(**{'model': os.getenv("HIRELY_MODEL", DEFAULT_MODEL), **config.pop("default", {})})
+    routes = {task: dict(spec) for task, spec in DEFAULT_ROUTES.items()}
+    for task, spec in config.items():
+        routes[task] = {**routes.get(task, {}), **spec}
+    hedging = os.getenv("HIRELY_HEDGING", "on").lower() in ("on", "1", "true")
+    return ModelRouter(routes, default=default, hedging=hedging)
@@ -0,0 +1,190 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# --- Session Store ---
+# Interview state is persisted as an append-only event log per session, so
+# an interview survives a redeploy or worker restart and can be resumed on
+# any server process from its resume token (the session id, carried in the
+# ?session= query param). Each rerun appends only what changed since the
+# last write: a "set" event per changed field and an "answer" event per new
+# answer; loading a session replays its events in order.
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sessions.sqlite3")
+DEFAULT_TTL_SECONDS = 14 * 24 * 3600
+
+# Fields written with "set" events; answers are written one "answer" event each
+PERSISTED_FIELDS = [
+    "phase", "candidate_data", "technical_questions", "project_questions",
+    "current_tech_q", "current_proj_q", "bot_message", "service_session", "adaptive",
+    "interview_phase",
+]
+ANSWER_FIELDS = {"technical_answers": "technical", "project_answers": "project"}
+
+def _encode(value):
+    return json.dumps(value, sort_keys=True, ensure_ascii=False)
+
+def diff_state(state, persisted):
+    # Events for everything in `state` that differs from the `persisted`
+    # snapshot ({field or (section, index): encoded value}), which is updated
+    # in place. Unchanged state costs a few small json.dumps calls and no I/O.
+    events = []
+    for field in PERSISTED_FIELDS:
+        if field not in state:
+            continue
+        encoded = _encode(state[field])
+        if persisted.get(field) != encoded:
+            persisted[field] = encoded
+            events.append(("set", {'field': field, 'value': state[field]}))
+    for field, section in ANSWER_FIELDS.items():
+        for index, data in (state.get(field) or {}).items():
+            encoded = _encode(data)
+            if persisted.get((section, index)) != encoded:
+                persisted[(section, index)] = encoded
+                events.append(("answer", {'section': section, 'index': index, 'data': data}))
+    return events
+
+def replay(events):
+    # Rebuild session state from (kind, payload) events in write order
+    state = {field: {} for field in ANSWER_FIELDS}
+    sections = {section: field for field, section in ANSWER_FIELDS.items()}
+    for kind, payload in events:
+        if kind == "set":
+            state[payload['field']] = payload['value']
+        elif kind == "answer":
+            state[sections[payload['section']]][int(payload['index'])] = payload['data']
+    return state
+
+def snapshot(state):
+    # The persisted-snapshot for a state that was just loaded from the store
+    persisted = {}
+    diff_state(state, persisted)
+    return persisted
+
+class SessionStore(ABC):
+    # Backends implement append(), events() and delete(); load() is shared
+    @abstractmethod
+    def append(self, session_id, events):
+        # Add events to the end of the session's log
+        ...
+
+    @abstractmethod
+    def events(self, session_id):
+        # The session's events in append order; empty if it is unknown
+        ...
+
+    @abstractmethod
+    def delete(self, session_id):
+        # Drop the session's log; later loads return None
+        ...
+
+    def load(self, session_id):
+        # Rehydrated state for a resume token, or None if the session is unknown
+        events = self.events(session_id)
+        if not events:
+            return None
+        return replay(events)
+
+class MemorySessionStore(SessionStore):
+    # Process-local; for benchmarks and single-process runs without a disk
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def append(self, session_id, events):
+        if events:
+            with self._lock:
+                # Stored as JSON, like the SQLite backend, so later mutation can't leak in
+                self._sessions.setdefault(session_id, []).extend(
+                    (kind, json.loads(json.dumps(payload))) for kind, payload in events
+                )
+
+    def events(self, session_id):
+        with self._lock:
+            return list(self._sessions.get(session_id, []))
+
+    def delete(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+class SQLiteSessionStore(SessionStore):
+    def __init__(self, db_path=DEFAULT_DB_PATH, ttl_seconds=DEFAULT_TTL_SECONDS):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS session_events (
+                    session_id TEXT NOT NULL,
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_session_events_session ON session_events(session_id, seq)"
+            )
+            if self.ttl_seconds:
+                self.prune(conn)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        # WAL + NORMAL: commits don't fsync, so per-rerun appends stay cheap;
+        # a power loss can drop the last few events but never corrupts the log
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def append(self, session_id, events):
+        if not events:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO session_events (session_id, kind, payload, created_at) VALUES (?, ?, ?, ?)",
+                [(session_id, kind, json.dumps(payload, ensure_ascii=False), now) for kind, payload in events],
+            )
+
+    def events(self, session_id):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT kind, payload FROM session_events WHERE session_id = ? ORDER BY seq", (session_id,)
+            ).fetchall()
+        return [(kind, json.loads(payload)) for kind, payload in rows]
+
+    def delete(self, session_id):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM session_events WHERE session_id = ?", (session_id,))
+
+    def prune(self, conn=None):
+        # Drop sessions with no activity within the TTL
+        if conn is None:
+            with self._connect() as conn:
+                return self.prune(conn)
+        cutoff = time.time() - self.ttl_seconds
+        conn.execute(
+            """DELETE FROM session_events WHERE session_id IN (
+                SELECT session_id FROM session_events GROUP BY session_id HAVING MAX(created_at) < ?
+            )""",
+            (cutoff,),
+        )
+
+def session_store_from_env():
+    # None when HIRELY_SESSION_STORE is set to "off"; "memory" keeps sessions in-process
+    path = os.getenv("HIRELY_SESSION_STORE", DEFAULT_DB_PATH)
+    if path.lower() in ("off", "0", "false", "none", ""):
+        return None
+    if path.lower() == "memory":
+        return MemorySessionStore()
+    return SQLiteSessionStore(
+        db_path=path,
+        ttl_seconds=float(os.getenv("HIRELY_SESSION_TTL_DAYS", "14")) * 24 * 3600,
+    )
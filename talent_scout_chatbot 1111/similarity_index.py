@@ -0,0 +1,190 @@
+from array import array
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+
+# --- Similarity Index ---
+# Flags copy-pasted answers across candidates. Every submitted answer gets a
+# MinHash signature over its word 3-shingles; LSH banding maps the signature
+# to one bucket per band, and answers sharing any bucket are candidates
+# whose estimated Jaccard similarity is then checked against the threshold.
+# Signatures and buckets live in SQLite, so memory stays bounded at any
+# index size and the index survives restarts; each new answer is one
+# indexed bucket lookup plus one insert. Matches name another candidate's
+# answer only by its opaque index id; who wrote it (resolve()) is for the
+# recruiter view, never for the candidate's own records and exports.
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "similarity_index.sqlite3")
+NUM_PERM = 64
+BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 Jaccard collide in some band
+DEFAULT_THRESHOLD = 0.6
+MIN_WORDS = 8  # shorter answers ("yes", one-line definitions) match by coincidence
+SHINGLE_SIZE = 3
+EXCERPT_CHARS = 160
+MAX_CANDIDATES = 200  # bucket hits verified per lookup, most recent first
+
+_WORD = re.compile(r"\w+")
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "little")
+
+# Fixed seeds: signatures must stay comparable across processes and restarts
+_PERMUTATIONS = [random.Random(f"hirely-minhash:{i}").getrandbits(64) for i in range(NUM_PERM)]
+
+def shingles(text):
+    words = _WORD.findall(str(text).lower())
+    if len(words) < MIN_WORDS:
+        return set()
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+def minhash(text):
+    # Signature as a list of NUM_PERM 64-bit values, or None for short answers.
+    # Each permutation is an XOR mask over one 64-bit hash per shingle.
+    hashes = [_hash64(shingle) for shingle in shingles(text)]
+    if not hashes:
+        return None
+    return [min(h ^ mask for h in hashes) for mask in _PERMUTATIONS]
+
+def band_buckets(signature):
+    # One bucket id per band (band index mixed in, so bands never collide)
+    rows = NUM_PERM // BANDS
+    buckets = []
+    for band in range(BANDS):
+        encoded = f"{band}:" + ",".join(map(str, signature[band * rows:(band + 1) * rows]))
+        buckets.append(_hash64(encoded) >> 1)  # fits SQLite's signed INTEGER
+    return buckets
+
+def estimate_similarity(a, b):
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+def _pack(signature):
+    return array("Q", signature).tobytes()
+
+def _unpack(blob):
+    signature = array("Q")
+    signature.frombytes(blob)
+    return signature.tolist()
+
+class SimilarityIndex:
+    def __init__(self, db_path=DEFAULT_DB_PATH, threshold=DEFAULT_THRESHOLD):
+        self.db_path = db_path
+        self.threshold = threshold
+        # One long-lived connection: a lookup is a couple of indexed reads,
+        # and reconnecting would cost more than the lookup itself
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS answers (
+                    id INTEGER PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    candidate TEXT,
+                    question TEXT,
+                    excerpt TEXT,
+                    signature BLOB NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS buckets (
+                    bucket INTEGER NOT NULL,
+                    answer_id INTEGER NOT NULL,
+                    PRIMARY KEY (bucket, answer_id)
+                ) WITHOUT ROWID"""
+            )
+
+    def _matches(self, signature, buckets, exclude_owner, limit):
+        placeholders = ", ".join("?" * len(buckets))
+        rows = self._conn.execute(
+            f"""SELECT id, owner, signature FROM answers
+                WHERE id IN (
+                    SELECT DISTINCT answer_id FROM buckets WHERE bucket IN ({placeholders})
+                    ORDER BY answer_id DESC LIMIT ?
+                )""",
+            buckets + [MAX_CANDIDATES],
+        ).fetchall()
+        matches = []
+        for answer_id, owner, blob in rows:
+            if owner == exclude_owner:
+                continue
+            similarity = estimate_similarity(signature, _unpack(blob))
+            if similarity >= self.threshold:
+                matches.append({'answer_id': answer_id, 'similarity': round(similarity, 2)})
+        matches.sort(key=lambda m: m['similarity'], reverse=True)
+        return matches[:limit]
+
+    def query(self, text, exclude_owner=None, limit=5):
+        # Prior answers similar to `text` from other owners, most similar first
+        signature = minhash(text)
+        if signature is None:
+            return []
+        with self._lock:
+            return self._matches(signature, band_buckets(signature), exclude_owner, limit)
+
+    def add(self, text, owner, candidate=None, question=None, limit=5):
+        # Look up then index one answer; returns the matches found before it
+        # was added. owner (a session or batch candidate id) is never matched
+        # against itself, so re-answering doesn't flag a candidate.
+        signature = minhash(text)
+        if signature is None:
+            return []
+        buckets = band_buckets(signature)
+        excerpt = " ".join(str(text).split())[:EXCERPT_CHARS]
+        with self._lock:
+            matches = self._matches(signature, buckets, owner, limit)
+            with self._conn:
+                cursor = self._conn.execute(
+                    "INSERT INTO answers (owner, candidate, question, excerpt, signature, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (owner, candidate, question, excerpt, _pack(signature), time.time()),
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO buckets (bucket, answer_id) VALUES (?, ?)",
+                    [(bucket, cursor.lastrowid) for bucket in buckets],
+                )
+        return matches
+
+    def resolve(self, answer_ids):
+        # {answer_id: {'candidate', 'question', 'excerpt', 'submitted_at'}}
+        # for matched answers still in the index; recruiter view only
+        answer_ids = [int(answer_id) for answer_id in answer_ids]
+        if not answer_ids:
+            return {}
+        placeholders = ", ".join("?" * len(answer_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, candidate, question, excerpt, created_at FROM answers WHERE id IN ({placeholders})",
+                answer_ids,
+            ).fetchall()
+        return {
+            answer_id: {'candidate': candidate, 'question': question, 'excerpt': excerpt, 'submitted_at': created_at}
+            for answer_id, candidate, question, excerpt, created_at in rows
+        }
+
+    def size(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+def candidate_label(candidate_data):
+    # How a candidate is named when a recruiter resolves similarity matches
+    name = candidate_data.get('fullName') or "Unknown candidate"
+    email = candidate_data.get('email')
+    return f"{name} <{email}>" if email else name
+
+def describe_matches(matches):
+    # "89% match with answer #412; 70% match with answer #97"
+    return "; ".join(f"{m['similarity']:.0%} match with answer #{m['answer_id']}" for m in matches)
+
+def similarity_index_from_env():
+    # None when HIRELY_SIMILARITY_INDEX is set to "off"
+    path = os.getenv("HIRELY_SIMILARITY_INDEX", DEFAULT_DB_PATH)
+    if path.lower() in ("off", "0", "false", "none", ""):
+        return None
+    return SimilarityIndex(
+        db_path=path,
+        threshold=float(os.getenv("HIRELY_SIMILARITY_THRESHOLD", str(DEFAULT_THRESHOLD))),
+    )